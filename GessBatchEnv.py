@@ -0,0 +1,246 @@
+# Description: Batched GessGame environment for self-play. N boards are kept in one NumPy array and every step
+# plays one move in each game with array operations, following the same rules as GessGame.make_move.
+
+import numpy
+
+from GessGame import BLACK, CELL_ITEMS, COLUMNS, EMPTY, STATE_NAMES, UNFINISHED, GessGame, square_index
+
+# cell codes and states are the ones GessGame uses inside, so boards copy across without translating
+
+# row and col offsets of the nine footprint cells, shaped to broadcast against (N, 1, 1) centers
+FOOTPRINT_ROWS = numpy.array([-1, 0, 1]).reshape(1, 3, 1)
+FOOTPRINT_COLS = numpy.array([-1, 0, 1]).reshape(1, 1, 3)
+MAX_DISTANCE = 17
+
+
+def ring_centers(boards, players):
+    """
+    purpose: finds the ring centers of one player in every board with a single 3x3 sliding window pass
+    parameters: boards (N, 20, 20 cell codes), players (cell code of the player in each board, shape (N,))
+    return: a (N, 20, 20) bool array that is True at every ring center
+    """
+    own = boards == numpy.asarray(players, dtype=boards.dtype).reshape(-1, 1, 1)
+    neighbours = numpy.zeros((boards.shape[0], 18, 18), dtype=numpy.int8)
+    for row in range(3):
+        for col in range(3):
+            if row != 1 or col != 1:
+                neighbours += own[:, row:row + 18, col:col + 18]
+
+    # only centers in rows 3-18 and cols c-r can have a full ring on the board
+    centers = numpy.zeros(boards.shape, dtype=bool)
+    centers[:, 2:18, 2:18] = ((neighbours == 8) & (boards[:, 1:19, 1:19] == EMPTY))[:, 1:17, 1:17]
+    return centers
+
+
+def parse_moves(moves):
+    """
+    purpose: turns (move_from, move_to) square names into the row and col arrays step takes
+    parameters: moves (list of (move_from, move_to), one per game)
+    return: rows_from, cols_from, rows_to, cols_to arrays
+    """
+    squares = numpy.array([[square_index(move_from), square_index(move_to)] for move_from, move_to in moves],
+                          dtype=numpy.int64).reshape(-1, 2)
+    return squares[:, 0] // 20 + 1, squares[:, 0] % 20, squares[:, 1] // 20 + 1, squares[:, 1] % 20
+
+
+def from_games(games):
+    """
+    purpose: creates a batch holding the positions of some GessGame objects
+    parameters: games (list of GessGame)
+    return: a new GessBatchEnv
+    """
+    env = GessBatchEnv(len(games))
+    for index, game in enumerate(games):
+        env.set_game(index, game)
+    return env
+
+
+class GessBatchEnv:
+    """
+    purpose: plays many independent games of Gess at once for self-play
+    responsibilities: keeps the boards, turns and states of N games in arrays, checks and plays one move per game
+    per step, finds rings in every board at once
+    communicates with(why): GessGame (the starting position and the rules, which step mirrors, come from it)
+    """
+
+    def __init__(self, count):
+        """
+        purpose: creates count games in the starting position
+        parameters: count
+        return: a new GessBatchEnv object
+        """
+        start = numpy.frombuffer(bytes(GessGame().get_board().get_cells()), dtype=numpy.int8).reshape(20, 20)
+
+        self._start = start
+        self._boards = numpy.repeat(start[numpy.newaxis], count, axis=0)
+        self._turns = numpy.full(count, BLACK, dtype=numpy.int8)
+        self._states = numpy.full(count, UNFINISHED, dtype=numpy.int8)
+
+    def __len__(self):
+        return self._boards.shape[0]
+
+    def get_boards(self):
+        """
+        purpose: access to the boards, index [game, row - 1, col]
+        parameters: N/A
+        return: the (N, 20, 20) int8 array of cell codes
+        """
+        return self._boards
+
+    def get_turns(self):
+        """
+        purpose: access to whose turn it is in each game
+        parameters: N/A
+        return: the (N,) int8 array of cell codes
+        """
+        return self._turns
+
+    def get_states(self):
+        """
+        purpose: access to the game states
+        parameters: N/A
+        return: the (N,) int8 array, UNFINISHED or the winner's cell code
+        """
+        return self._states
+
+    def get_game_state(self, index):
+        """
+        purpose: gets the state of one game the way GessGame.get_game_state reports it
+        parameters: index
+        return: 'UNFINISHED', 'BLACK_WON' or 'WHITE_WON'
+        """
+        return STATE_NAMES[self._states[index]]
+
+    def get_board(self, index):
+        """
+        purpose: gets one board in the list form of Board.get_board (header row of column letters first)
+        parameters: index
+        return: the board as a list of rows
+        """
+        board = [list(COLUMNS)]
+        for row in self._boards[index]:
+            board.append([CELL_ITEMS[cell] for cell in row])
+        return board
+
+    def set_game(self, index, game):
+        """
+        purpose: copies the position of a GessGame into one of the games
+        parameters: index, game
+        return: N/A
+        """
+        self._boards[index] = numpy.frombuffer(bytes(game.get_board().get_cells()), dtype=numpy.int8).reshape(20, 20)
+        self._turns[index] = game.get_turn_code()
+        self._states[index] = game.get_state_code()
+
+    def reset(self, games=None):
+        """
+        purpose: puts games back to the starting position
+        parameters: games (indexes or bool mask of the games to reset, all of them if left out)
+        return: N/A
+        """
+        if games is None:
+            games = slice(None)
+        self._boards[games] = self._start
+        self._turns[games] = BLACK
+        self._states[games] = UNFINISHED
+
+    def step_names(self, moves):
+        """
+        purpose: same as step but takes one (move_from, move_to) pair of square names per game
+        parameters: moves
+        return: the (N,) bool array of accepted moves
+        """
+        return self.step(*parse_moves(moves))
+
+    def step(self, rows_from, cols_from, rows_to, cols_to):
+        """
+        purpose: tries one move in every game, with the same checks make_move does. accepted moves capture, clear
+        the edges, update the state and hand the turn over; games whose move is turned down are left as they were
+        parameters: rows_from, cols_from, rows_to, cols_to (board rows 1-20 and cols 0-19, one per game)
+        return: the (N,) bool array of accepted moves
+        """
+        boards = self._boards
+        count = boards.shape[0]
+        games = numpy.arange(count).reshape(-1, 1, 1)
+        rows_from = numpy.asarray(rows_from, dtype=numpy.int64)
+        cols_from = numpy.asarray(cols_from, dtype=numpy.int64)
+        rows_to = numpy.asarray(rows_to, dtype=numpy.int64)
+        cols_to = numpy.asarray(cols_to, dtype=numpy.int64)
+        turns = self._turns
+        others = 3 - turns
+
+        row_dir = rows_to - rows_from
+        col_dir = cols_to - cols_from
+        row_step = numpy.sign(row_dir)
+        col_step = numpy.sign(col_dir)
+        distance = numpy.maximum(numpy.abs(row_dir), numpy.abs(col_dir))
+
+        legal = self._states == UNFINISHED
+        legal &= (rows_from >= 2) & (rows_from <= 19) & (cols_from >= 1) & (cols_from <= 18)
+        legal &= (rows_to >= 2) & (rows_to <= 19) & (cols_to >= 1) & (cols_to <= 18)
+        legal &= distance > 0
+        legal &= (row_dir == 0) | (col_dir == 0) | (numpy.abs(row_dir) == numpy.abs(col_dir))
+
+        # array coordinates of the centers, clipped so games with bad moves can still be indexed
+        center_rows = numpy.clip(rows_from, 2, 19).reshape(-1, 1, 1) - 1
+        center_cols = numpy.clip(cols_from, 1, 18).reshape(-1, 1, 1)
+        piece = boards[games, center_rows + FOOTPRINT_ROWS, center_cols + FOOTPRINT_COLS]
+
+        legal &= ~(piece == others.reshape(-1, 1, 1)).any(axis=(1, 2))  # none of the other player's stones
+        legal &= (piece == turns.reshape(-1, 1, 1)).any(axis=(1, 2))  # at least one of their own
+        legal &= (piece[:, 1, 1] == turns) | (distance <= 3)  # no center stone, no more than three squares
+        legal &= piece[numpy.arange(count), 1 + row_step, 1 + col_step] == turns  # stone in that direction
+
+        # sliding the leading edge: every square it passes before the last one has to be empty
+        blocked = numpy.zeros(count, dtype=bool)
+        for row in (-1, 0, 1):
+            for col in (-1, 0, 1):
+                leading = ((row_step != 0) & (row_step == row)) | ((col_step != 0) & (col_step == col))
+                for step in range(1, MAX_DISTANCE):
+                    active = legal & leading & (step < distance)
+                    if not active.any():
+                        break
+                    path_rows = numpy.clip(center_rows[:, 0, 0] + row + step * row_step, 0, 19)
+                    path_cols = numpy.clip(center_cols[:, 0, 0] + col + step * col_step, 0, 19)
+                    blocked |= active & (boards[numpy.arange(count), path_rows, path_cols] != EMPTY)
+        legal &= ~blocked
+
+        candidates = numpy.flatnonzero(legal)
+        if candidates.size == 0:
+            return legal
+
+        # playing the candidates on copies of their boards
+        moved = boards[candidates].copy()
+        games = numpy.arange(candidates.size).reshape(-1, 1, 1)
+        moved[games, center_rows[candidates] + FOOTPRINT_ROWS, center_cols[candidates] + FOOTPRINT_COLS] = EMPTY
+        target_rows = rows_to[candidates].reshape(-1, 1, 1) - 1
+        target_cols = cols_to[candidates].reshape(-1, 1, 1)
+        moved[games, target_rows + FOOTPRINT_ROWS, target_cols + FOOTPRINT_COLS] = piece[candidates]
+        moved[:, 0, :] = EMPTY  # stones on the edges are removed
+        moved[:, 19, :] = EMPTY
+        moved[:, :, 0] = EMPTY
+        moved[:, :, 19] = EMPTY
+
+        # the mover can't be left without a ring
+        keeps_ring = ring_centers(moved, turns[candidates]).any(axis=(1, 2))
+        legal[candidates[~keeps_ring]] = False
+        accepted = candidates[keeps_ring]
+        moved = moved[keeps_ring]
+
+        boards[accepted] = moved
+        other_has_ring = ring_centers(moved, others[accepted]).any(axis=(1, 2))
+        self._states[accepted[~other_has_ring]] = turns[accepted[~other_has_ring]]
+        self._turns[accepted] = others[accepted]
+
+        return legal
+
+    def count_rings(self, players=None):
+        """
+        purpose: counts the rings of one player in every game
+        parameters: players (cell code per game or one code for all games, whose turn it is if left out)
+        return: the (N,) array of ring counts
+        """
+        if players is None:
+            players = self._turns
+        players = numpy.broadcast_to(numpy.asarray(players, dtype=numpy.int8), (len(self),))
+        return ring_centers(self._boards, players).sum(axis=(1, 2))
@@ -0,0 +1,56 @@
+import unittest
+from GessGame import BLACK, WHITE, GessGame
+
+try:
+    import numpy
+    from GessBatchEnv import GessBatchEnv, from_games
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestGessBatchEnv(unittest.TestCase):
+
+    def test_start(self):
+        """tests every game starts in the starting position with black to move"""
+        env = GessBatchEnv(3)
+        self.assertEqual(env.get_board(2), GessGame().get_board().get_board())
+        self.assertEqual(list(env.get_turns()), [BLACK] * 3)
+        self.assertEqual(list(env.count_rings()), [1, 1, 1])
+
+    def test_step_matches_make_move(self):
+        """tests a step accepts and turns down the same moves as make_move and leaves the same boards"""
+        moves = [('c2', 'c3'), ('m3', 'm4'), ('b5', 'b6'), ('c3', 'c1'), ('h3', 'h7'), ('c3', 'd5'), ('l3', 'l6')]
+        env = GessBatchEnv(len(moves))
+        accepted = env.step_names(moves)
+        for index, move in enumerate(moves):
+            game = GessGame()
+            self.assertEqual(bool(accepted[index]), game.make_move(move[0], move[1]))
+            self.assertEqual(env.get_board(index), game.get_board().get_board())
+        self.assertEqual(list(env.get_turns()), [WHITE, BLACK, BLACK, BLACK, BLACK, BLACK, WHITE])
+
+    def test_win(self):
+        """tests a game is won when the other player's last ring is broken"""
+        game = GessGame()
+        game.make_move('c2', 'c3')
+        game.make_move('l18', 'l15')
+        game.make_move('c3', 'c4')
+        game.make_move('l15', 'l12')
+        game.make_move('c4', 'c5')
+        game.make_move('l12', 'l9')
+        game.make_move('c6', 'c7')
+        game.make_move('l9', 'l8')
+        env = from_games([game, GessGame()])
+        env.step_names([('l3', 'l6'), ('c2', 'c3')])
+        self.assertEqual(env.get_game_state(0), "BLACK_WON")
+        self.assertEqual(env.get_game_state(1), "UNFINISHED")
+        self.assertEqual(list(env.step_names([('e14', 'g14'), ('l13', 'l15')])), [False, True])
+
+    def test_reset(self):
+        """tests only the chosen games are reset"""
+        env = GessBatchEnv(2)
+        env.step_names([('c2', 'c3'), ('c2', 'c3')])
+        env.reset([0])
+        self.assertEqual(env.get_board(0), GessGame().get_board().get_board())
+        self.assertNotEqual(env.get_board(1), GessGame().get_board().get_board())
+        self.assertEqual(list(env.get_turns()), [BLACK, WHITE])
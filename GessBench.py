@@ -0,0 +1,229 @@
+# Description: Benchmarks for GessGame. Run with "python -m GessBench" to print a JSON report of perft node counts
+# and speeds, make_move and ring check speeds, random playout speed and peak memory. The perft node counts are
+# checked against known values, so a faster board engine that gets the rules wrong shows up here too.
+
+import argparse
+import json
+import random
+import sys
+import time
+
+from GessGame import GessGame
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+# fixed positions to run perft from, as the moves that lead to them from the starting position
+POSITIONS = {
+    "start": [],
+    "opening": [('c2', 'c3'), ('l13', 'l15'), ('q2', 'q3'), ('h14', 'i14')],
+    "middlegame": [('c2', 'c3'), ('l18', 'l15'), ('c3', 'c4'), ('l15', 'l12'), ('c4', 'c5'), ('l12', 'l9'),
+                   ('c6', 'c7'), ('l9', 'l8')],
+}
+
+# known perft node counts for each position, by depth
+EXPECTED_PERFT = {
+    "start": {1: 319, 2: 101761},
+    "opening": {1: 313, 2: 95176},
+    "middlegame": {1: 268, 2: 97019},
+}
+
+# moves make_move turns down in the starting position, one for each kind of check
+REJECTED_MOVES = [('m3', 'm4'),  # leaves black without a ring
+                  ('b5', 'b6'),  # no stones in the piece
+                  ('c3', 'c1'),  # center off the board
+                  ('c6', 'c10'),  # more than three squares without a center stone
+                  ('h3', 'h7'),  # path blocked
+                  ('c3', 'd5')]  # not in a line
+
+
+def position(name):
+    """
+    purpose: sets up one of the fixed positions
+    parameters: name (key of POSITIONS)
+    return: a GessGame in that position
+    """
+    game = GessGame()
+    for move_from, move_to in POSITIONS[name]:
+        game.make_move(move_from, move_to)
+    return game
+
+
+def perft(game, depth):
+    """
+    purpose: counts the positions reached after playing every sequence of legal moves depth plies long. the moves
+    are made in place and taken back, so the game is left as it was
+    parameters: game, depth
+    return: the number of positions
+    """
+    if depth == 0:
+        return 1
+
+    moves = list(game.iter_legal_centers())
+    if depth == 1:
+        return len(moves)
+
+    nodes = 0
+    for center_from, center_to in moves:
+        record = game.apply_center_move(center_from, center_to)
+        nodes += perft(game, depth - 1)
+        game.revert_move(record)
+    return nodes
+
+
+def bench_perft(name, depth):
+    """
+    purpose: times perft from one of the fixed positions and checks the node count
+    parameters: name (key of POSITIONS), depth
+    return: a dict with the node count, whether it matched, the time and nodes per second
+    """
+    game = position(name)
+    start = time.perf_counter()
+    nodes = perft(game, depth)
+    elapsed = time.perf_counter() - start
+
+    expected = EXPECTED_PERFT[name].get(depth)
+    return {"position": name, "depth": depth, "nodes": nodes, "expected": expected,
+            "correct": expected is None or expected == nodes, "seconds": elapsed, "nodes_per_second": nodes / elapsed}
+
+
+def bench_accepted_moves(plies, seed):
+    """
+    purpose: times make_move on moves that are accepted, by playing random legal moves (only the make_move calls
+    are timed)
+    parameters: plies (number of moves to time), seed
+    return: a dict with the number of moves, the time and moves per second
+    """
+    rng = random.Random(seed)
+    game = GessGame()
+    elapsed = 0
+    for _ in range(plies):
+        moves = game.legal_moves()
+        if not moves:
+            game = GessGame()
+            moves = game.legal_moves()
+        move_from, move_to = rng.choice(moves)
+
+        start = time.perf_counter()
+        game.make_move(move_from, move_to)
+        elapsed += time.perf_counter() - start
+
+    return {"moves": plies, "seconds": elapsed, "moves_per_second": plies / elapsed}
+
+
+def bench_rejected_moves(repeats):
+    """
+    purpose: times make_move on moves that get turned down
+    parameters: repeats (how many times to try each move in REJECTED_MOVES)
+    return: a dict with the number of moves, the time and moves per second
+    """
+    game = GessGame()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for move_from, move_to in REJECTED_MOVES:
+            game.make_move(move_from, move_to)
+    elapsed = time.perf_counter() - start
+
+    moves = repeats * len(REJECTED_MOVES)
+    return {"moves": moves, "seconds": elapsed, "moves_per_second": moves / elapsed}
+
+
+def bench_find_rings(repeats):
+    """
+    purpose: times the ring check make_move does for the win
+    parameters: repeats
+    return: a dict with the number of calls, the time and calls per second
+    """
+    game = position("middlegame")
+    board = game.get_board()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        game.find_rings("b", board)
+        game.find_rings("w", board)
+    elapsed = time.perf_counter() - start
+
+    return {"calls": 2 * repeats, "seconds": elapsed, "calls_per_second": 2 * repeats / elapsed}
+
+
+def bench_playouts(games, max_plies, seed):
+    """
+    purpose: times random playouts from the starting position
+    parameters: games, max_plies (playouts are cut off after this many moves), seed
+    return: a dict with the number of games and plies, the time, games and plies per second
+    """
+    rng = random.Random(seed)
+    plies = 0
+    start = time.perf_counter()
+    for _ in range(games):
+        game = GessGame()
+        for _ in range(max_plies):
+            moves = game.legal_moves()
+            if not moves:
+                break
+            game.make_move(*rng.choice(moves))
+            plies += 1
+    elapsed = time.perf_counter() - start
+
+    return {"games": games, "plies": plies, "seconds": elapsed, "games_per_second": games / elapsed,
+            "plies_per_second": plies / elapsed}
+
+
+def peak_memory_kb():
+    """
+    purpose: gets the peak memory the process has used
+    parameters: N/A
+    return: the peak resident set size in KB, or None where the resource module is missing
+    """
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":  # macOS reports bytes, Linux reports KB
+        peak //= 1024
+    return peak
+
+
+def run_benchmarks(depth=2, plies=2000, repeats=2000, games=20, max_plies=200, seed=0):
+    """
+    purpose: runs every benchmark
+    parameters: depth (perft depth), plies (accepted moves to time), repeats (for rejected moves and ring checks),
+    games and max_plies (random playouts), seed
+    return: a dict with the results
+    """
+    results = {"perft": [bench_perft(name, depth) for name in POSITIONS],
+               "make_move_accepted": bench_accepted_moves(plies, seed),
+               "make_move_rejected": bench_rejected_moves(repeats),
+               "find_rings": bench_find_rings(repeats),
+               "playouts": bench_playouts(games, max_plies, seed)}
+    results["correct"] = all(item["correct"] for item in results["perft"])
+    results["peak_memory_kb"] = peak_memory_kb()
+    return results
+
+
+def main(argv=None):
+    """
+    purpose: command line entry point, prints the results as JSON
+    parameters: argv (command line arguments, defaults to sys.argv)
+    return: exit status, 1 if a perft node count was wrong
+    """
+    parser = argparse.ArgumentParser(prog="python -m GessBench", description="Benchmarks for GessGame")
+    parser.add_argument("--depth", type=int, default=2, help="perft depth")
+    parser.add_argument("--plies", type=int, default=2000, help="accepted moves to time")
+    parser.add_argument("--repeats", type=int, default=2000, help="repeats for rejected moves and ring checks")
+    parser.add_argument("--games", type=int, default=20, help="random playouts")
+    parser.add_argument("--max-plies", type=int, default=200, help="moves per random playout")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.depth, args.plies, args.repeats, args.games, args.max_plies, args.seed)
+    print(json.dumps(results, indent=2))
+
+    if results["correct"]:
+        return 0
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
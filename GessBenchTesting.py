@@ -0,0 +1,30 @@
+import unittest
+from GessGame import GessGame
+from GessBench import EXPECTED_PERFT, REJECTED_MOVES, perft, position, run_benchmarks
+
+
+class TestGessBench(unittest.TestCase):
+
+    def test_perft_one(self):
+        """tests perft(1) from every fixed position against the known node counts"""
+        for name in EXPECTED_PERFT:
+            self.assertEqual(perft(position(name), 1), EXPECTED_PERFT[name][1])
+
+    def test_perft_leaves_game_alone(self):
+        """tests perft takes back the moves it makes"""
+        game = position("opening")
+        start_hash = game.get_hash()
+        perft(game, 2)
+        self.assertEqual(game.get_hash(), start_hash)
+
+    def test_rejected_moves(self):
+        """tests the moves timed as rejected really are rejected"""
+        for move_from, move_to in REJECTED_MOVES:
+            self.assertEqual(GessGame().make_move(move_from, move_to), False)
+
+    def test_report(self):
+        """tests a small benchmark run produces every section of the report"""
+        results = run_benchmarks(depth=1, plies=20, repeats=10, games=1, max_plies=10)
+        self.assertEqual(results["correct"], True)
+        for key in ("perft", "make_move_accepted", "make_move_rejected", "find_rings", "playouts"):
+            self.assertIn(key, results)
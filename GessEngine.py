@@ -0,0 +1,301 @@
+# Description: Alpha-beta search engine for GessGame. Searches in place with apply_center_move/revert_move, so
+# the game passed in is left exactly as it was.
+
+import time
+
+from GessGame import footprint_mask, grow, square_name, transform_center
+from MoveCache import MoveCache
+from TranspositionTable import TranspositionTable
+
+WIN_SCORE = 1000000
+RING_SCORE = 1000  # a ring is worth far more than any number of stones
+DEFAULT_DEPTH = 2  # used when neither a depth nor a time limit is given
+MAX_DEPTH = 64
+QUIESCENCE_DEPTH = 4  # how many captures in a row quiescence follows
+EXACT, LOWER, UPPER = 0, 1, 2  # what a transposition table score means
+
+
+class SearchTimeout(Exception):
+    """raised inside the search when the time limit runs out"""
+    pass
+
+
+def evaluate(game):
+    """
+    purpose: scores the position for the player whose turn it is, using rings first and then stones
+    parameters: game
+    return: the score (positive is good for the player to move)
+    """
+    board = game.get_board()
+    turn = game.get_turn()
+    not_turn = game.get_not_turn()
+
+    rings = board.count_rings(turn) - board.count_rings(not_turn)
+    stones = bin(board.get_stones(turn)).count("1") - bin(board.get_stones(not_turn)).count("1")
+    return rings * RING_SCORE + stones
+
+
+class GessEngine:
+    """
+    purpose: picks a move for the player whose turn it is
+    responsibilities: negamax alpha-beta with iterative deepening, move ordering (transposition table move, ring
+    captures, captures, ring threats), quiescence on captures, stopping at a deadline
+    communicates with(why): GessGame (makes and takes back moves), MoveCache (generates the moves, reusing the work
+    for pieces the last moves didn't touch), TranspositionTable (remembers scores
+    and best moves across iterations and move orders), OpeningBook (moves for positions seen in recorded games)
+    """
+
+    def __init__(self, table_size=1 << 18, book=None):
+        """
+        purpose: creates an engine with its own transposition table
+        parameters: table_size (number of transposition table entries), book (optional OpeningBook, its most played
+        move is used without searching while the position is in the book)
+        return: a new GessEngine object
+        """
+        self._table = TranspositionTable(table_size)
+        self._book = book
+        self._game = None
+        self._moves = None  # MoveCache of the game being searched, kept between searches of the same game
+        self._deadline = None
+        self._nodes = 0
+        self._depth = 0
+        self._root_best = None
+
+    def get_stats(self):
+        """
+        purpose: gets the statistics of the last search
+        parameters: N/A
+        return: a dict with the nodes searched, the depth completed and the transposition table statistics
+        """
+        return {"nodes": self._nodes, "depth": self._depth, "table": self._table.get_stats()}
+
+    def best_move(self, game, max_depth=None, time_limit_ms=None):
+        """
+        purpose: searches deeper and deeper until max_depth is done or the time limit runs out
+        parameters: game, max_depth (optional), time_limit_ms (optional)
+        return: the best (move_from, move_to) found so far, or None if there is no legal move
+        """
+        if max_depth is None:
+            if time_limit_ms is None:
+                max_depth = DEFAULT_DEPTH
+            else:
+                max_depth = MAX_DEPTH
+
+        if time_limit_ms is None:
+            self._deadline = None
+        else:
+            self._deadline = time.perf_counter() + time_limit_ms / 1000
+
+        if self._game is not game:
+            self._moves = MoveCache(game)
+        self._game = game
+        self._nodes = 0
+        self._depth = 0
+
+        if self._book is not None and game.get_game_state() == "UNFINISHED":
+            book_move = self._book.choose(game)
+            if book_move is not None:
+                return book_move
+
+        moves = self.order_moves(self._moves.legal_centers(), None)
+        if not moves:
+            return None
+
+        best = moves[0]
+        for depth in range(1, max_depth + 1):
+            self._root_best = None
+            try:
+                score = self.search_root(depth, moves)
+            except SearchTimeout:
+                # the previous best move is searched first, so anything that beat it is still an improvement
+                if self._root_best is not None:
+                    best = self._root_best
+                break
+
+            best = self._root_best
+            self._depth = depth
+            moves.remove(best)
+            moves.insert(0, best)
+
+            if abs(score) >= WIN_SCORE - MAX_DEPTH:  # forced win or loss, searching deeper won't change it
+                break
+
+        return square_name(best[0][0], best[0][1]), square_name(best[1][0], best[1][1])
+
+    def search_root(self, depth, moves):
+        """
+        purpose: searches every move at the root, keeping track of the best one as it goes
+        parameters: depth, moves (ordered root moves)
+        return: the score of the best move (the move itself is kept in self._root_best)
+        """
+        alpha = -WIN_SCORE - 1
+        beta = WIN_SCORE + 1
+        for move in moves:
+            record = self._game.apply_center_move(move[0], move[1])
+            try:
+                score = -self.search(depth - 1, -beta, -alpha, 1)
+            finally:
+                self._game.revert_move(record)
+
+            if score > alpha:
+                alpha = score
+                self._root_best = move
+        return alpha
+
+    def search(self, depth, alpha, beta, ply):
+        """
+        purpose: negamax alpha-beta search
+        parameters: depth (plies left), alpha, beta, ply (plies from the root)
+        return: the score for the player to move
+        """
+        self.check_time()
+        game = self._game
+
+        if game.get_game_state() != "UNFINISHED":  # the player who just moved won
+            return -WIN_SCORE + ply
+
+        if depth <= 0:
+            return self.quiescence(alpha, beta, ply, QUIESCENCE_DEPTH)
+
+        key, transform = game.get_canonical()  # positions equal up to symmetry share entries
+        entry = self._table.lookup(key)
+        hash_move = None
+        if entry is not None:
+            score, flag, canonical_move = entry
+            if canonical_move is not None:
+                hash_move = (transform_center(canonical_move[0], transform),
+                             transform_center(canonical_move[1], transform))
+            if self._table.get_depth(key) >= depth:
+                if flag == EXACT:
+                    return score
+                elif flag == LOWER and score >= beta:
+                    return score
+                elif flag == UPPER and score <= alpha:
+                    return score
+
+        moves = self.order_moves(self._moves.legal_centers(), hash_move)
+        if not moves:
+            return 0
+
+        alpha_start = alpha
+        best_score = -WIN_SCORE - 1
+        best_move = None
+        for move in moves:
+            record = game.apply_center_move(move[0], move[1])
+            try:
+                score = -self.search(depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                game.revert_move(record)
+
+            if score > best_score:
+                best_score = score
+                best_move = move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+
+        if best_score <= alpha_start:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        canonical_move = (transform_center(best_move[0], transform), transform_center(best_move[1], transform))
+        self._table.store(key, (best_score, flag, canonical_move), depth)
+
+        return best_score
+
+    def quiescence(self, alpha, beta, ply, depth):
+        """
+        purpose: keeps searching captures past the depth limit so the score isn't taken in the middle of an exchange
+        parameters: alpha, beta, ply (plies from the root), depth (captures left to follow)
+        return: the score for the player to move
+        """
+        self.check_time()
+        game = self._game
+
+        if game.get_game_state() != "UNFINISHED":
+            return -WIN_SCORE + ply
+
+        stand_pat = evaluate(game)
+        if stand_pat >= beta or depth == 0:
+            return stand_pat
+        if stand_pat > alpha:
+            alpha = stand_pat
+
+        others = game.get_board().get_stones(game.get_not_turn())
+        captures = []
+        for move in self._moves.legal_centers():
+            if others & footprint_mask(move[1][0], move[1][1]):
+                captures.append(move)
+
+        for move in self.order_moves(captures, None):
+            record = game.apply_center_move(move[0], move[1])
+            try:
+                score = -self.quiescence(-beta, -alpha, ply + 1, depth - 1)
+            finally:
+                game.revert_move(record)
+
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+
+        return alpha
+
+    def order_moves(self, moves, hash_move):
+        """
+        purpose: puts the moves most likely to be good first: the transposition table move, then captures of ring
+        stones, other captures, and moves that land next to an opponent's ring
+        parameters: moves (list of (center_from, center_to)), hash_move (best move stored for the position or None)
+        return: the ordered list of moves
+        """
+        game = self._game
+        board = game.get_board()
+        others = board.get_stones(game.get_not_turn())
+
+        ring_centers = 0
+        for center in board.get_ring_centers(game.get_not_turn()):
+            ring_centers |= footprint_mask(center[0], center[1])
+        ring_stones = ring_centers & others  # stones that make up the opponent's rings
+        ring_threats = grow(ring_centers)
+
+        scored = []
+        for move in moves:
+            if move == hash_move:
+                score = 4
+            else:
+                landing = footprint_mask(move[1][0], move[1][1])
+                if landing & ring_stones:
+                    score = 3
+                elif landing & others:
+                    score = 2
+                elif landing & ring_threats:
+                    score = 1
+                else:
+                    score = 0
+            scored.append((score, move))
+
+        scored.sort(key=lambda item: item[0], reverse=True)  # stable, so generation order breaks ties
+        return [item[1] for item in scored]
+
+    def check_time(self):
+        """
+        purpose: counts a node and stops the search if the deadline has passed (reading the clock is cheap next to
+        generating the moves of a node)
+        parameters: N/A
+        return: N/A
+        """
+        self._nodes += 1
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+
+
+def best_move(game, max_depth=None, time_limit_ms=None):
+    """
+    purpose: picks a move for the player whose turn it is with a fresh engine
+    parameters: game, max_depth (optional), time_limit_ms (optional)
+    return: the best (move_from, move_to) found, or None if there is no legal move
+    """
+    return GessEngine().best_move(game, max_depth, time_limit_ms)
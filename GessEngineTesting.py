@@ -0,0 +1,54 @@
+import time
+import unittest
+from GessGame import GessGame
+from GessEngine import GessEngine, best_move
+
+
+class TestGessEngine(unittest.TestCase):
+
+    def setUp(self):
+        """plays up to a position where black can take white's last ring with l3 to l6"""
+        self.game = GessGame()
+        self.game.make_move('c2', 'c3')
+        self.game.make_move('l18', 'l15')
+        self.game.make_move('c3', 'c4')
+        self.game.make_move('l15', 'l12')
+        self.game.make_move('c4', 'c5')
+        self.game.make_move('l12', 'l9')
+        self.game.make_move('c6', 'c7')
+        self.game.make_move('l9', 'l8')
+
+    def test_finds_win(self):
+        """tests the engine takes the last ring when it can"""
+        self.assertEqual(best_move(self.game, max_depth=1), ('l3', 'l6'))
+
+    def test_game_left_unchanged(self):
+        """tests the search takes back every move it makes"""
+        before = [row.copy() for row in self.game.get_board().get_board()]
+        start_hash = self.game.get_hash()
+        best_move(self.game, max_depth=2)
+        self.assertEqual(self.game.get_board().get_board(), before)
+        self.assertEqual(self.game.get_hash(), start_hash)
+        self.assertEqual(self.game.get_turn(), "b")
+        self.assertEqual(self.game.get_game_state(), "UNFINISHED")
+
+    def test_time_limit(self):
+        """tests the engine answers close to its time budget with a legal move"""
+        game = GessGame()
+        start = time.perf_counter()
+        move = best_move(game, time_limit_ms=100)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertIn(move, game.legal_moves())
+
+    def test_no_move_after_game_over(self):
+        """tests there is nothing to search once the game is won"""
+        game = GessGame()
+        game.resign_game()
+        self.assertEqual(best_move(game, max_depth=1), None)
+
+    def test_stats(self):
+        """tests the engine reports the depth it finished"""
+        engine = GessEngine(1024)
+        engine.best_move(GessGame(), max_depth=1)
+        self.assertEqual(engine.get_stats()["depth"], 1)
+        self.assertGreater(engine.get_stats()["nodes"], 0)
@@ -0,0 +1,175 @@
+# Description: NumPy static evaluation of Gess positions, one board or stacks of many. Every feature is worked out
+# for all the boards at once from 3x3 sliding-window sums and shifted copies of the board arrays, so the only
+# Python loops are over the nine footprint offsets and the eight directions. Meant for labelling archived positions
+# (see evaluate_snapshots, which reads PositionStore records straight into arrays) and for batched search.
+#
+# Boards are (N, 20, 20) arrays of GessGame cell codes indexed [board, row - 1, col], the layout GessBatchEnv uses.
+
+import numpy
+
+from GessEngine import RING_SCORE
+from GessGame import BLACK, DIRECTIONS, EMPTY, SNAPSHOT_SIZE, WHITE
+
+FEATURES = ("stones", "rings", "near_rings", "mobility", "exposed")
+WEIGHTS = numpy.array([1.0, RING_SCORE, 25.0, 0.5, -0.5])  # per feature, applied to own minus the other player's
+CHUNK_SIZE = 1 << 13  # snapshots scored at a time by evaluate_snapshots, bounds the temporary arrays
+
+# the playable centers are rows 2-19 and cols b-s, [1:19, 1:19] in array coordinates. center arrays below are
+# (N, 18, 18) over that area. ring centers need the full ring on the playable board, [1:17, 1:17] of a center array
+RING_AREA = numpy.zeros((18, 18), dtype=bool)
+RING_AREA[1:17, 1:17] = True
+
+# for each direction, the centers whose neighbour one step that way is still a playable center
+STEP_AREAS = []
+for _row_step, _col_step in DIRECTIONS:
+    _area = numpy.zeros((18, 18), dtype=bool)
+    _area[max(0, -_row_step):18 - max(0, _row_step), max(0, -_col_step):18 - max(0, _col_step)] = True
+    STEP_AREAS.append(_area)
+
+
+def window_sums(cells):
+    """
+    purpose: counts the cells set in the 3x3 footprint around every playable center
+    parameters: cells (N, 20, 20) bool array
+    return: a (N, 18, 18) int8 array
+    """
+    cells = cells.view(numpy.int8)  # adding int8 is much faster than adding bools cast one pass at a time
+    sums = cells[:, 1:19, 1:19].copy()  # the center
+    for row_step, col_step in DIRECTIONS:
+        sums += cells[:, 1 + row_step:19 + row_step, 1 + col_step:19 + col_step]
+    return sums
+
+
+def side_features(own, own_sums, other_sums, empty_centers):
+    """
+    purpose: works out the features of one color in every board, all but exposed
+    parameters: own ((N, 20, 20) bool array of the color's stones), own_sums, other_sums (window_sums of both
+    colors' stones), empty_centers ((N, 18, 18) bool array of empty playable squares)
+    return: the features (a (N, 4) int32 array of stones, rings, near_rings and mobility), and the playable squares
+    the color could capture on with a one square move ((N, 18, 18) bool array)
+    """
+    count = own.shape[0]
+    rings = (own_sums == 8) & empty_centers & RING_AREA  # with an empty center the sum is the ring around it
+    near_rings = (own_sums == 7) & (other_sums == 0) & empty_centers & RING_AREA
+
+    # a one square move can't be blocked, so these are every legal one square move except the ones that would leave
+    # the color without a ring
+    pieces = (own_sums > 0) & (other_sums == 0)
+    moves_here = numpy.zeros((count, 18, 18), dtype=numpy.int8)
+    landings = numpy.zeros(own.shape, dtype=bool)  # centers in array coordinates, like the boards
+    for direction, (row_step, col_step) in enumerate(DIRECTIONS):
+        stone = own[:, 1 + row_step:19 + row_step, 1 + col_step:19 + col_step]  # a stone on that side of the piece
+        moves = pieces & stone
+        moves &= STEP_AREAS[direction]
+        moves_here += moves.view(numpy.int8)
+        landings[:, 1 + row_step:19 + row_step, 1 + col_step:19 + col_step] |= moves
+    mobility = moves_here.reshape(count, -1).sum(axis=1, dtype=numpy.int32)
+
+    reached = landings[:, 1:19, 1:19].copy()  # stones are only ever on the playable squares
+    for row_step, col_step in DIRECTIONS:
+        reached |= landings[:, 1 + row_step:19 + row_step, 1 + col_step:19 + col_step]
+
+    counts = numpy.stack([numpy.count_nonzero(own.reshape(count, -1), axis=1),
+                          numpy.count_nonzero(rings.reshape(count, -1), axis=1),
+                          numpy.count_nonzero(near_rings.reshape(count, -1), axis=1),
+                          mobility], axis=1).astype(numpy.int32)
+    return counts, reached
+
+
+def features(boards, players):
+    """
+    purpose: works out the features of both players:
+        stones: stones on the board
+        rings: ring centers, as Board.count_rings counts them
+        near_rings: empty centers with seven of the eight ring stones, the missing one on an empty square
+        mobility: one square moves of pieces, which is every legal one square move but the ones that would leave the
+        player without a ring
+        exposed: stones the other player could capture with a one square move
+    parameters: boards ((N, 20, 20) or one (20, 20) board), players (cell code of the player the scores are for, one
+    per board or a single code)
+    return: a (N, 2, len(FEATURES)) int32 array, [:, 0] for the given players and [:, 1] for their opponents
+    """
+    boards = numpy.asarray(boards, dtype=numpy.int8).reshape(-1, 20, 20)
+    count = boards.shape[0]
+    black = boards == BLACK
+    white = boards == WHITE
+    black_sums = window_sums(black)
+    white_sums = window_sums(white)
+    empty_centers = boards[:, 1:19, 1:19] == EMPTY
+
+    black_counts, black_reached = side_features(black, black_sums, white_sums, empty_centers)
+    white_counts, white_reached = side_features(white, white_sums, black_sums, empty_centers)
+    black_exposed = numpy.count_nonzero((black[:, 1:19, 1:19] & white_reached).reshape(count, -1), axis=1)
+    white_exposed = numpy.count_nonzero((white[:, 1:19, 1:19] & black_reached).reshape(count, -1), axis=1)
+    black_features = numpy.column_stack([black_counts, black_exposed]).astype(numpy.int32)
+    white_features = numpy.column_stack([white_counts, white_exposed]).astype(numpy.int32)
+
+    black_to_score = numpy.broadcast_to(numpy.asarray(players) == BLACK, (count,)).reshape(-1, 1)
+    return numpy.stack([numpy.where(black_to_score, black_features, white_features),
+                        numpy.where(black_to_score, white_features, black_features)], axis=1)
+
+
+def evaluate_batch(boards, players, weights=WEIGHTS):
+    """
+    purpose: scores boards for the given players
+    parameters: boards ((N, 20, 20) or one (20, 20) board), players (one cell code per board or a single code),
+    weights (one per feature)
+    return: a (N,) float array, positive is good for the player, or a float for a single board
+    """
+    both = features(boards, players)
+    scores = (both[:, 0] - both[:, 1]) @ numpy.asarray(weights, dtype=numpy.float64)
+    if numpy.ndim(boards) == 2:
+        return float(scores[0])
+    return scores
+
+
+def boards_from_games(games):
+    """
+    purpose: stacks the boards of some games
+    parameters: games (list of GessGame)
+    return: boards (N, 20, 20 int8 array), turns (N,) int8 array
+    """
+    cells = b"".join(bytes(game.get_board().get_cells()) for game in games)
+    boards = numpy.frombuffer(cells, dtype=numpy.int8).reshape(-1, 20, 20)
+    return boards, numpy.array([game.get_turn_code() for game in games], dtype=numpy.int8)
+
+
+def boards_from_snapshots(data):
+    """
+    purpose: unpacks GessGame.to_bytes records without making a game for each
+    parameters: data (bytes-like holding whole SNAPSHOT_SIZE records back to back, e.g. PositionStore.get_view())
+    return: boards (N, 20, 20 int8 array), turns (N,) int8 array, states (N,) int8 array
+    """
+    records = numpy.frombuffer(data, dtype=numpy.uint8).reshape(-1, SNAPSHOT_SIZE)
+    cells = (records[:, :100, numpy.newaxis] >> numpy.array([0, 2, 4, 6], dtype=numpy.uint8)) & 3
+    boards = cells.astype(numpy.int8).reshape(-1, 20, 20)
+    return boards, (records[:, 100] & 3).astype(numpy.int8), (records[:, 100] >> 2).astype(numpy.int8)
+
+
+def evaluate(game):
+    """
+    purpose: scores one game's position for the player whose turn it is
+    parameters: game
+    return: the score
+    """
+    boards, turns = boards_from_games([game])
+    return float(evaluate_batch(boards, turns)[0])
+
+
+def evaluate_snapshots(data, weights=WEIGHTS, chunk_size=CHUNK_SIZE):
+    """
+    purpose: scores snapshot records for the player to move in each, a chunk at a time
+    parameters: data (bytes-like holding whole SNAPSHOT_SIZE records back to back), weights, chunk_size (records per
+    chunk)
+    return: a (N,) float array
+    """
+    data = memoryview(data).cast("B")
+    if len(data) % SNAPSHOT_SIZE:
+        raise ValueError("expected whole " + str(SNAPSHOT_SIZE) + " byte snapshots, got " + str(len(data)) + " bytes")
+    count = len(data) // SNAPSHOT_SIZE
+    scores = numpy.empty(count, dtype=numpy.float64)
+    for start in range(0, count, chunk_size):
+        stop = min(count, start + chunk_size)
+        boards, turns = boards_from_snapshots(data[start * SNAPSHOT_SIZE:stop * SNAPSHOT_SIZE])[:2]
+        scores[start:stop] = evaluate_batch(boards, turns, weights)
+    return scores
@@ -0,0 +1,82 @@
+import unittest
+from GessBench import position
+from GessGame import BLACK, DIRECTIONS, SUICIDE, WHITE, GessGame
+
+try:
+    import numpy
+    from GessEvaluation import (FEATURES, boards_from_games, boards_from_snapshots, evaluate, evaluate_batch,
+                                evaluate_snapshots, features)
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestGessEvaluation(unittest.TestCase):
+
+    def setUp(self):
+        """plays up to a position where black can take white's last ring with l3 to l6"""
+        self.game = position("middlegame")
+
+    def test_start(self):
+        """tests the starting position is even and its counts"""
+        boards, turns = boards_from_games([GessGame()])
+        both = features(boards, turns)
+        self.assertEqual(list(both[0, 0]), list(both[0, 1]))
+        self.assertEqual(both[0, 0, FEATURES.index("stones")], 43)
+        self.assertEqual(both[0, 0, FEATURES.index("rings")], 1)
+        self.assertEqual(both[0, 0, FEATURES.index("exposed")], 0)  # the sides are too far apart
+        self.assertEqual(evaluate(GessGame()), 0.0)
+
+    def test_matches_board(self):
+        """tests stones and rings agree with the board and mobility with is_legal, suicides included"""
+        board = self.game.get_board()
+        both = features(boards_from_games([self.game])[0], BLACK)
+        for side, player in ((0, BLACK), (1, WHITE)):
+            self.assertEqual(both[0, side, FEATURES.index("stones")], bin(board.get_stones(player)).count("1"))
+            self.assertEqual(both[0, side, FEATURES.index("rings")], board.count_rings(player))
+
+        one_square = 0
+        for row in range(2, 20):
+            for col in range(1, 19):
+                for row_step, col_step in DIRECTIONS:
+                    legal, reason = self.game.is_legal((row, col), (row + row_step, col + col_step))
+                    if legal or reason == SUICIDE:
+                        one_square += 1
+        self.assertEqual(both[0, 0, FEATURES.index("mobility")], one_square)
+
+    def test_single_and_batch_agree(self):
+        """tests a stack of boards scores the same as each board on its own, for either player"""
+        games = [GessGame(), self.game]
+        boards, turns = boards_from_games(games)
+        scores = evaluate_batch(boards, turns)
+        self.assertEqual(scores.shape, (2,))
+        for index, game in enumerate(games):
+            self.assertEqual(evaluate_batch(boards[index], turns[index]), scores[index])
+            self.assertEqual(evaluate(game), scores[index])
+        self.assertEqual(evaluate_batch(boards[1], WHITE), -scores[1])
+
+    def test_snapshots(self):
+        """tests snapshots unpack to the same boards and score the same"""
+        games = [GessGame(), self.game] * 3
+        data = b"".join(game.to_bytes() for game in games)
+        boards, turns, states = boards_from_snapshots(data)
+        expected_boards, expected_turns = boards_from_games(games)
+        self.assertTrue((boards == expected_boards).all())
+        self.assertTrue((turns == expected_turns).all())
+        self.assertEqual(list(states), [0] * 6)
+        self.assertTrue((evaluate_snapshots(data, chunk_size=4) == evaluate_batch(boards, turns)).all())
+
+    def test_partial_snapshot(self):
+        """tests a buffer that doesn't hold whole snapshots is turned down"""
+        with self.assertRaises(ValueError):
+            evaluate_snapshots(GessGame().to_bytes()[:-1])
+
+    def test_exposed(self):
+        """tests stones one square away from an enemy landing are exposed"""
+        game = GessGame()
+        game.make_move('c6', 'c9')
+        game.make_move('c15', 'c12')
+        boards, turns = boards_from_games([game])
+        both = features(boards, turns)
+        self.assertGreater(both[0, 0, FEATURES.index("exposed")], 0)
+        self.assertGreater(both[0, 1, FEATURES.index("exposed")], 0)
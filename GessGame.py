@@ -2,6 +2,285 @@
 # Date: 5/30/2020
 # Description: Implementation of GessGame. See rules at https://www.chessvariants.com/crossover.dir/gess.html
 
+import random
+
+# The board is also kept as two 400-bit integers, one per player. Bit (row - 1) * 20 + col holds the
+# stone at board[row][col], so every board row is 20 bits wide and a footprint is three 3-bit slices.
+BOARD_WIDTH = 20
+FULL_MASK = (1 << 400) - 1
+FOOTPRINT_MASK = 0b111 | (0b111 << 20) | (0b111 << 40)  # 3x3 footprint anchored at row 1, col 0
+EDGE_MASK = ((1 << 20) - 1) | (((1 << 20) - 1) << 380)  # rows 1 and 20
+for _row in range(20):
+    EDGE_MASK |= (1 << (_row * 20)) | (1 << (_row * 20 + 19))  # cols a and t
+RING_CENTER_AREA = 0  # only centers in rows 3-18 and cols c-r can have a full ring on the board
+for _row in range(3, 19):
+    RING_CENTER_AREA |= ((1 << 16) - 1) << ((_row - 1) * 20 + 2)
+RING_OFFSETS = (1, -1, 20, -20, 21, 19, -19, -21)  # e, w, n, s, ne, nw, se, sw
+COLUMNS = "abcdefghijklmnopqrst"
+
+# cells and turns are small int codes inside the classes; the items 'b', 'w' and ' ' and the state names are only
+# used at the edges of the API
+EMPTY, BLACK, WHITE = 0, 1, 2
+CELL_ITEMS = (" ", "b", "w")  # code -> item
+CELL_CODES = {" ": EMPTY, "b": BLACK, "w": WHITE, EMPTY: EMPTY, BLACK: BLACK, WHITE: WHITE}  # item or code -> code
+UNFINISHED, BLACK_WON, WHITE_WON = 0, 1, 2  # a won game's state is the winner's cell code
+STATE_NAMES = ("UNFINISHED", "BLACK_WON", "WHITE_WON")  # state -> name
+DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))  # n, s, e, w, ne, nw, se, sw
+DIRECTION_INDEX = {direction: index for index, direction in enumerate(DIRECTIONS)}  # (row_step, col_step) -> index
+
+# the leading edge of a piece is the part of its footprint facing the direction it moves, e.g. nw, n and ne
+# when going north; these are the only squares that can run into stones while the piece slides
+# (masks are anchored like FOOTPRINT_MASK)
+LEADING_EDGE_MASKS = {}
+for _row_step, _col_step in DIRECTIONS:
+    LEADING_EDGE_MASKS[(_row_step, _col_step)] = 0
+    for _row in (-1, 0, 1):
+        for _col in (-1, 0, 1):
+            if (_row_step != 0 and _row == _row_step) or (_col_step != 0 and _col == _col_step):
+                LEADING_EDGE_MASKS[(_row_step, _col_step)] |= 1 << ((_row + 1) * BOARD_WIDTH + _col + 1)
+
+# why is_legal turns a move down
+NOT_A_SQUARE = "NOT_A_SQUARE"  # a square name that isn't on the board
+GAME_OVER = "GAME_OVER"
+OUT_OF_BOUNDS = "OUT_OF_BOUNDS"  # a center off the playable board
+NOT_IN_A_LINE = "NOT_IN_A_LINE"  # no move, or not along one of the eight directions
+FOREIGN_STONE = "FOREIGN_STONE"  # the other player's stone in the piece
+NO_STONES = "NO_STONES"  # none of the player's stones in the piece
+NO_STONE_IN_DIRECTION = "NO_STONE_IN_DIRECTION"
+TOO_FAR = "TOO_FAR"  # more than three squares without a center stone
+BLOCKED = "BLOCKED"  # the leading edge runs into a stone before the last square
+SUICIDE = "SUICIDE"  # leaves the player without a ring
+
+# tables computed once at import so the rule checks don't build coordinate lists, indexed by cell index
+# (row - 1) * 20 + col like the bitboards. footprints only exist for centers on the playable board (rows 2-19,
+# cols b-s), the entries for other centers are None
+FOOTPRINT_OFFSETS = ((0, 0),) + DIRECTIONS  # c, n, s, e, w, ne, nw, se, sw
+FOOTPRINT_CELLS = []  # index -> the 9 cell indexes of the footprint centered there, in FOOTPRINT_OFFSETS order
+FOOTPRINT_MASKS = []  # index -> mask of that footprint
+RING_NEIGHBORS = []  # index -> the 8 cell indexes that have to hold a player's stones for a ring centered there
+RAYS = []  # index -> for each of DIRECTIONS, the cell indexes from the next square in that direction to the edge
+for _index in range(400):
+    _row = _index // BOARD_WIDTH + 1
+    _col = _index % BOARD_WIDTH
+    if 2 <= _row <= 19 and 1 <= _col <= 18:
+        FOOTPRINT_CELLS.append(tuple(_index + _row_step * BOARD_WIDTH + _col_step
+                                     for _row_step, _col_step in FOOTPRINT_OFFSETS))
+        FOOTPRINT_MASKS.append(FOOTPRINT_MASK << (_index - BOARD_WIDTH - 1))
+        RING_NEIGHBORS.append(FOOTPRINT_CELLS[_index][1:])
+    else:
+        FOOTPRINT_CELLS.append(None)
+        FOOTPRINT_MASKS.append(None)
+        RING_NEIGHBORS.append(None)
+
+    _rays = []
+    for _row_step, _col_step in DIRECTIONS:
+        _ray = []
+        _distance = 1
+        while 1 <= _row + _row_step * _distance <= 20 and 0 <= _col + _col_step * _distance <= 19:
+            _ray.append(_index + (_row_step * BOARD_WIDTH + _col_step) * _distance)
+            _distance += 1
+        _rays.append(tuple(_ray))
+    RAYS.append(tuple(_rays))
+
+PLAYABLE_CENTERS = tuple(_index for _index in range(400) if FOOTPRINT_MASKS[_index] is not None)
+
+# snapshots pack the board at 2 bits per cell, four cells to a byte starting from the low bits, followed by one byte
+# holding the turn (low 2 bits) and the state (next 2 bits)
+SNAPSHOT_SIZE = 101
+SNAPSHOT_UNPACK = [bytes(((byte >> shift) & 3 for shift in (0, 2, 4, 6))) for byte in range(256)]  # byte -> 4 cells
+
+# Zobrist keys: one random 64-bit number per (player, cell) plus one for white to move. a position's hash is the
+# xor of the keys of its stones, so a move only has to xor in and out the cells it changes. the seed is fixed so
+# hashes are the same from run to run and can be stored on disk
+_zobrist_random = random.Random(20200530)
+ZOBRIST_KEYS = (None,  # indexed by cell code
+                [_zobrist_random.getrandbits(64) for _ in range(400)],
+                [_zobrist_random.getrandbits(64) for _ in range(400)])
+ZOBRIST_WHITE_TO_MOVE = _zobrist_random.getrandbits(64)
+
+# symmetries: the rules don't change when the board is mirrored left to right (col c <-> col 19 - c), or when it is
+# flipped top to bottom (row r <-> row 21 - r) with the colors and the turn swapped. each transform is its own
+# inverse, so the same call maps a position or move to a transformed one and back again
+IDENTITY, MIRROR, FLIP, MIRROR_FLIP = 0, 1, 2, 3
+TRANSFORMS = (IDENTITY, MIRROR, FLIP, MIRROR_FLIP)
+SWAPS_COLORS = (False, False, True, True)  # transform -> whether the colors and the turn are swapped
+SWAPPED_CELLS = bytes.maketrans(bytes((BLACK, WHITE)), bytes((WHITE, BLACK)))  # cell code -> code, colors swapped
+SYMMETRY_INDEX = []  # transform -> tuple of cell index -> transformed cell index
+for _transform in TRANSFORMS:
+    _mapping = []
+    for _index in range(400):
+        _row, _col = _index // BOARD_WIDTH + 1, _index % BOARD_WIDTH
+        if _transform in (MIRROR, MIRROR_FLIP):
+            _col = 19 - _col
+        if SWAPS_COLORS[_transform]:
+            _row = 21 - _row
+        _mapping.append((_row - 1) * BOARD_WIDTH + _col)
+    SYMMETRY_INDEX.append(tuple(_mapping))
+
+# boards keep the hashes of all four transforms of their position in one 256-bit number, 64 bits per transform, so
+# a move still only xors in and out one key per changed cell. the key of a stone is the Zobrist key of the stone it
+# turns into under each transform
+HASH_BITS = 64
+HASH_MASK = (1 << HASH_BITS) - 1
+SYMMETRY_KEYS = [None, [], []]  # indexed by cell code, then by cell index
+for _cell in (BLACK, WHITE):
+    for _index in range(400):
+        _key = 0
+        for _transform in TRANSFORMS:
+            _transformed_cell = SWAPPED_CELLS[_cell] if SWAPS_COLORS[_transform] else _cell
+            _key |= ZOBRIST_KEYS[_transformed_cell][SYMMETRY_INDEX[_transform][_index]] << (_transform * HASH_BITS)
+        SYMMETRY_KEYS[_cell].append(_key)
+SYMMETRY_TURN_KEYS = [None, 0, 0]  # indexed by the turn's cell code
+for _turn in (BLACK, WHITE):
+    for _transform in TRANSFORMS:
+        if (SWAPPED_CELLS[_turn] if SWAPS_COLORS[_transform] else _turn) == WHITE:
+            SYMMETRY_TURN_KEYS[_turn] |= ZOBRIST_WHITE_TO_MOVE << (_transform * HASH_BITS)
+
+
+def bit_index(row, col):
+    """
+    purpose: converts a board row and column into the bit position used by the bitboards
+    parameters: row, col
+    return: the bit index
+    """
+    return (row - 1) * BOARD_WIDTH + col
+
+
+def square_name(row, col):
+    """
+    purpose: converts a board row and column into the alpha-numeric name used by make_move (e.g. 'c3')
+    parameters: row, col
+    return: the square name
+    """
+    return COLUMNS[col] + str(row)
+
+
+SQUARE_INDEX = {}  # square name -> cell index, for all 400 squares
+for _index in range(400):
+    SQUARE_INDEX[square_name(_index // BOARD_WIDTH + 1, _index % BOARD_WIDTH)] = _index
+
+
+def square_index(square):
+    """
+    purpose: converts a square given as its name (e.g. 'c3'), its cell index or a (row, col) pair into the cell index,
+    so callers that already have numbers don't pay for parsing names
+    parameters: square
+    return: the cell index, (row - 1) * 20 + col
+    """
+    if isinstance(square, str):
+        index = SQUARE_INDEX.get(square)
+        if index is None:
+            raise ValueError("not a square on the board: " + repr(square))
+        return index
+
+    if isinstance(square, int) and not isinstance(square, bool):
+        if not 0 <= square < 400:
+            raise ValueError("square index out of range: " + repr(square))
+        return square
+
+    if isinstance(square, (tuple, list)) and len(square) == 2:
+        row, col = square
+        if isinstance(row, int) and isinstance(col, int) and 1 <= row <= 20 and 0 <= col <= 19:
+            return bit_index(row, col)
+        raise ValueError("not a (row, col) on the board: " + repr(square))
+
+    raise ValueError("expected a square name, cell index or (row, col), got " + repr(square))
+
+
+def transform_square(square, transform):
+    """
+    purpose: maps a square to where it is in the transformed position (and back, transforms are their own inverse)
+    parameters: square (name, cell index or (row, col), see square_index), transform (one of TRANSFORMS)
+    return: the square name
+    """
+    index = SYMMETRY_INDEX[transform][square_index(square)]
+    return square_name(index // BOARD_WIDTH + 1, index % BOARD_WIDTH)
+
+
+def transform_center(center, transform):
+    """
+    purpose: same as transform_square for a [row, col] center, the form the move generators use
+    parameters: center, transform
+    return: the transformed [row, col]
+    """
+    index = SYMMETRY_INDEX[transform][(center[0] - 1) * BOARD_WIDTH + center[1]]
+    return [index // BOARD_WIDTH + 1, index % BOARD_WIDTH]
+
+
+def transform_move(move_from, move_to, transform):
+    """
+    purpose: maps a move to the same move in the transformed position, e.g. into or out of the canonical position
+    from GessGame.get_canonical
+    parameters: move_from, move_to (squares, see square_index), transform
+    return: (move_from, move_to) as square names
+    """
+    return transform_square(move_from, transform), transform_square(move_to, transform)
+
+
+def footprint_mask(row, col):
+    """
+    purpose: builds the mask of the 3x3 footprint around a center square
+    parameters: row, col (center of the footprint, must be on the playable board)
+    return: the footprint mask
+    """
+    return FOOTPRINT_MASKS[(row - 1) * BOARD_WIDTH + col]
+
+
+def ring_centers(stones, occupied, area=RING_CENTER_AREA):
+    """
+    purpose: finds every empty center that is surrounded by eight of the given stones
+    parameters: stones (one player's bitboard), occupied (both players' bitboards), area (optional mask that limits
+    which centers are looked at)
+    return: a mask of the ring centers
+    """
+    centers = area & ~occupied
+    for offset in RING_OFFSETS:
+        if offset > 0:
+            centers &= stones >> offset
+        else:
+            centers &= stones << -offset
+    return centers
+
+
+def grow(mask):
+    """
+    purpose: grows a mask by one square in every direction (bits that wrap around a row end up in cols a or t and
+    bits past row 20 are dropped)
+    parameters: mask
+    return: the grown mask
+    """
+    area = mask | (mask << 1) | (mask >> 1)
+    return (area | (area << BOARD_WIDTH) | (area >> BOARD_WIDTH)) & FULL_MASK
+
+
+def ring_area(changed):
+    """
+    purpose: finds the ring centers whose ring could have been changed, i.e. the centers within one square of a
+    changed cell (cols a and t, where wrapped bits end up, are never ring centers)
+    parameters: changed (mask of changed cells)
+    return: a mask of the affected ring centers
+    """
+    return grow(changed) & RING_CENTER_AREA
+
+
+# index -> the ring centers a footprint centered there can change, None off the playable board
+FOOTPRINT_RING_AREAS = [None if _mask is None else ring_area(_mask) for _mask in FOOTPRINT_MASKS]
+
+
+def mask_centers(mask):
+    """
+    purpose: lists the squares set in a mask
+    parameters: mask
+    return: a list of [row, col], lowest cell index first
+    """
+    centers = []
+    while mask:
+        lowest = mask & -mask
+        index = lowest.bit_length() - 1
+        centers.append([index // BOARD_WIDTH + 1, index % BOARD_WIDTH])
+        mask ^= lowest
+    return centers
+
 
 class Board:
     """
@@ -10,13 +289,19 @@ class Board:
     communicates with(why): Interacts with GessGame to help it keep track of the board udpates
     """
 
+    __slots__ = ("_cells", "_black", "_white", "_rings", "_hash")
+
     def __init__(self):
         """ 
         purpose: Creates the initial board object with the predetermined starting spots
         parameters: N/A
         return: the board with the initial spots
         """""
-        self._board = []
+        self._cells = bytearray(400)  # cell code of every square, at the same index as the bitboards
+        self._black = 0
+        self._white = 0
+        self._rings = [0, 0, 0]  # ring centers of each player as a mask, by cell code, kept up to date move by move
+        self._hash = 0  # Zobrist hashes of the stones under every transform (see SYMMETRY_KEYS), kept up to date move by move
         self.initial_board()
 
     def initial_board(self):
@@ -25,16 +310,6 @@ class Board:
         parameters: N/A
         return: the board with the initial spots
         """
-        count = 1
-
-        top_row = ["a", "b", "c", "d", "e", "f", "g", "h", "i", "j", "k", "l", "m", "n", "o", "p", "q", "r", "s", "t"]
-        self._board.append(top_row)
-
-        for i in range(20):
-            list_i = [" ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " "]
-            self._board.append(list_i)
-            count += 1
-
         white_starting = [[19, 2], [19, 4], [19, 6], [19, 7], [19, 8], [19, 9], [19, 10], [19, 11], [19, 12], [19, 13], [19, 15], [19, 17],
                           [18, 1], [18, 2], [18, 3], [18, 5], [18, 7], [18, 8], [18, 9], [18, 10], [18, 12], [18, 14], [18, 16], [18, 17], [18, 18],
                           [17, 2], [17, 4], [17, 6], [17, 7], [17, 8], [17, 9], [17, 10], [17, 11], [17, 12], [17, 13], [17, 15], [17, 17],
@@ -45,10 +320,43 @@ class Board:
                           [7, 2], [7, 5], [7, 8], [7, 11], [7, 14], [7, 17]]
 
         for sublist in black_starting:
-            self._board[sublist[0]][sublist[1]] = "b"
+            index = bit_index(sublist[0], sublist[1])
+            self._cells[index] = BLACK
+            self._black |= 1 << index
+            self._hash ^= SYMMETRY_KEYS[BLACK][index]
 
         for sublist in white_starting:
-            self._board[sublist[0]][sublist[1]] = "w"
+            index = bit_index(sublist[0], sublist[1])
+            self._cells[index] = WHITE
+            self._white |= 1 << index
+            self._hash ^= SYMMETRY_KEYS[WHITE][index]
+
+        self._rings[BLACK] = ring_centers(self._black, self._black | self._white)
+        self._rings[WHITE] = ring_centers(self._white, self._black | self._white)
+
+    def load_cells(self, cells):
+        """
+        purpose: replaces the whole position, rebuilding the bitboards, hash and ring index from the cells
+        parameters: cells (400 cell codes, index (row - 1) * 20 + col)
+        return: N/A
+        """
+        if len(cells) != 400:
+            raise ValueError("expected 400 cells, got " + str(len(cells)))
+        self._cells = bytearray(cells)
+        self._black = 0
+        self._white = 0
+        self._hash = 0
+        for index, cell in enumerate(self._cells):
+            if cell == BLACK:
+                self._black |= 1 << index
+            elif cell == WHITE:
+                self._white |= 1 << index
+            elif cell != EMPTY:
+                raise ValueError("not a cell code: " + str(cell))
+            if cell != EMPTY:
+                self._hash ^= SYMMETRY_KEYS[cell][index]
+        self._rings[BLACK] = ring_centers(self._black, self._black | self._white)
+        self._rings[WHITE] = ring_centers(self._white, self._black | self._white)
 
     def print(self):
         """
@@ -56,740 +364,937 @@ class Board:
          parameters: N/A
          return: the board printed line by line
          """
-        for item in self._board:
+        for item in self.get_board():
             print(item)
 
     def get_board(self):
         """
-         purpose: access to the board
+         purpose: builds the board as a list of rows of 'b', 'w' and ' ', with a header row of column letters first,
+         so board[row][col] is the square in that row and column (a new list every call, changing it does nothing)
          parameters: N/A
-         return: the board itself
+         return: the board as a list of rows
          """
-        return self._board
+        board = [list(COLUMNS)]
+        for row in range(1, 21):
+            board.append(self[row])
+        return board
 
-
-class GessGame:
-    """
-    purpose: serves as the first class for tracking the gameplay
-    responsibilities: makes sure moves are legal, tracks whose turn it is and the state, has composition of Board class
-    communicates with(why): Board (composition, GessGame has a board so it must be able to communicate with it
-    to get the initial board and to print)
-    """
-
-    def __init__(self):
+    def get_cells(self):
         """
-        purpose: create initial game object with the new board, an unfinished game state and whose turn it is
-        and whose turn it isn't
+        purpose: access to the cell codes (EMPTY, BLACK or WHITE), index (row - 1) * 20 + col like the bitboards
         parameters: N/A
-        return: a new GessGame Object
+        return: the bytearray of 400 cells (treat as read only)
         """
-        self._game_state = "UNFINISHED"
-        self._turn = "b"
-        self._not_turn = "w"
-        self._board = Board()  # Composition of the board, since the game HAS a board
-        self._temp_board = self._board
+        return self._cells
 
-    def print(self):
+    def get_cell(self, row, col):
         """
-        purpose: utilizes the print method from the Board class for testing purposes
-        parameters: N/A
-        return: the board
+        purpose: gets the cell code of one square
+        parameters: row, col
+        return: EMPTY, BLACK or WHITE
         """
-        self._board.print()
-
-    def get_turn(self):
-        return self._turn
+        return self._cells[(row - 1) * BOARD_WIDTH + col]
 
-    def get_game_state(self):
+    def get_hash(self):
         """
-        purpose: gets the game state
+        purpose: access to the Zobrist hash of the stones on the board
         parameters: N/A
-        return: the current game state
+        return: a 64-bit hash
         """
-        return self._game_state
+        return self._hash & HASH_MASK
 
-    def resign_game(self):
+    def get_symmetric_hash(self):
         """
-        purpose: checks current player and allows them to resign
+        purpose: access to the Zobrist hashes of the stones under every transform, packed 64 bits per transform
         parameters: N/A
-        return: an updated game state
+        return: a 256-bit number, (number >> (transform * 64)) & HASH_MASK is the hash of that transform
         """
-        if self._turn == "b":
-            self._game_state = "WHITE_WON"
-        else:
-            self._game_state = "BLACK_WON"
+        return self._hash
 
-    def make_move(self, move_from, move_to):
+    def __getitem__(self, row):
         """
-        purpose: strings that represent the center square of the piece being moved
-        and the desired new location of the center square. checks if move is legal, checks to see if game is won,
-        updates the board, update game state(if needed), update turn"
-        parameters: move_from, move_to
-        return: True or False
+        purpose: lets the board be indexed like the list view, e.g. board[row][col]
+        parameters: row
+        return: the row as a new list of 'b', 'w' and ' '
         """
+        if row == 0:
+            return list(COLUMNS)
+        start = (row - 1) * BOARD_WIDTH
+        return [CELL_ITEMS[cell] for cell in self._cells[start:start + BOARD_WIDTH]]
 
-        board = self._board.get_board()
-        footprint_current = self.find_footprint(move_from)  # [c, n, s, e, w, ne, nw, se, sw]
-        footprint_future = self.find_footprint(move_to)  # [c, n, s, e, w, ne, nw, se, sw]
-
-        from_trans = footprint_current[0]
-        to_trans = footprint_future[0]
-
-        row_from = from_trans[0]
-        col_from = from_trans[1]
-        row_to = to_trans[0]
-        col_to = to_trans[1]
-
-        row_dir = (row_to - row_from)
-        col_dir = (col_to - col_from)
-
-        items_in_cur_footprint = self.items_in_footprint(footprint_current, board)
-
-        if self._game_state != "UNFINISHED":
-            return False
+    def get_stones(self, player):
+        """
+        purpose: access to one player's bitboard
+        parameters: player ('b' or 'w', or the cell code)
+        return: the bitboard of that player's stones
+        """
+        if CELL_CODES[player] == BLACK:
+            return self._black
+        return self._white
 
-        if self.check_if_move_is_in_bounds(row_from, col_from) is False:
-            return False
+    def has_ring(self, player):
+        """
+        purpose: checks whether the player has at least one ring on the board
+        parameters: player ('b' or 'w', or the cell code)
+        return: True or False
+        """
+        return self._rings[CELL_CODES[player]] != 0
 
-        elif self.check_for_others_stone_in_piece(footprint_current, board) is False:
-            return False
+    def count_rings(self, player):
+        """
+        purpose: counts the player's rings
+        parameters: player ('b' or 'w', or the cell code)
+        return: the number of rings
+        """
+        return bin(self._rings[CELL_CODES[player]]).count("1")
 
-        elif self.check_for_any_tokens(items_in_cur_footprint) is False:
-            return False
+    def get_ring_centers(self, player):
+        """
+        purpose: access to the centers of the player's rings
+        parameters: player ('b' or 'w', or the cell code)
+        return: a list of [row, col] ring centers
+        """
+        return mask_centers(self._rings[CELL_CODES[player]])
 
-        elif self.check_if_move_is_in_bounds(row_to, col_to) is False:
-            return False
+    def get_ring_mask(self, player):
+        """
+        purpose: access to the centers of the player's rings as a mask
+        parameters: player ('b' or 'w', or the cell code)
+        return: the mask of ring centers
+        """
+        return self._rings[CELL_CODES[player]]
 
-        elif self.check_if_no_center_more_than_three(row_from, col_from, row_dir, col_dir, board) is False:
+    def is_ring_center(self, row, col, player):
+        """
+        purpose: checks whether a square is the center of one of the player's rings
+        parameters: row, col, player ('b' or 'w', or the cell code)
+        return: True or False
+        """
+        index = bit_index(row, col)
+        if RING_NEIGHBORS[index] is None or self._cells[index] != EMPTY:
             return False
-
-        elif row_dir > 0:  # going in NX direction
-            if self.check_nx_path_for_footprint(col_dir, items_in_cur_footprint, footprint_current, footprint_future) is False:
-                return False
-
-        elif row_dir < 0:  # going in SX direction
-            if self.check_sx_path_for_footprint(col_dir, items_in_cur_footprint, footprint_current, footprint_future) is False:
-                return False
-
-        elif col_dir > 0:  # going in the E direction
-            if self.check_e_path_for_footprint(items_in_cur_footprint, footprint_current, footprint_future) is False:
+        player = CELL_CODES[player]
+        for neighbor in RING_NEIGHBORS[index]:
+            if self._cells[neighbor] != player:
                 return False
+        return True
 
-        elif col_dir < 0:  # going in the W direction
-            if self.check_w_path_for_footprint(items_in_cur_footprint, footprint_current, footprint_future) is False:
-                return False
-
-        # checking to make sure that current player's move won't leave them with no rings
-        if self.find_rings_for_illegal_move(footprint_current, footprint_future, self._turn) is False:
-            return False
+    def ring_centers_after_move(self, center_from, center_to, player):
+        """
+        purpose: works out the player's ring centers after moving the footprint, without changing the board. only
+        the centers next to the two footprints are looked at again
+        parameters: center_from, center_to (lists of row, col), player ('b' or 'w', or the cell code)
+        return: a mask of the ring centers after the move
+        """
+        black, white = self.stones_after_move(center_from, center_to)
+        player = CELL_CODES[player]
+        if player == BLACK:
+            stones = black
         else:
-            self.update_board(footprint_current, footprint_future, board)  # since move is legal, update the board
+            stones = white
 
-        # checking if the update left the other player with no rings, and update board accordingly
-        if self.find_rings(self._not_turn, board) is not True:
-            if self._turn == 'b':
-                self._game_state = "BLACK_WON"
-            else:
-                self._game_state = "WHITE_WON"
+        changed = (FOOTPRINT_RING_AREAS[bit_index(center_from[0], center_from[1])] |
+                   FOOTPRINT_RING_AREAS[bit_index(center_to[0], center_to[1])])
+        return (self._rings[player] & ~changed) | ring_centers(stones, black | white, changed)
 
-        # update whose turn it is
-        self.update_turn()
-
-        return True  # required to return True after move finished
-
-    def update_board(self, footprint_current, footprint_future, board):
+    def slide_distance(self, center, row_step, col_step, max_distance=17):
         """
-        purpose: update the board with the new footprint
-        parameters: footprint_current, footprint_future, board
-        return: an updated board
+        purpose: works out how far the footprint around a center can slide in one direction. the piece moves one
+        square at a time along the precomputed ray and stops on the first square where any part of its leading edge
+        lands on a stone (that square can still be moved to, the stones there are captured)
+        parameters: center (list of row, col), row_step, col_step (direction, each -1, 0 or 1), max_distance
+        (stop looking after this many squares)
+        return: the farthest distance the piece can move, 0 if it can't move that way at all
         """
-        new_status = []
-        i = 0
-        for item in footprint_current:  # updating board
-            new_item = board[item[0]][item[1]]
-            new_status.append(new_item)  # adds current item in current location to a list
-            board[item[0]][item[1]] = " "  # removes item from location
-
-        for item in footprint_future:  # special case for handling edges
-            if item[0] == 1 or item[0] == 20:  # clears if spot is on first/last row
-                board[item[0]][item[1]] = " "
-            elif item[1] == 0 or item[1] == 19:  # clears if spot is on first/last col
-                board[item[0]][item[1]] = " "
-            else:
-                board[item[0]][item[1]] = new_status[i]  # takes future location and update it with the correct item
-            i += 1
+        index = bit_index(center[0], center[1])
+        occupied = self._black | self._white
+        leading_edge = LEADING_EDGE_MASKS[(row_step, col_step)]
+
+        distance = 0
+        for target in RAYS[index][DIRECTION_INDEX[(row_step, col_step)]][:max_distance]:
+            if FOOTPRINT_MASKS[target] is None:  # center would be off the playable board
+                break
+            distance += 1
+            if occupied & (leading_edge << (target - BOARD_WIDTH - 1)):  # piece stops here
+                break
+        return distance
+
+    def is_piece(self, index, own, others):
+        """
+        purpose: checks the footprint around a center is a piece the player can move: some of their stones and none
+        of the other player's
+        parameters: index (cell index of the center), own, others (bitboards of the player and of the other player)
+        return: True or False
+        """
+        piece_mask = FOOTPRINT_MASKS[index]
+        return piece_mask is not None and own & piece_mask != 0 and others & piece_mask == 0
 
-    def update_turn(self):
+    def piece_reach(self, index, direction, own):
         """
-        purpose: update whose turn it is and whose turn it isn't
-        parameters: N/A
-        return: updated object with whose turn it is and isn't
+        purpose: works out how far a piece can move in one direction: it needs a stone on that side of the footprint,
+        and without a center stone it moves at most three squares
+        parameters: index (cell index of the center of a piece made of own stones), direction (index into
+        DIRECTIONS), own (bitboard of the piece's player)
+        return: the farthest distance the piece can move that way, 0 if it can't
         """
+        row_step, col_step = DIRECTIONS[direction]
+        if own >> (index + row_step * BOARD_WIDTH + col_step) & 1 == 0:  # no stone in that direction
+            return 0
 
-        if self._turn == "b":
-            self._turn = "w"
-            self._not_turn = "b"
+        if own >> index & 1:  # a center stone lets the piece move any distance
+            max_distance = 17
         else:
-            self._turn = "b"
-            self._not_turn = "w"
+            max_distance = 3
+        return self.slide_distance([index // BOARD_WIDTH + 1, index % BOARD_WIDTH], row_step, col_step, max_distance)
 
-    def find_rings_for_illegal_move(self, footprint_current, footprint_future, turn):
+    def piece_targets(self, index, own, others):
         """
-        purpose: check to see if the desired move would leave the player with no rings
-        parameters: footprint_current, footprint_future, turn, board
-        return: False or none
+        purpose: lists the centers the footprint around a center can move to, leaving the ring check aside. each
+        direction is scanned once along the precomputed rays, sliding the leading edge until it runs into a stone
+        parameters: index (cell index of the center), own, others (bitboards of the player moving and of the other
+        player)
+        return: a list of target cell indexes in DIRECTIONS order, then nearest first, empty if the footprint isn't
+        a piece of own stones only
         """
-        board = self._board.get_board()
-        temp_board = [item.copy() for item in board]
-
-        self.update_board(footprint_current, footprint_future, temp_board)
-
-        if self.find_rings(turn, temp_board) is not True:
-            return False
-
-    def find_rings(self, turn, board):
-        """""
-        purpose: finds rings on board for given player
-        parameters: turn, board
+        if not self.is_piece(index, own, others):
+            return []
+
+        targets = []
+        rays = RAYS[index]
+        for direction in range(8):
+            reach = self.piece_reach(index, direction, own)
+            if reach:
+                targets.extend(rays[direction][:reach])
+        return targets
+
+    def rings_out_of_reach(self, rings, index_from, index_to):
+        """
+        purpose: checks whether a move leaves some of the rings alone, so it can't take all of them
+        parameters: rings (mask of ring centers), index_from, index_to (cell indexes of the centers)
         return: True or False
         """
+        return rings & ~(FOOTPRINT_RING_AREAS[index_from] | FOOTPRINT_RING_AREAS[index_to]) != 0
 
-        for row in range(3, 19):
-            for col in range(2, 18):
-                if board[row][col] == " ":  # making sure the center of the piece is empty
-
-                    n = [row + 1, col]
-                    s = [row - 1, col]
-                    e = [row, col + 1]
-                    w = [row, col - 1]
-                    ne = [row + 1, col + 1]
-                    nw = [row + 1, col - 1]
-                    se = [row - 1, col + 1]
-                    sw = [row - 1, col - 1]
-
-                    ring = [n, s, e, w, ne, nw, se, sw]
-                    items_in_footprint = set()
-
-                    for item in ring:
-                        item_in_square = board[item[0]][item[1]]
-                        items_in_footprint.add(item_in_square)
-
-                    if len(items_in_footprint) == 1:  # makes sure all items are the same
-                        if items_in_footprint == {turn}:  # makes sure the items are the correct players
-                            return True
-        #
-        # return False
+    def keeps_ring(self, index_from, index_to, player):
+        """
+        purpose: checks the player still has a ring after a move. the full check only runs when every one of their
+        rings is near the move
+        parameters: index_from, index_to (cell indexes of the centers), player (cell code)
+        return: True or False
+        """
+        if self.rings_out_of_reach(self._rings[player], index_from, index_to):
+            return True
+        return self.ring_centers_after_move([index_from // BOARD_WIDTH + 1, index_from % BOARD_WIDTH],
+                                            [index_to // BOARD_WIDTH + 1, index_to % BOARD_WIDTH], player) != 0
 
-    def check_for_others_stone_in_piece(self, footprint_current, board):
+    def stones_after_move(self, center_from, center_to):
         """
-        purpose: verify that the footprint does not contain other player's stones
-        parameters: footprint_current, board
-        return: None or False
+        purpose: works out both bitboards after moving the footprint, without changing the board
+        parameters: center_from, center_to (lists of row, col)
+        return: (black, white) bitboards after the move
         """
+        mask_from = footprint_mask(center_from[0], center_from[1])
+        mask_to = footprint_mask(center_to[0], center_to[1])
+        shift = bit_index(center_to[0], center_to[1]) - bit_index(center_from[0], center_from[1])
+
+        black_piece = self._black & mask_from
+        white_piece = self._white & mask_from
+        if shift >= 0:
+            black_piece <<= shift
+            white_piece <<= shift
+        else:
+            black_piece >>= -shift
+            white_piece >>= -shift
 
-        # checking to see if the move_from has others player stones in footprint or none of their stones
-        for item in footprint_current:
-            if board[item[0]][item[1]] == self._not_turn:
-                return False
+        keep = ~(mask_from | mask_to)  # the piece is lifted and anything under its new footprint is captured
+        black = (self._black & keep) | (black_piece & ~EDGE_MASK)  # stones on the edges are removed
+        white = (self._white & keep) | (white_piece & ~EDGE_MASK)
+        return black, white
 
-    def items_in_footprint(self, footprint_current, board):
+    def update(self, center_from, center_to):
         """
-        purpose: determining what item is in each square of the footprint (e.g. 'b', 'w', or ' ')
-        parameters: footprint_current, board
-        return: a list of what item is in each square of the footprint in a [c, n, s, e, w, ne, nw, se, sw]
-        configuration
+        purpose: moves the footprint from one center to another in place, capturing and clearing the edges
+        parameters: center_from, center_to (lists of row, col)
+        return: a list of (index, code) for every cell that changed, with the cell code it held before the move, so
+        the move can be taken back with revert
         """
-        items_in_footprint = []
+        black, white = self.stones_after_move(center_from, center_to)
+        self._black = black
+        self._white = white
+        cells = self._cells
+        black_keys = SYMMETRY_KEYS[BLACK]
+        white_keys = SYMMETRY_KEYS[WHITE]
+
+        changes = []
+        changed = 0
+        for center in (center_from, center_to):  # only the 18 cells under the two footprints can change
+            for index in FOOTPRINT_CELLS[bit_index(center[0], center[1])]:
+                if black >> index & 1:
+                    cell = BLACK
+                elif white >> index & 1:
+                    cell = WHITE
+                else:
+                    cell = EMPTY
+
+                old_cell = cells[index]
+                if old_cell != cell:
+                    changes.append((index, old_cell))
+                    changed |= 1 << index
+                    cells[index] = cell
+                    if old_cell == BLACK:
+                        self._hash ^= black_keys[index]
+                    elif old_cell == WHITE:
+                        self._hash ^= white_keys[index]
+                    if cell == BLACK:
+                        self._hash ^= black_keys[index]
+                    elif cell == WHITE:
+                        self._hash ^= white_keys[index]
+
+        self.update_rings(changed)
+        return changes
+
+    def revert(self, changes):
+        """
+        purpose: takes back a move made with update by putting the changed cells back the way they were
+        parameters: changes (the list returned by update)
+        return: N/A
+        """
+        cells = self._cells
+        changed = 0
+        for index, cell in changes:
+            bit = 1 << index
+            self._black &= ~bit
+            self._white &= ~bit
+            if cell == BLACK:
+                self._black |= bit
+            elif cell == WHITE:
+                self._white |= bit
+
+            if cells[index] != EMPTY:
+                self._hash ^= SYMMETRY_KEYS[cells[index]][index]
+            if cell != EMPTY:
+                self._hash ^= SYMMETRY_KEYS[cell][index]
+            cells[index] = cell
+            changed |= bit
+
+        self.update_rings(changed)
+
+    def update_rings(self, changed):
+        """
+        purpose: brings the ring index up to date after some cells changed. only the rings next to those cells
+        can have changed, the rest of the ring index is kept
+        parameters: changed (mask of the changed cells)
+        return: N/A
+        """
+        area = ring_area(changed)
+        occupied = self._black | self._white
+        self._rings[BLACK] = (self._rings[BLACK] & ~area) | ring_centers(self._black, occupied, area)
+        self._rings[WHITE] = (self._rings[WHITE] & ~area) | ring_centers(self._white, occupied, area)
+
 
-        for item in footprint_current:
-            item_in_square = board[item[0]][item[1]]
-            items_in_footprint.append(item_in_square)
+class GessGame:
+    """
+    purpose: serves as the first class for tracking the gameplay
+    responsibilities: makes sure moves are legal, tracks whose turn it is and the state, has composition of Board class
+    communicates with(why): Board (composition, GessGame has a board so it must be able to communicate with it
+    to get the initial board and to print)
+    """
 
-        return items_in_footprint
+    __slots__ = ("_game_state", "_turn", "_not_turn", "_board", "_history", "_redo", "_profiler")
 
-    def check_for_any_tokens(self, items_in_cur_footprint):
+    def __init__(self):
         """
-        purpose: verify there is at least 1 of the player's token in the footprint
-        parameters: items_in_cur_footprint
-        return: None or False
+        purpose: create initial game object with the new board, an unfinished game state and whose turn it is
+        and whose turn it isn't
+        parameters: N/A
+        return: a new GessGame Object
         """
+        self._game_state = UNFINISHED
+        self._turn = BLACK
+        self._not_turn = WHITE
+        self._board = Board()  # Composition of the board, since the game HAS a board
+        self._history = None  # (index_from, index_to, changes, turn, game_state) for every move made with make_move
+        # while history is on (see enable_history), a resignation is kept with index_from None
+        self._redo = None  # moves taken back with undo, last one first in line
+        self._profiler = None  # MoveProfiler while profiling is on
 
-        if self._turn not in items_in_cur_footprint:
-            return False
-
-    def check_if_move_is_in_bounds(self, row, col):
+    def to_bytes(self):
         """
-        purpose: verify that the move does not place the center of the footprint out of bounds
-        parameters: row, column
-        return: None or False
+        purpose: packs the position into a SNAPSHOT_SIZE byte record (2 bits per cell, then the turn and state)
+        parameters: N/A
+        return: the record as bytes
         """
-
-        if row < 2 or row > 19:  # piece will be out of bounds cuz in row 1 or 20
-            return False
-        elif col < 1 or col > 18:  # piece will be out of bound cuz in col a (col = 0) or t (col = 19)
-            return False
-
-    def check_if_no_center_more_than_three(self, row_from, col_from, row_dir, col_dir, board):
+        cells = self._board.get_cells()
+        data = bytearray(SNAPSHOT_SIZE)
+        for index in range(100):
+            start = index * 4
+            data[index] = cells[start] | cells[start + 1] << 2 | cells[start + 2] << 4 | cells[start + 3] << 6
+        data[100] = self._turn | self._game_state << 2
+        return bytes(data)
+
+    @classmethod
+    def from_bytes(cls, data):
         """
-        purpose: verify that if there is no center token, they are not moving more than 3 spaces
-        parameters: row_from, col_from, row_dir, col_dir, board
-        return: None or False
+        purpose: creates a game in the position packed by to_bytes
+        parameters: data (bytes, bytearray or memoryview of SNAPSHOT_SIZE bytes)
+        return: a new GessGame, raises ValueError if data isn't a valid record
         """
-        if board[row_from][col_from] != self._turn:  # verifying that move isn't more than 3 spaces
-            if abs(row_dir) > 3 or abs(col_dir) > 3:
-                return False
+        if len(data) != SNAPSHOT_SIZE:
+            raise ValueError("expected a " + str(SNAPSHOT_SIZE) + " byte snapshot, got " + str(len(data)))
+        turn = data[100] & 3
+        state = data[100] >> 2
+        if turn not in (BLACK, WHITE) or state > WHITE_WON:
+            raise ValueError("bad turn or state in snapshot")
+
+        game = cls()
+        game._board.load_cells(b"".join([SNAPSHOT_UNPACK[byte] for byte in data[:100]]))
+        game._turn = turn
+        game._not_turn = BLACK + WHITE - turn
+        game._game_state = state
+        return game
 
-    def translate(self, a_move):
+    def print(self):
         """
-        purpose: to translate the input of alpha-numeric (e.g. 'a6') to a numeric useable row and column
-        parameters: a_move
-        return: [row, col]
+        purpose: utilizes the print method from the Board class for testing purposes
+        parameters: N/A
+        return: the board
         """
-        alpha_to_num = [['a', 0], ['b', 1], ['c', 2], ['d', 3], ['e', 4], ['f', 5], ['g', 6], ['h', 7], ['i', 8], ['j', 9], ['k', 10], [
-            'l', 11], ['m', 12], ['n', 13], ['o', 14], ['p', 15], ['q', 16], ['r', 17], ['s', 18], ['t', 19]]
+        self._board.print()
+
+    def get_turn(self):
+        return CELL_ITEMS[self._turn]
 
-        row = int(a_move[1:])
-        col = (a_move[0])
+    def get_not_turn(self):
+        return CELL_ITEMS[self._not_turn]
 
-        for sublist in alpha_to_num:
-            if col == sublist[0]:
-                col = sublist[1]
+    def get_turn_code(self):
+        return self._turn
 
-        return [row, col]
+    def get_state_code(self):
+        return self._game_state
 
-    def find_footprint(self, a_move):
+    def get_board(self):
         """
-        purpose: finds the footprint given the center coordinate
-        parameters: a_move
-        return: the footprint of the move
+        purpose: access to the Board object, e.g. for engines that read the bitboards
+        parameters: N/A
+        return: the Board
         """
-        a_move_trans = self.translate(a_move)
-
-        row = a_move_trans[0]
-        col = a_move_trans[1]
-
-        c = [row, col]
-        e = [row, col + 1]
-        w = [row, col - 1]
-        n = [row + 1, col]
-        s = [row - 1, col]
-        ne = [row + 1, col + 1]
-        nw = [row + 1, col - 1]
-        sw = [row - 1, col - 1]
-        se = [row - 1, col + 1]
-        footprint = [c, n, s, e, w, ne, nw, se, sw]
-
-        return footprint
+        return self._board
 
-    def check_nx_path_for_footprint(self, col_dir, items_in_cur_footprint, footprint_current, footprint_future):
-        """""
-        purpose: checks whether the player has the token in the correct place for the desired path and checkt whether
-        the path is clear for the footprint to go from current to new if moving in a N, NE, or NW path
-        parameters: col_dir, items_in_cur_footprint, footprint_current, footprint_future
-        return: True or False
+    def get_hash(self):
         """
-
-        if col_dir == 0:  # going in N direction
-            if items_in_cur_footprint[1] != self._turn:  # verifying a token is in the north spot to be able to move
-                return False
-            else:
-                if self.a_square_path_clear_n(footprint_current[1], footprint_future[1]) is False:  # N square
-                    return False
-                elif self.a_square_path_clear_n(footprint_current[5], footprint_future[5]) is False:  # NE square
-                    return False
-                elif self.a_square_path_clear_n(footprint_current[6], footprint_future[6]) is False:  # NW square
-                    return False
-                else:
-                    return
-
-        elif col_dir > 0:  # going in NE direction
-            if items_in_cur_footprint[5] != self._turn:  # verifying a token is in the northeast spot to be able to move
-                return False
-            else:
-                if self.a_square_path_clear_ne(footprint_current[6], footprint_future[6]) is False:  # NW square
-                    return False
-                elif self.a_square_path_clear_ne(footprint_current[1], footprint_future[1]) is False:  # N square
-                    return False
-                elif self.a_square_path_clear_ne(footprint_current[5], footprint_future[5]) is False:  # NE square
-                    return False
-                elif self.a_square_path_clear_ne(footprint_current[3], footprint_future[3]) is False:  # E square
-                    return False
-                elif self.a_square_path_clear_ne(footprint_current[7], footprint_future[7]) is False:  # SE square
-                    return False
-                else:
-                    return True
-
-        elif col_dir < 0:  # going in NW direction
-            if items_in_cur_footprint[6] != self._turn:  # verifying a token is in the northwest spot to be able to move
-                return False
-            else:
-                if self.a_square_path_clear_nw(footprint_current[6], footprint_future[6]) is False:  # NW square
-                    return False
-                elif self.a_square_path_clear_nw(footprint_current[1], footprint_future[1]) is False:  # N square
-                    return False
-                elif self.a_square_path_clear_nw(footprint_current[5], footprint_future[5]) is False:  # NE square
-                    return False
-                elif self.a_square_path_clear_nw(footprint_current[4], footprint_future[4]) is False:  # W square
-                    return False
-                elif self.a_square_path_clear_nw(footprint_current[8], footprint_future[8]) is False:  # SW square
-                    return False
-                else:
-                    return True
-
-    def check_sx_path_for_footprint(self, col_dir, items_in_cur_footprint, footprint_current, footprint_future):
-        """""
-        purpose: checks whether the player has the token in the correct place for the desired path and check whether
-        the path is clear for the footprint to go from current to new if moving in a S, SW, or SW path
-        parameters: col_dir, items_in_cur_footprint, footprint_current, footprint_future
-        return: True or False
+        purpose: gets the Zobrist hash of the position, including whose turn it is
+        parameters: N/A
+        return: a 64-bit hash
         """
+        if self._turn == WHITE:
+            return self._board.get_hash() ^ ZOBRIST_WHITE_TO_MOVE
+        return self._board.get_hash()
 
-        if col_dir == 0:  # going in the S direction
-            if items_in_cur_footprint[2] != self._turn:
-                return False
-            else:
-                if self.a_square_path_clear_s(footprint_current[2], footprint_future[2]) is False:  # S square
-                    return False
-                elif self.a_square_path_clear_s(footprint_current[7], footprint_future[7]) is False:  # SE square
-                    return False
-                elif self.a_square_path_clear_s(footprint_current[8], footprint_future[8]) is False:  # SW square
-                    return False
-                else:
-                    return True
-
-        elif col_dir > 0:  # going in SE direction
-            if items_in_cur_footprint[7] != self._turn:
-                return False
-            else:
-                if self.a_square_path_clear_se(footprint_current[7], footprint_future[7]) is False:  # SE square
-                    return False
-                elif self.a_square_path_clear_se(footprint_current[2], footprint_future[2]) is False:  # S square
-                    return False
-                elif self.a_square_path_clear_se(footprint_current[8], footprint_future[8]) is False:  # SW square
-                    return False
-                elif self.a_square_path_clear_se(footprint_current[3], footprint_future[3]) is False:  # E square
-                    return False
-                elif self.a_square_path_clear_se(footprint_current[5], footprint_future[5]) is False:  # NE square
-                    return False
-                else:
-                    return True
+    def get_symmetric_hashes(self):
+        """
+        purpose: gets the hash of the position under every transform, including whose turn it is
+        parameters: N/A
+        return: a list of 64-bit hashes indexed by transform, the IDENTITY one is get_hash()
+        """
+        hashes = self._board.get_symmetric_hash() ^ SYMMETRY_TURN_KEYS[self._turn]
+        return [(hashes >> (transform * HASH_BITS)) & HASH_MASK for transform in TRANSFORMS]
 
-        elif col_dir < 0:  # going in SW direction
-            if items_in_cur_footprint[8] != self._turn:
-                return False
-            else:
-                if self.a_square_path_clear_sw(footprint_current[7], footprint_future[7]) is False:  # SE square
-                    return False
-                elif self.a_square_path_clear_sw(footprint_current[2], footprint_future[2]) is False:  # S square
-                    return False
-                elif self.a_square_path_clear_sw(footprint_current[8], footprint_future[8]) is False:  # SW square
-                    return False
-                elif self.a_square_path_clear_sw(footprint_current[4], footprint_future[4]) is False:  # W square
-                    return False
-                elif self.a_square_path_clear_sw(footprint_current[6], footprint_future[6]) is False:  # NW square
-                    return False
-                else:
-                    return True
+    def get_canonical(self):
+        """
+        purpose: picks the canonical one of the positions equivalent to this one by symmetry (the one with the
+        smallest hash), so caches and books can share entries between them
+        parameters: N/A
+        return: (canonical hash, transform that maps this position and its moves to the canonical one, and back)
+        """
+        hashes = self.get_symmetric_hashes()
+        canonical_hash = min(hashes)
+        return canonical_hash, hashes.index(canonical_hash)
 
-    def check_e_path_for_footprint(self, items_in_cur_footprint, footprint_current, footprint_future):
-        """""
-         purpose: checks whether the player has the token in the correct place for the desired path and check whether
-         the path is clear for the footprint to go from current to new if moving in an East path
-         parameters: col_dir, items_in_cur_footprint, footprint_current, footprint_future
-         return: True or False
-         """
+    def get_canonical_hash(self):
+        """
+        purpose: gets the hash of the canonical position, the same for every position equivalent to this one
+        parameters: N/A
+        return: a 64-bit hash
+        """
+        return min(self.get_symmetric_hashes())
 
-        if items_in_cur_footprint[3] != self._turn:
-            return False
+    def transformed(self, transform):
+        """
+        purpose: creates the game in the transformed position (the history isn't carried over)
+        parameters: transform (one of TRANSFORMS)
+        return: a new GessGame
+        """
+        mapping = SYMMETRY_INDEX[transform]
+        cells = self._board.get_cells()
+        transformed_cells = bytearray(400)
+        for index in range(400):
+            transformed_cells[mapping[index]] = cells[index]
+        if SWAPS_COLORS[transform]:
+            transformed_cells = transformed_cells.translate(SWAPPED_CELLS)
+
+        game = GessGame()
+        game._board.load_cells(transformed_cells)
+        if SWAPS_COLORS[transform]:
+            game._turn = self._not_turn
+            game._game_state = SWAPPED_CELLS[self._game_state]  # UNFINISHED stays, the winner swaps
         else:
-            if self.a_square_path_clear_e(footprint_current[3], footprint_future[3]) is False:  # E square
-                return False
-            elif self.a_square_path_clear_e(footprint_current[5], footprint_future[5]) is False:  # NE square
-                return False
-            elif self.a_square_path_clear_e(footprint_current[7], footprint_future[7]) is False:  # SE square
-                return False
-            else:
-                return True
-
-    def check_w_path_for_footprint(self, items_in_cur_footprint, footprint_current, footprint_future):
-        """""
-         purpose: checks whether the player has the token in the correct place for the desired path and check whether
-         the path is clear for the footprint to go from current to new if moving in an West path
-         parameters: col_dir, items_in_cur_footprint, footprint_current, footprint_future
-         return: True or False
-         """
+            game._turn = self._turn
+            game._game_state = self._game_state
+        game._not_turn = BLACK + WHITE - game._turn
+        return game
 
-        if items_in_cur_footprint[4] != self._turn:
-            return False
-        else:
-            if self.a_square_path_clear_w(footprint_current[4], footprint_future[4]) is False:  # W square
-                return False
-            elif self.a_square_path_clear_w(footprint_current[8], footprint_future[8]) is False:  # SW square
-                return False
-            elif self.a_square_path_clear_w(footprint_current[7], footprint_future[7]) is False:  # SE square
-                return False
-            else:
-                return True
+    def get_game_state(self):
+        """
+        purpose: gets the game state
+        parameters: N/A
+        return: the current game state
+        """
+        return STATE_NAMES[self._game_state]
 
-    def a_square_path_clear_n(self, curr_loc, future_loc):
-        """""
-        purpose: determines if square moving in north direction will run into anything prior to
-        getting to desired location
-        parameters: current location (list of row, col), future location (list of row, col)
-        return: None or False
+    def resign_game(self):
+        """
+        purpose: checks current player and allows them to resign
+        parameters: N/A
+        return: an updated game state
         """
-        col_to = future_loc[1]
-        row_from = curr_loc[0]
-        row_to = future_loc[0]
-        board = self._board.get_board()
+        if self._history is not None:
+            self._history.append((None, None, None, self._turn, self._game_state))  # undo takes it back on its own
+        self._game_state = self._not_turn
+        if self._redo:
+            self._redo = []  # the moves taken back don't follow from a finished game
 
-        result = self.a_square_path_clear_n_helper(col_to, row_from, row_to, board)
-        return result
+    def make_move(self, move_from, move_to):
+        """
+        purpose: strings that represent the center square of the piece being moved
+        and the desired new location of the center square. checks if move is legal, checks to see if game is won,
+        updates the board, update game state(if needed), update turn"
+        parameters: move_from, move_to (square names like 'c3', or cell indexes or (row, col) pairs)
+        return: True or False, raises ValueError if either one isn't a square on the board
+        """
+        if self._profiler is not None:
+            return self.make_move_profiled(move_from, move_to)
+        return self.play_move(square_index(move_from), square_index(move_to)) is None
 
-    def a_square_path_clear_n_helper(self, col_to, row_from, row_to, board):
-        """""
-        purpose: helper function for determining if the path is clear moving east for a square
-        parameters: col_to, row_from, row_to, board
+    def make_move_profiled(self, move_from, move_to):
+        """
+        purpose: same as make_move, timing each phase and counting the result in the profiler
+        parameters: move_from, move_to
         return: True or False
         """
-        row_from_plus_one = row_from + 1
-
-        if row_from_plus_one == row_to:
-            return True
-
-        if board[row_from_plus_one][col_to] != ' ':
-            return False
+        profiler = self._profiler
+        profiler.start()
+        try:
+            index_from = square_index(move_from)
+            index_to = square_index(move_to)
+        except ValueError:
+            profiler.phase("parse")
+            profiler.reject(NOT_A_SQUARE)
+            raise
+        profiler.phase("parse")
+
+        reason = self.play_move(index_from, index_to, profiler.phase)
+        if reason is None:
+            profiler.accept()
         else:
-            return self.a_square_path_clear_n_helper(col_to, row_from_plus_one, row_to, board)
+            profiler.reject(reason)
+        return reason is None
 
-    def a_square_path_clear_s(self, curr_loc, future_loc):
-        """""
-        purpose: determines if square moving in south direction will run into anything prior to
-        getting to desired location
-        parameters: current location (list of row, col), future location (list of row, col)
-        return: True or False
+    def play_move(self, index_from, index_to, phase=None):
         """
-        col_to = future_loc[1]
-        row_to = future_loc[0]
-        row_from = curr_loc[0]
-        board = self._board.get_board()
-
-        result = self.a_square_path_clear_s_helper(col_to, row_from, row_to, board)
-        return result
-
-    def a_square_path_clear_s_helper(self, col_to, row_from, row_to, board):
-        """""
-        purpose: helper function for determining if the a squares's path is clear moving east for a square
-        parameters: col_from, row_from, row_to, board
-        return: None or False
+        purpose: checks a move and plays it if it is legal, the one move path make_move and make_move_profiled share
+        parameters: index_from, index_to (cell indexes of the centers), phase (called with the name of each phase as
+        it ends, e.g. MoveProfiler.phase, None to skip)
+        return: None if the move was played, otherwise the reason it was turned down (see is_legal)
         """
+        board = self._board
+        reason = self.check_move(index_from, index_to, board.get_stones(self._turn),
+                                 board.get_stones(self._not_turn), phase)
+        if reason is not None:
+            return reason
+
+        suicide = not board.keeps_ring(index_from, index_to, self._turn)  # can't leave yourself without a ring
+        if phase is not None:
+            phase("suicide")
+        if suicide:
+            return SUICIDE
+
+        changes = board.update([index_from // BOARD_WIDTH + 1, index_from % BOARD_WIDTH],
+                               [index_to // BOARD_WIDTH + 1, index_to % BOARD_WIDTH])
+        if self._history is not None:
+            self._history.append((index_from, index_to, changes, self._turn, self._game_state))
+            if self._redo:
+                self._redo = []  # a new move ends the line that was taken back
+        if phase is not None:
+            phase("update")
+
+        self.finish_move()
+        if phase is not None:
+            phase("opponent_rings")
+        return None
+
+    def enable_profiling(self, profiler=None):
+        """
+        purpose: turns on counting and timing of the phases of make_move (while it is off make_move only pays for
+        one attribute check)
+        parameters: profiler (a MoveProfiler to report to, e.g. one shared by many games; a new one if left out)
+        return: the MoveProfiler
+        """
+        if profiler is None:
+            from MoveProfiler import MoveProfiler  # only games that are profiled pay for importing it
 
-        row_from_minus_one = row_from - 1
-
-        if row_from_minus_one == row_to:
-            return True
+            profiler = MoveProfiler()
+        self._profiler = profiler
+        return profiler
 
-        if board[row_from_minus_one][col_to] != ' ':
-            return False
-        else:
-            return self.a_square_path_clear_s_helper(col_to, row_from_minus_one, row_to, board)
+    def disable_profiling(self):
+        self._profiler = None
 
-    def a_square_path_clear_e(self, curr_loc, future_loc):
-        """""
-        purpose: determines if square moving in east direction will run into anything prior to
-        getting to desired location
-        parameters: current location (list of row, col), future location (list of row, col)
-        return: True or False
+    def get_profile(self):
         """
-        col_to = future_loc[1]
-        col_from = curr_loc[1]
-        row_from = future_loc[0]
-        board = self._board.get_board()
-
-        result = self.a_square_path_clear_e_helper(col_from, col_to, row_from, board)
-        return result
-
-    def a_square_path_clear_e_helper(self, col_from, col_to, row_from, board):
-        """""
-        purpose: helper function for determining if the a square's path is clear moving east for a square
-        parameters: col_from, col_to, row_from, board
-        return: True or False
+        purpose: gets the profiling numbers so far
+        parameters: N/A
+        return: the MoveProfiler snapshot dict, or None if profiling is off
         """
-        col_from_minus_one = col_from + 1
-
-        if col_from_minus_one == col_to:
-            return True
+        if self._profiler is None:
+            return None
+        return self._profiler.snapshot()
 
-        if board[row_from][col_from_minus_one] != ' ':
-            return False
-        else:
-            return self.a_square_path_clear_e_helper(col_from_minus_one, col_to, row_from, board)
+    def enable_history(self):
+        """
+        purpose: turns on keeping the moves made with make_move so they can be taken back with undo. off by default,
+        since every move kept holds the cells it changed and games are often kept by the hundreds of thousands
+        parameters: N/A
+        return: N/A
+        """
+        if self._history is None:
+            self._history = []
+            self._redo = []
 
-    def a_square_path_clear_w(self, curr_loc, future_loc):
-        """""
-        purpose: determines if square moving in west direction will run into anything prior to
-        getting to desired location
-        parameters: current location (list of row, col), future location (list of row, col)
-        return: True or False
+    def undo(self):
         """
-        col_to = future_loc[1]
-        col_from = curr_loc[1]
-        row_from = future_loc[0]
-        board = self._board.get_board()
+        purpose: takes back the last move made with make_move since enable_history, from the cells it changed, without
+        replaying the game. a resignation is taken back on its own, leaving the move before it in place
+        parameters: N/A
+        return: True, or False if there is no move to take back
+        """
+        if not self._history:
+            return False
 
-        result = self.a_square_path_clear_w_helper(col_from, col_to, row_from, board)
-        return result
+        entry = self._history.pop()
+        if entry[0] is not None:
+            self._board.revert(entry[2])
+        self._turn = entry[3]
+        self._not_turn = BLACK + WHITE - entry[3]
+        self._game_state = entry[4]
+        self._redo.append(entry)
+        return True
 
-    def a_square_path_clear_w_helper(self, col_from, col_to, row_from, board):
-        """""
-        purpose: helper function for determining if the square's path is clear moving west
-        parameters: col_from, col_to, row_from, board
-        return: None or False
+    def redo(self):
+        """
+        purpose: makes the last move (or resignation) taken back with undo again
+        parameters: N/A
+        return: True, or False if there is no move to make again or the game is over
         """
-        col_from_plus_one = col_from - 1
+        if not self._redo or self._game_state != UNFINISHED:
+            return False
 
-        if col_from_plus_one == col_to:
+        entry = self._redo.pop()
+        if entry[0] is None:
+            self.resign_game()
             return True
 
-        if board[row_from][col_from_plus_one] != ' ':
-            return False
-        else:
-            return self.a_square_path_clear_w_helper(col_from_plus_one, col_to, row_from, board)
+        changes = self._board.update([entry[0] // BOARD_WIDTH + 1, entry[0] % BOARD_WIDTH],
+                                     [entry[1] // BOARD_WIDTH + 1, entry[1] % BOARD_WIDTH])
+        self._history.append((entry[0], entry[1], changes, entry[3], entry[4]))
+        self.finish_move()
+        return True
 
-    def a_square_path_clear_nw(self, curr_loc, future_loc):
-        """""
-        purpose: determines if square moving in northwest direction will run into anything prior to
-        getting to desired location
-        parameters: current location (list of row, col), future location (list of row, col)
-        return: True or False
+    def get_history(self):
         """
+        purpose: lists the moves made with make_move since enable_history that haven't been taken back
+        parameters: N/A
+        return: a list of (move_from, move_to) square names, empty while history is off
+        """
+        history = []
+        for entry in self._history or ():
+            if entry[0] is None:  # a resignation
+                continue
+            history.append((square_name(entry[0] // BOARD_WIDTH + 1, entry[0] % BOARD_WIDTH),
+                            square_name(entry[1] // BOARD_WIDTH + 1, entry[1] % BOARD_WIDTH)))
+        return history
+
+    def check_move(self, index_from, index_to, own, others, phase=None):
+        """
+        purpose: runs every check make_move does except the ring check, cheapest first so most bad moves are turned
+        down after a few integer operations. nothing is changed
+        parameters: index_from, index_to (cell indexes of the centers), own, others (bitboards of the player whose
+        turn it is and of the other player, passed in so a batch of moves can share them), phase (see play_move)
+        return: None if the move passes, otherwise the reason (e.g. OUT_OF_BOUNDS)
+        """
+        if self._game_state != UNFINISHED:
+            return GAME_OVER
+
+        reason = self.check_geometry(index_from, index_to)
+        if phase is not None:
+            phase("geometry")
+        if reason is None:
+            reason = self.check_ownership(index_from, own, others)
+            if phase is not None:
+                phase("ownership")
+        if reason is None:
+            reason = self.check_path(index_from, index_to, own)
+            if phase is not None:
+                phase("path")
+        return reason
+
+    def check_geometry(self, index_from, index_to):
+        """
+        purpose: checks both centers are on the playable board and the move goes along one of the eight directions
+        parameters: index_from, index_to
+        return: None, OUT_OF_BOUNDS or NOT_IN_A_LINE
+        """
+        if FOOTPRINT_MASKS[index_from] is None or FOOTPRINT_MASKS[index_to] is None:  # only on the playable board
+            return OUT_OF_BOUNDS
 
-        col_to = future_loc[1]
-        col_from = curr_loc[1]
-        row_from = curr_loc[0]
-        row_to = future_loc[0]
-        board = self._board.get_board()
-
-        result = self.a_square_path_clear_nw_helper(col_from, col_to, row_from, row_to, board)
-        return result
+        row_dir = index_to // BOARD_WIDTH - index_from // BOARD_WIDTH
+        col_dir = index_to % BOARD_WIDTH - index_from % BOARD_WIDTH
+        if self.check_if_move_is_in_a_line(row_dir, col_dir) is False:
+            return NOT_IN_A_LINE
+        return None
 
-    def a_square_path_clear_nw_helper(self, col_from, col_to, row_from, row_to, board):
-        """""
-        purpose: helper function for determining if the square's path is clear moving northwest
-        parameters: col_from, col_to, row_from, row_to, board
-        return: True or False
+    def check_ownership(self, index_from, own, others):
+        """
+        purpose: checks the piece holds some of the player's stones and none of the other player's
+        parameters: index_from (a center on the playable board), own, others
+        return: None, FOREIGN_STONE or NO_STONES
         """
-        col_from_minus_one = col_from - 1
-        row_from_plus_one = row_from + 1
+        piece_mask = FOOTPRINT_MASKS[index_from]
+        if others & piece_mask:
+            return FOREIGN_STONE
+        if own & piece_mask == 0:
+            return NO_STONES
+        return None
+
+    def check_path(self, index_from, index_to, own):
+        """
+        purpose: checks the piece has a stone in the direction it moves, doesn't go more than three squares without a
+        center stone and isn't blocked on the way
+        parameters: index_from, index_to (a move that passed check_geometry), own
+        return: None, NO_STONE_IN_DIRECTION, TOO_FAR or BLOCKED
+        """
+        row_dir = index_to // BOARD_WIDTH - index_from // BOARD_WIDTH
+        col_dir = index_to % BOARD_WIDTH - index_from % BOARD_WIDTH
+        row_step = (row_dir > 0) - (row_dir < 0)
+        col_step = (col_dir > 0) - (col_dir < 0)
+        if own >> (index_from + row_step * BOARD_WIDTH + col_step) & 1 == 0:
+            return NO_STONE_IN_DIRECTION
+
+        distance = max(abs(row_dir), abs(col_dir))
+        if distance > 3 and own >> index_from & 1 == 0:
+            return TOO_FAR
+
+        center_from = [index_from // BOARD_WIDTH + 1, index_from % BOARD_WIDTH]
+        if self._board.slide_distance(center_from, row_step, col_step, distance) < distance:
+            return BLOCKED
+        return None
+
+    def is_legal(self, move_from, move_to):
+        """
+        purpose: checks whether make_move would accept a move and why not, without changing anything
+        parameters: move_from, move_to (square names, cell indexes or (row, col) pairs)
+        return: (True, None) or (False, reason), where reason is one of NOT_A_SQUARE, GAME_OVER, OUT_OF_BOUNDS,
+        NOT_IN_A_LINE, FOREIGN_STONE, NO_STONES, NO_STONE_IN_DIRECTION, TOO_FAR, BLOCKED or SUICIDE
+        """
+        return self.validate_moves([(move_from, move_to)])[0]
 
-        if col_from_minus_one == col_to and row_from_plus_one == row_to:
-            return True
+    def validate_moves(self, pairs):
+        """
+        purpose: checks a batch of moves against the current position without playing any of them. the bitboards are
+        read once for the whole batch
+        parameters: pairs (iterable of (move_from, move_to))
+        return: a list with (True, None) or (False, reason) for each move, see is_legal
+        """
+        board = self._board
+        own = board.get_stones(self._turn)
+        others = board.get_stones(self._not_turn)
+
+        results = []
+        for move_from, move_to in pairs:
+            try:
+                index_from = square_index(move_from)
+                index_to = square_index(move_to)
+            except ValueError:
+                results.append((False, NOT_A_SQUARE))
+                continue
+
+            reason = self.check_move(index_from, index_to, own, others)
+            if reason is None and not board.keeps_ring(index_from, index_to, self._turn):
+                reason = SUICIDE
+
+            results.append((reason is None, reason))
+        return results
+
+    def finish_move(self):
+        """
+        purpose: checks if the move that was just made left the other player with no rings and hands the turn over
+        parameters: N/A
+        return: updated game state and turn
+        """
+        if self.find_rings(self._not_turn, self._board) is not True:
+            self._game_state = self._turn
 
-        if board[row_from_plus_one][col_from_minus_one] != ' ':
-            return False
-        else:
-            return self.a_square_path_clear_nw_helper(col_from_minus_one, col_to, row_from_plus_one, row_to, board)
+        # update whose turn it is
+        self.update_turn()
 
-    def a_square_path_clear_ne(self, curr_loc, future_loc):
-        """""
-        purpose: determines if square moving in northeast direction will run into anything prior to
-        getting to desired location
-        parameters: current location (list of row, col), future location (list of row, col)
-        return: True or False
+    def apply_move(self, move_from, move_to):
         """
-        col_to = future_loc[1]
-        col_from = curr_loc[1]
-        row_from = curr_loc[0]
-        row_to = future_loc[0]
-        board = self._board.get_board()
-
-        result = self.a_square_path_clear_ne_helper(col_from, col_to, row_from, row_to, board)
-        return result
+        purpose: makes a move in place without checking it, for search code that already knows the move is legal
+        (e.g. from legal_moves). the move can be taken back with revert_move
+        parameters: move_from, move_to
+        return: a record of the move for revert_move
+        """
+        return self.apply_center_move(self.translate(move_from), self.translate(move_to))
 
-    def a_square_path_clear_ne_helper(self, col_from, col_to, row_from, row_to, board):
-        """""
-        purpose: helper function for determining if the path is clear moving northwest
-        parameters: col_from, col_to, row_from, row_to, board
-        return: True or False
+    def apply_center_move(self, center_from, center_to):
+        """
+        purpose: same as apply_move but takes the centers as [row, col] lists (e.g. from iter_legal_centers), so
+        search code doesn't have to go through the square names
+        parameters: center_from, center_to
+        return: a record of the move for revert_move
         """
-        col_from_plus_one = col_from + 1
-        row_from_plus_one = row_from + 1
+        game_state = self._game_state
 
-        if col_from_plus_one == col_to and row_from_plus_one == row_to:
-            return True
+        changes = self._board.update(center_from, center_to)
+        self.finish_move()
 
-        if board[row_from_plus_one][col_from_plus_one] != ' ':
-            return False
-        else:
-            return self.a_square_path_clear_ne_helper(col_from_plus_one, col_to, row_from_plus_one, row_to, board)
+        return [changes, game_state]
 
-    def a_square_path_clear_sw(self, curr_loc, future_loc):
-        """""
-        purpose: determines if square moving in southwest direction will run into anything prior to
-        getting to desired location
-        parameters: current location (list of row, col), future location (list of row, col)
-        return: True or False
+    def revert_move(self, record):
+        """
+        purpose: takes back the last move made with apply_move, restoring the changed cells, turn and game state
+        parameters: record (returned by apply_move)
+        return: N/A
         """
-        col_to = future_loc[1]
-        col_from = curr_loc[1]
-        row_from = curr_loc[0]
-        row_to = future_loc[0]
-        board = self._board.get_board()
+        self._board.revert(record[0])
+        self._game_state = record[1]
+        self.update_turn()
 
-        result = self.a_square_path_clear_sw_helper(col_from, col_to, row_from, row_to, board)
-        return result
+    def legal_moves(self):
+        """
+        purpose: lists every legal move for the player whose turn it is
+        parameters: N/A
+        return: a list of (move_from, move_to) pairs that make_move would accept
+        """
+        return list(self.iter_legal_moves())
 
-    def a_square_path_clear_sw_helper(self, col_from, col_to, row_from, row_to, board):
-        """""
-        purpose: helper function for determining if the path is clear moving southwest
-        parameters: col_from, col_to, row_from, row_to, board
-        return: True or False
+    def iter_legal_moves(self):
         """
-        col_from_minus_one = col_from - 1
-        row_from_minus_one = row_from - 1
+        purpose: lazily generates the legal moves for the player whose turn it is
+        parameters: N/A
+        return: a generator of (move_from, move_to) pairs
+        """
+        for center_from, center_to in self.iter_legal_centers():
+            yield square_name(center_from[0], center_from[1]), square_name(center_to[0], center_to[1])
 
-        if col_from_minus_one == col_to and row_from_minus_one == row_to:
+    def iter_legal_centers(self):
+        """
+        purpose: lazily generates the legal moves for the player whose turn it is as centers. each piece's
+        directions are scanned once along the precomputed rays, sliding the leading edge until it runs into a stone
+        instead of trying every distance
+        parameters: N/A
+        return: a generator of ([row, col], [row_to, col_to]) pairs
+        """
+        if self._game_state != UNFINISHED:
             return
 
-        if board[row_from_minus_one][col_from_minus_one] != ' ':
-            return False
-        else:
-            return self.a_square_path_clear_sw_helper(col_from_minus_one, col_to, row_from_minus_one, row_to, board)
+        board = self._board
+        own = board.get_stones(self._turn)
+        others = board.get_stones(self._not_turn)
+        turn = self._turn
 
-    def a_square_path_clear_se(self, curr_loc, future_loc):
+        for index in PLAYABLE_CENTERS:
+            targets = board.piece_targets(index, own, others)
+            if not targets:
+                continue
 
-        """""
-        purpose: determines if square moving in southeast direction will run into anything prior to
-        getting to desired location
-        parameters: current location (list of row, col), future location (list of row, col)
-        return: True or False
+            row_from = index // BOARD_WIDTH + 1
+            col_from = index % BOARD_WIDTH
+            for target in targets:
+                if board.keeps_ring(index, target, turn):  # can't leave yourself without a ring
+                    yield [row_from, col_from], [target // BOARD_WIDTH + 1, target % BOARD_WIDTH]
+
+    def threat_map(self, player):
+        """
+        purpose: finds every square the player could land a footprint on next move and which of the other player's
+        rings that threatens. the pieces are scanned like iter_legal_centers does, with Board.piece_targets and
+        Board.keeps_ring
+        parameters: player ('b' or 'w', or the cell code, it doesn't have to be their turn)
+        return: (mask of the squares under the footprints the player can move to, mask of the other player's ring
+        centers one of those moves would break)
         """
-        col_to = future_loc[1]
-        col_from = curr_loc[1]
-        row_from = curr_loc[0]
-        row_to = future_loc[0]
-        board = self._board.get_board()
+        if self._game_state != UNFINISHED:
+            return 0, 0
+
+        player = CELL_CODES[player]
+        board = self._board
+        own = board.get_stones(player)
+        others = board.get_stones(BLACK + WHITE - player)
+
+        landing = 0
+        for index in PLAYABLE_CENTERS:
+            for target in board.piece_targets(index, own, others):
+                if board.keeps_ring(index, target, player):
+                    landing |= FOOTPRINT_MASKS[target]
+
+        attacked = 0
+        for center in mask_centers(board.get_ring_mask(BLACK + WHITE - player)):
+            index = bit_index(center[0], center[1])
+            if landing & FOOTPRINT_MASKS[index] & others:  # landing on any of the ring's stones captures it
+                attacked |= 1 << index
+        return landing, attacked
 
-        result = self.a_square_path_clear_se_helper(col_from, col_to, row_from, row_to, board)
+    def update_turn(self):
+        """
+        purpose: update whose turn it is and whose turn it isn't
+        parameters: N/A
+        return: updated object with whose turn it is and isn't
+        """
 
-        return result
+        if self._turn == BLACK:
+            self._turn = WHITE
+            self._not_turn = BLACK
+        else:
+            self._turn = BLACK
+            self._not_turn = WHITE
 
-    def a_square_path_clear_se_helper(self, col_from, col_to, row_from, row_to, board):
+    def find_rings(self, turn, board):
         """""
-        purpose: helper function for determining if the path is clear moving southeast
-        parameters: col_from, col_to, row_from, row_to, board
-        return: True or False
+        purpose: finds rings on board for given player
+        parameters: turn, board
+        return: True or None
         """
 
-        col_from_plus_one = col_from + 1
-        row_from_minus_one = row_from - 1
+        if board.has_ring(turn):
+            return True
 
-        if col_from_plus_one == col_to and row_from_minus_one == row_to:
-            return
+    def check_if_move_is_in_a_line(self, row_dir, col_dir):
+        """
+        purpose: verify that the piece actually moves and goes straight along one of the eight directions
+        parameters: row_dir, col_dir
+        return: None or False
+        """
 
-        if board[row_from_minus_one][col_from_plus_one] != ' ':
+        if row_dir == 0 and col_dir == 0:  # piece has to move
+            return False
+        elif row_dir != 0 and col_dir != 0 and abs(row_dir) != abs(col_dir):  # diagonals have to be 45 degrees
             return False
-        else:
-            return self.a_square_path_clear_se_helper(col_from_plus_one, col_to, row_from_minus_one, row_to, board)
-
 
+    def translate(self, a_move):
+        """
+        purpose: to translate the input of alpha-numeric (e.g. 'a6') to a numeric useable row and column
+        parameters: a_move (square name, cell index or (row, col), see square_index)
+        return: [row, col], raises ValueError if a_move isn't a square on the board
+        """
+        index = square_index(a_move)
+        return [index // BOARD_WIDTH + 1, index % BOARD_WIDTH]
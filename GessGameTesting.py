@@ -1,5 +1,8 @@
+import tracemalloc
 import unittest
-from GessGame import GessGame, Board
+import GessGame as rules
+from GessBench import POSITIONS, position
+from GessGame import BLACK, EMPTY, FOOTPRINT_CELLS, RAYS, WHITE, WHITE_WON, GessGame, Board, bit_index, square_index
 
 
 class TestGessGame(unittest.TestCase):
@@ -195,3 +198,436 @@ class TestGessGame(unittest.TestCase):
         game.make_move('c2', 'c3')
         result = game.make_move('n13', 'm13')
         self.assertEqual(result, False)
+
+    def test_board_view_matches_bitboards(self):
+        """tests the list view of the board stays in sync with the bitboards after a capture"""
+        board = Board()
+        board.update([3, 3], [5, 3])
+        board_view = board.get_board()
+        self.assertEqual(board_view[3][2], " ")
+        self.assertEqual(board_view[6][2], "b")
+        self.assertEqual(board.get_stones("b") & (1 << 42), 0)
+        self.assertEqual(board.get_stones("b") & (1 << 102), 1 << 102)
+        self.assertEqual(board.get_stones("w"), Board().get_stones("w"))
+
+    def test_board_has_ring(self):
+        """tests both players start with a ring and losing one is detected"""
+        board = Board()
+        self.assertEqual(board.has_ring("b"), True)
+        self.assertEqual(board.has_ring("w"), True)
+        board.update([3, 12], [4, 12])
+        self.assertEqual(board.has_ring("b"), False)
+        self.assertEqual(board.get_board()[2][12], " ")
+        self.assertEqual(board.get_board()[5][12], "b")
+
+    def test_null_move(self):
+        """tests a piece has to actually move"""
+        game = GessGame()
+        result = game.make_move('c3', 'c3')
+        self.assertEqual(result, False)
+
+    def test_not_in_a_line(self):
+        """tests a piece can only move along one of the eight directions"""
+        game = GessGame()
+        result = game.make_move('c3', 'd5')
+        self.assertEqual(result, False)
+
+    def test_west_blocked_by_nw_square(self):
+        """tests the northwest square of the leading edge is checked when moving west"""
+        game = GessGame()
+        game.make_move('c2', 'c3')
+        result = game.make_move('d17', 'b17')
+        self.assertEqual(result, False)
+
+    def test_west_not_blocked_by_own_piece(self):
+        """tests a piece moving west is not blocked by its own stones"""
+        game = GessGame()
+        game.make_move('c2', 'c3')
+        game.make_move('l18', 'l15')
+        game.make_move('c3', 'c4')
+        result = game.make_move('l15', 'j15')
+        self.assertEqual(result, True)
+
+    def test_legal_moves_start(self):
+        """tests the number of legal moves in the starting position"""
+        game = GessGame()
+        moves = game.legal_moves()
+        self.assertEqual(len(moves), 319)
+        self.assertEqual(len(set(moves)), 319)
+        self.assertIn(('c2', 'c3'), moves)
+        self.assertNotIn(('m3', 'm4'), moves)
+
+    def test_legal_moves_are_accepted(self):
+        """tests every generated move is accepted by make_move"""
+        game = GessGame()
+        game.make_move('c2', 'c3')
+        for move in game.legal_moves():
+            game_copy = GessGame()
+            game_copy.make_move('c2', 'c3')
+            self.assertEqual(game_copy.make_move(move[0], move[1]), True)
+
+    def test_no_legal_moves_after_game_over(self):
+        """tests there are no legal moves once the game is won"""
+        game = GessGame()
+        game.resign_game()
+        self.assertEqual(game.legal_moves(), [])
+        self.assertEqual(list(game.iter_legal_moves()), [])
+
+    def test_ring_index_start(self):
+        """tests the ring index in the starting position"""
+        board = Board()
+        self.assertEqual(board.count_rings("b"), 1)
+        self.assertEqual(board.count_rings("w"), 1)
+        self.assertEqual(board.get_ring_centers("b"), [[3, 11]])
+        self.assertEqual(board.get_ring_centers("w"), [[18, 11]])
+
+    def test_ring_index_updates(self):
+        """tests the ring index follows rings being broken and made"""
+        board = Board()
+        board.update([3, 12], [4, 12])
+        self.assertEqual(board.count_rings("b"), 0)
+        board.update([4, 12], [3, 12])
+        self.assertEqual(board.get_ring_centers("b"), [[3, 11]])
+
+    def test_apply_and_revert_move(self):
+        """tests a move made in place can be taken back"""
+        game = GessGame()
+        before = [row.copy() for row in game.get_board().get_board()]
+        record = game.apply_move('c2', 'c3')
+        self.assertEqual(game.get_turn(), "w")
+        self.assertNotEqual(game.get_board().get_board(), before)
+        game.revert_move(record)
+        self.assertEqual(game.get_turn(), "b")
+        self.assertEqual(game.get_board().get_board(), before)
+        self.assertEqual(game.get_board().get_ring_centers("b"), [[3, 11]])
+
+    def test_revert_winning_move(self):
+        """tests taking back a winning move puts the game state back"""
+        game = GessGame()
+        game.make_move('c2', 'c3')
+        game.make_move('l18', 'l15')
+        game.make_move('c3', 'c4')
+        game.make_move('l15', 'l12')
+        game.make_move('c4', 'c5')
+        game.make_move('l12', 'l9')
+        game.make_move('c6', 'c7')
+        game.make_move('l9', 'l8')
+        record = game.apply_move('l3', 'l6')
+        self.assertEqual(game.get_game_state(), "BLACK_WON")
+        game.revert_move(record)
+        self.assertEqual(game.get_game_state(), "UNFINISHED")
+        self.assertEqual(game.make_move('l3', 'l6'), True)
+
+    def test_suicide_leaves_board_alone(self):
+        """tests a move rejected for leaving no rings does not change the board"""
+        game = GessGame()
+        before = [row.copy() for row in game.get_board().get_board()]
+        self.assertEqual(game.make_move('m3', 'm4'), False)
+        self.assertEqual(game.get_board().get_board(), before)
+        self.assertEqual(game.get_board().count_rings("b"), 1)
+
+    def test_hash_transposition(self):
+        """tests the same position reached by different move orders has the same hash"""
+        game = GessGame()
+        game.make_move('c2', 'c3')
+        game.make_move('l13', 'l15')
+        game.make_move('q2', 'q3')
+        game.make_move('h14', 'i14')
+        other_game = GessGame()
+        other_game.make_move('q2', 'q3')
+        other_game.make_move('h14', 'i14')
+        other_game.make_move('c2', 'c3')
+        other_game.make_move('l13', 'l15')
+        self.assertEqual(game.get_hash(), other_game.get_hash())
+        self.assertNotEqual(game.get_hash(), GessGame().get_hash())
+
+    def test_hash_side_to_move(self):
+        """tests the hash changes with whose turn it is and comes back when a move is taken back"""
+        game = GessGame()
+        start = game.get_hash()
+        record = game.apply_move('c2', 'c3')
+        self.assertNotEqual(game.get_hash(), start)
+        game.revert_move(record)
+        self.assertEqual(game.get_hash(), start)
+        game.resign_game()
+        game.update_turn()
+        self.assertNotEqual(game.get_hash(), start)
+
+    def test_transform_square(self):
+        """tests squares are mirrored across the j-k line and flipped across the 10-11 line, and map back"""
+        self.assertEqual(rules.transform_square('c3', rules.IDENTITY), 'c3')
+        self.assertEqual(rules.transform_square('c3', rules.MIRROR), 'r3')
+        self.assertEqual(rules.transform_square('c3', rules.FLIP), 'c18')
+        self.assertEqual(rules.transform_square('c3', rules.MIRROR_FLIP), 'r18')
+        self.assertEqual(rules.transform_center([3, 2], rules.MIRROR_FLIP), [18, 17])
+        for transform in rules.TRANSFORMS:
+            self.assertEqual(rules.transform_move(*rules.transform_move('c2', 'f5', transform), transform),
+                             ('c2', 'f5'))
+
+    def test_canonical_mirror(self):
+        """tests mirror image positions have different hashes but the same canonical hash, move after move"""
+        game = GessGame()
+        game.make_move('c2', 'c3')
+        mirrored = game.transformed(rules.MIRROR)  # not c2 to r2, row 3 of the starting position isn't symmetric
+        self.assertNotEqual(game.get_hash(), mirrored.get_hash())
+        self.assertEqual(game.get_canonical_hash(), mirrored.get_canonical_hash())
+        game.make_move('l18', 'l15')
+        mirrored.make_move(*rules.transform_move('l18', 'l15', rules.MIRROR))
+        self.assertEqual(game.get_canonical_hash(), mirrored.get_canonical_hash())
+
+        canonical_hash, transform = game.get_canonical()
+        self.assertEqual(game.transformed(transform).get_hash(), canonical_hash)
+
+    def test_transformed(self):
+        """tests a transformed game has the transformed stones, turn, moves and hash"""
+        game = GessGame()
+        game.make_move('c2', 'c3')
+        hashes = game.get_symmetric_hashes()
+        self.assertEqual(hashes[rules.IDENTITY], game.get_hash())
+        flipped = game.transformed(rules.FLIP)
+        self.assertEqual(flipped.get_turn(), "b")
+        self.assertEqual(flipped.get_board().get_cell(18, 2), WHITE)  # black's c3
+        self.assertEqual(flipped.get_hash(), hashes[rules.FLIP])
+        self.assertEqual(flipped.get_canonical_hash(), game.get_canonical_hash())
+        self.assertEqual(sorted(flipped.legal_moves()),
+                         sorted(rules.transform_move(move_from, move_to, rules.FLIP)
+                                for move_from, move_to in game.legal_moves()))
+
+        game.resign_game()
+        self.assertEqual(game.transformed(rules.MIRROR_FLIP).get_game_state(), "WHITE_WON")
+
+    def test_cell_codes(self):
+        """tests the cells are kept as codes and translated to 'b', 'w' and ' ' at the edges"""
+        game = GessGame()
+        board = game.get_board()
+        self.assertEqual(len(board.get_cells()), 400)
+        self.assertEqual(board.get_cell(2, 2), BLACK)
+        self.assertEqual(board.get_cell(19, 2), WHITE)
+        self.assertEqual(board.get_cell(5, 5), EMPTY)
+        self.assertEqual(board[2][2], "b")
+        self.assertEqual(board.get_board()[19][2], "w")
+        self.assertEqual(game.get_turn_code(), BLACK)
+        game.make_move('c2', 'c3')
+        self.assertEqual(game.get_turn(), "w")
+        self.assertEqual(game.get_not_turn(), "b")
+        self.assertEqual(board.has_ring("b"), board.has_ring(BLACK))
+
+    def test_slots(self):
+        """tests games and boards don't carry an instance dict"""
+        game = GessGame()
+        self.assertFalse(hasattr(game, "__dict__"))
+        self.assertFalse(hasattr(game.get_board(), "__dict__"))
+
+    def test_state_codes(self):
+        """tests the game state is kept as a code and reported by name"""
+        game = GessGame()
+        game.resign_game()
+        self.assertEqual(game.get_state_code(), WHITE_WON)
+        self.assertEqual(game.get_game_state(), "WHITE_WON")
+
+    def test_precomputed_tables(self):
+        """tests the footprint and ray tables built at import"""
+        center = bit_index(3, 2)
+        self.assertEqual(FOOTPRINT_CELLS[center], tuple(bit_index(row, col) for row, col in
+                                                        ((3, 2), (4, 2), (2, 2), (3, 3), (3, 1), (4, 3), (4, 1),
+                                                         (2, 3), (2, 1))))
+        self.assertEqual(FOOTPRINT_CELLS[bit_index(1, 2)], None)
+        self.assertEqual(FOOTPRINT_CELLS[square_index('t5')], None)
+        self.assertEqual(len(RAYS[center][0]), 17)  # north from row 3 to row 20
+        self.assertEqual(RAYS[center][3], (bit_index(3, 1), bit_index(3, 0)))  # west to col a
+
+    def test_is_ring_center(self):
+        """tests the ring check on one square agrees with the ring index"""
+        board = Board()
+        self.assertEqual(board.is_ring_center(3, 11, "b"), True)
+        self.assertEqual(board.is_ring_center(18, 11, "w"), True)
+        self.assertEqual(board.is_ring_center(3, 11, "w"), False)
+        self.assertEqual(board.is_ring_center(1, 11, "b"), False)
+
+    def test_edge_square_rejected(self):
+        """tests a move from a square on the edge is turned down instead of failing"""
+        game = GessGame()
+        self.assertEqual(game.make_move('t5', 's5'), False)
+        self.assertEqual(game.make_move('c3', 'c20'), False)
+
+    def test_slide_distance(self):
+        """tests how far a piece can slide before its leading edge runs into a stone or the edge"""
+        board = Board()
+        self.assertEqual(board.slide_distance([3, 2], 1, 0), 3)  # stops on the stones in row 7
+        self.assertEqual(board.slide_distance([3, 2], 1, 0, 2), 2)
+        self.assertEqual(board.slide_distance([3, 2], 0, -1), 1)  # center can't go past col b
+        self.assertEqual(board.slide_distance([3, 11], -1, 0), 1)
+        self.assertEqual(board.slide_distance([5, 5], 1, 1), 1)  # northwest square lands on f7
+
+    def test_path_blocked_past_capture(self):
+        """tests a piece can land on stones but not slide past them"""
+        game = GessGame()
+        self.assertEqual(game.make_move('c3', 'c7'), False)
+        self.assertEqual(game.make_move('c3', 'c6'), True)
+
+    def test_square_index(self):
+        """tests squares can be given as names, cell indexes or (row, col) pairs"""
+        self.assertEqual(square_index('a1'), 0)
+        self.assertEqual(square_index('c3'), bit_index(3, 2))
+        self.assertEqual(square_index('t20'), 399)
+        self.assertEqual(square_index(42), 42)
+        self.assertEqual(square_index((3, 2)), 42)
+        for square in ('', 'c', 'c0', 'c21', 'u3', 'C3', 'c03', ' c3', 'c3.0', 400, -1, (0, 2), (3, 20), (3,), 3.0, None,
+                       True):
+            with self.assertRaises(ValueError):
+                square_index(square)
+
+    def test_make_move_with_indexes(self):
+        """tests make_move takes cell indexes and (row, col) pairs as well as names"""
+        game = GessGame()
+        self.assertEqual(game.make_move(square_index('c2'), (3, 2)), True)
+        self.assertEqual(game.make_move((18, 11), square_index('l15')), True)
+        self.assertEqual(game.translate('l15'), [15, 11])
+
+    def test_malformed_square(self):
+        """tests a malformed square is rejected with a ValueError and the game is left alone"""
+        game = GessGame()
+        with self.assertRaises(ValueError):
+            game.make_move('c2', 'cc')
+        with self.assertRaises(ValueError):
+            game.make_move('2c', 'c3')
+        self.assertEqual(game.get_turn(), "b")
+        self.assertEqual(game.make_move('c2', 'c3'), True)
+
+    def test_is_legal_reasons(self):
+        """tests is_legal gives the reason a move is turned down, one move for each check"""
+        moves = {('c2', 'cc'): rules.NOT_A_SQUARE,
+                 ('c3', 'c1'): rules.OUT_OF_BOUNDS,
+                 ('c3', 'd5'): rules.NOT_IN_A_LINE,
+                 ('c18', 'c17'): rules.FOREIGN_STONE,
+                 ('k10', 'k11'): rules.NO_STONES,
+                 ('b5', 'b6'): rules.NO_STONE_IN_DIRECTION,
+                 ('c6', 'c10'): rules.TOO_FAR,
+                 ('h3', 'h7'): rules.BLOCKED,
+                 ('m3', 'm4'): rules.SUICIDE}
+        game = GessGame()
+        for move, reason in moves.items():
+            self.assertEqual(game.is_legal(move[0], move[1]), (False, reason))
+        self.assertEqual(game.is_legal('c6', 'c9'), (True, None))
+        self.assertEqual(game.get_board().get_board(), GessGame().get_board().get_board())
+        game.resign_game()
+        self.assertEqual(game.is_legal('c2', 'c3'), (False, rules.GAME_OVER))
+
+    def test_validate_moves(self):
+        """tests a batch of moves is checked against the position without playing any of them"""
+        game = GessGame()
+        game.make_move('c2', 'c3')
+        pairs = [('l18', 'l15'), ('c3', 'c4'), ('m18', 'm16'), ('x1', 'l15')] + game.legal_moves()
+        results = game.validate_moves(pairs)
+        self.assertEqual(results[:4], [(True, None), (False, rules.FOREIGN_STONE), (False, rules.SUICIDE),
+                                       (False, rules.NOT_A_SQUARE)])
+        self.assertTrue(all(legal for legal, reason in results[4:]))
+        self.assertEqual(game.get_turn(), "w")
+
+    def test_undo_redo(self):
+        """tests moves can be taken back and made again from the stored cell changes"""
+        game = GessGame()
+        game.enable_history()
+        start = game.get_hash()
+        game.make_move('c2', 'c3')
+        game.make_move('l18', 'l15')
+        after = [row.copy() for row in game.get_board().get_board()]
+        self.assertEqual(game.get_history(), [('c2', 'c3'), ('l18', 'l15')])
+        self.assertEqual(game.undo(), True)
+        self.assertEqual(game.get_turn(), "w")
+        self.assertEqual(game.undo(), True)
+        self.assertEqual(game.undo(), False)
+        self.assertEqual(game.get_hash(), start)
+        self.assertEqual(game.get_board().get_board(), GessGame().get_board().get_board())
+        self.assertEqual(game.redo(), True)
+        self.assertEqual(game.redo(), True)
+        self.assertEqual(game.redo(), False)
+        self.assertEqual(game.get_board().get_board(), after)
+        self.assertEqual(game.get_turn(), "b")
+
+    def test_undo_winning_move(self):
+        """tests taking back a winning move puts the game state back, and a new move drops the redo line"""
+        game = GessGame()
+        game.enable_history()
+        for move in POSITIONS["middlegame"] + [('l3', 'l6')]:
+            game.make_move(move[0], move[1])
+        self.assertEqual(game.get_game_state(), "BLACK_WON")
+        game.undo()
+        self.assertEqual(game.get_game_state(), "UNFINISHED")
+        self.assertEqual(game.get_turn(), "b")
+        self.assertEqual(game.make_move('c7', 'c8'), True)
+        self.assertEqual(game.redo(), False)
+        self.assertEqual(len(game.get_history()), 9)
+
+    def test_no_history_by_default(self):
+        """tests a game keeps no moves unless history is turned on, so its memory doesn't grow with the plies"""
+        game = GessGame()
+        moves = POSITIONS["middlegame"] + [('c7', 'c8'), ('l8', 'l5')]
+        for move in moves[:2]:
+            game.make_move(move[0], move[1])  # the board's first changes may allocate, leave them out
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            for move in moves[2:]:
+                self.assertEqual(game.make_move(move[0], move[1]), True)
+            grown = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+        self.assertLess(grown, 512)  # the bitboards and hashes are new ints of about the same size, with history on
+        # the same moves add about 1.7 KB
+        self.assertEqual(game.undo(), False)
+        self.assertEqual(game.get_history(), [])
+
+    def test_redo_after_resign(self):
+        """tests a resignation drops the redo line, so redo can't play on in the finished game"""
+        game = GessGame()
+        game.enable_history()
+        game.make_move('c2', 'c3')
+        game.make_move('l18', 'l15')
+        game.undo()
+        game.resign_game()
+        self.assertEqual(game.get_game_state(), "BLACK_WON")
+        self.assertEqual(game.redo(), False)
+        self.assertEqual(game.get_game_state(), "BLACK_WON")
+        self.assertEqual(game.get_turn(), "w")
+        self.assertEqual(game.get_history(), [('c2', 'c3')])
+
+    def test_undo_resignation(self):
+        """tests undo takes back a resignation on its own, not the move before it"""
+        game = GessGame()
+        game.enable_history()
+        game.make_move('c2', 'c3')
+        game.resign_game()
+        self.assertEqual(game.get_game_state(), "BLACK_WON")
+        self.assertEqual(game.undo(), True)
+        self.assertEqual(game.get_game_state(), "UNFINISHED")
+        self.assertEqual(game.get_turn(), "w")
+        self.assertEqual(game.get_history(), [('c2', 'c3')])
+        self.assertEqual(game.redo(), True)
+        self.assertEqual(game.get_game_state(), "BLACK_WON")
+        self.assertEqual(game.undo(), True)
+        self.assertEqual(game.undo(), True)
+        self.assertEqual(game.get_game_state(), "UNFINISHED")
+        self.assertEqual(game.get_turn(), "b")
+        self.assertEqual(game.get_history(), [])
+
+    def test_threat_map_start(self):
+        """tests nothing is threatened at the start and the landing squares match the legal moves"""
+        game = GessGame()
+        landing, attacked = game.threat_map("b")
+        self.assertEqual(attacked, 0)
+        expected = 0
+        for center_from, center_to in game.iter_legal_centers():
+            expected |= rules.footprint_mask(center_to[0], center_to[1])
+        self.assertEqual(landing, expected)
+        self.assertEqual(game.threat_map(WHITE)[1], 0)
+
+    def test_threat_map_ring_in_danger(self):
+        """tests a ring that can be broken next move is reported, for either side whoever's turn it is"""
+        game = position("middlegame")
+        landing, attacked = game.threat_map("b")
+        self.assertEqual(rules.mask_centers(attacked), game.get_board().get_ring_centers("w"))
+        self.assertNotEqual(landing & game.get_board().get_stones("w"), 0)
+        self.assertEqual(game.threat_map("w")[1], game.get_board().get_ring_mask("b"))  # l8 to l5 wins for white
+        game.resign_game()
+        self.assertEqual(game.threat_map("b"), (0, 0))
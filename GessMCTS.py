@@ -0,0 +1,309 @@
+# Description: Monte Carlo tree search player for GessGame. UCT selection with random or lightly guided rollouts,
+# run root-parallel across a process pool: every worker grows its own tree from the same position and the root
+# visit counts are added up. Playouts make and take back moves in place on one game (apply_center_move /
+# revert_move), and rollout moves are sampled straight from the bitboards instead of generating every legal move, so
+# no GessGame is built and no board is copied per playout.
+
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from GessEngine import evaluate
+from GessGame import (BLACK, BOARD_WIDTH, FOOTPRINT_MASKS, PLAYABLE_CENTERS, RAYS, UNFINISHED, WHITE, GessGame,
+                      square_name)
+
+EXPLORATION = math.sqrt(2)
+ROLLOUT_PLIES = 40  # rollouts that haven't ended by then are scored with GessEngine.evaluate
+GUIDED_SAMPLES = 4  # guided rollouts play the move capturing the most stones out of this many sampled moves
+SAMPLE_TRIES = 200  # random tries at finding a move before falling back to generating every legal move
+
+
+def random_move(game, rng, guided=False):
+    """
+    purpose: picks a random legal move by sampling a center, direction and distance and checking it, which is much
+    cheaper than generating every legal move. the moves aren't picked with exactly equal chances, which is fine for
+    rollouts
+    parameters: game, rng (random.Random), guided (pick the move capturing the most stones out of GUIDED_SAMPLES)
+    return: ([row, col], [row_to, col_to]) or None if there is no legal move
+    """
+    board = game.get_board()
+    turn = game.get_turn_code()
+    own = board.get_stones(turn)
+    others = board.get_stones(BLACK + WHITE - turn)
+
+    best = None
+    best_captures = -1
+    found = 0
+    for _ in range(SAMPLE_TRIES):
+        index = rng.choice(PLAYABLE_CENTERS)
+        if not board.is_piece(index, own, others):
+            continue
+        direction = rng.randrange(8)
+        reach = board.piece_reach(index, direction, own)
+        if reach == 0:
+            continue
+
+        target = RAYS[index][direction][rng.randrange(reach)]
+        if not board.keeps_ring(index, target, turn):
+            continue
+        center_from = [index // BOARD_WIDTH + 1, index % BOARD_WIDTH]
+        center_to = [target // BOARD_WIDTH + 1, target % BOARD_WIDTH]
+        if not guided:
+            return center_from, center_to
+
+        captures = bin(others & FOOTPRINT_MASKS[target]).count("1")
+        if captures > best_captures:
+            best = (center_from, center_to)
+            best_captures = captures
+        found += 1
+        if found == GUIDED_SAMPLES:
+            break
+
+    if best is not None:
+        return best
+    moves = list(game.iter_legal_centers())  # few legal moves left, sampling keeps missing them
+    if not moves:
+        return None
+    return rng.choice(moves)
+
+
+class Node:
+    """
+    purpose: one position in the search tree
+    responsibilities: keeps the move that leads to it, who made that move, its children, the moves not tried yet,
+    the visit and win counts and whether the move won the game
+    communicates with(why): MCTSPlayer (builds and walks the tree)
+    """
+
+    __slots__ = ("move", "mover", "parent", "children", "untried", "visits", "wins", "won")
+
+    def __init__(self, move=None, mover=None, parent=None):
+        """
+        purpose: creates a node that hasn't been visited
+        parameters: move (centers of the move that leads here), mover (cell code of the player who made it), parent
+        return: a new Node object
+        """
+        self.move = move
+        self.mover = mover
+        self.parent = parent
+        self.children = []
+        self.untried = None  # legal moves not expanded yet, generated on the first visit
+        self.visits = 0
+        self.wins = 0.0  # for the player who made the move
+        self.won = False  # the move wins the game on the spot
+
+    def select_child(self, exploration):
+        """
+        purpose: picks the child with the best UCT score
+        parameters: exploration (UCT constant)
+        return: the child Node
+        """
+        log_visits = math.log(self.visits)
+        best = None
+        best_score = -1.0
+        for child in self.children:
+            score = child.wins / child.visits + exploration * math.sqrt(log_visits / child.visits)
+            if score > best_score:
+                best = child
+                best_score = score
+        return best
+
+
+class MCTSPlayer:
+    """
+    purpose: picks a move for the player whose turn it is with Monte Carlo tree search
+    responsibilities: runs playouts (UCT selection, expansion, rollout, backing up the result) until the playout
+    budget or deadline runs out, splits the playouts over a process pool and adds up the root statistics
+    communicates with(why): GessGame (makes and takes back moves, snapshots for the workers), GessEngine (scores
+    rollouts that are cut off)
+    """
+
+    def __init__(self, playouts=1000, time_limit_ms=None, workers=1, exploration=EXPLORATION,
+                 rollout_plies=ROLLOUT_PLIES, guided=True, seed=0):
+        """
+        purpose: creates a player
+        parameters: playouts (budget for the whole search, split over the workers), time_limit_ms (optional wall
+        clock deadline), workers (processes, 1 searches in this process), exploration (UCT constant), rollout_plies,
+        guided (capture-preferring rollouts instead of uniform random ones), seed
+        return: a new MCTSPlayer object
+        """
+        if playouts < 1:
+            raise ValueError("playouts must be at least 1")
+        self._playouts = playouts
+        self._time_limit_ms = time_limit_ms
+        self._workers = workers
+        self._exploration = exploration
+        self._rollout_plies = rollout_plies
+        self._guided = guided
+        self._seed = seed
+        self._stats = {}
+
+    def get_stats(self):
+        """
+        purpose: gets the statistics of the last search
+        parameters: N/A
+        return: a dict with the playouts run, root moves tried, visits of the chosen move and the time taken
+        """
+        return self._stats
+
+    def best_move(self, game):
+        """
+        purpose: searches the position and picks a root move that wins on the spot if any worker found one, the most
+        visited root move otherwise. the game is left as it was
+        parameters: game
+        return: (move_from, move_to), or None if there is no legal move
+        """
+        start = time.perf_counter()
+        if game.get_state_code() != UNFINISHED:
+            return None
+
+        if self._workers == 1:
+            root_stats, playouts = self.search(game, self._playouts, self._seed)
+        else:
+            share = -(-self._playouts // self._workers)  # rounded up
+            tasks = [{"position": game.to_bytes(), "playouts": share, "time_limit_ms": self._time_limit_ms,
+                      "exploration": self._exploration, "rollout_plies": self._rollout_plies,
+                      "guided": self._guided, "seed": self._seed + index} for index in range(self._workers)]
+            root_stats = {}
+            playouts = 0
+            with ProcessPoolExecutor(max_workers=self._workers) as executor:
+                for worker_stats, worker_playouts in executor.map(search_worker, tasks):
+                    playouts += worker_playouts
+                    for move, (visits, wins, won) in worker_stats.items():
+                        total = root_stats.setdefault(move, [0, 0.0, False])
+                        total[0] += visits
+                        total[1] += wins
+                        total[2] = total[2] or won
+
+        if not root_stats:
+            self._stats = {"playouts": playouts, "moves": 0, "visits": 0, "seconds": time.perf_counter() - start}
+            return None
+
+        index_from, index_to = max(root_stats, key=lambda move: (root_stats[move][2], root_stats[move][0]))
+        self._stats = {"playouts": playouts, "moves": len(root_stats), "visits": root_stats[(index_from, index_to)][0],
+                       "seconds": time.perf_counter() - start}
+        return (square_name(index_from // BOARD_WIDTH + 1, index_from % BOARD_WIDTH),
+                square_name(index_to // BOARD_WIDTH + 1, index_to % BOARD_WIDTH))
+
+    def search(self, game, playouts, seed):
+        """
+        purpose: grows one tree from the game's position in this process
+        parameters: game (moves are made and taken back in place), playouts, seed
+        return: (dict of (index_from, index_to) -> [visits, wins, won] for the root moves, where won is True for a
+        move that wins on the spot, playouts run)
+        """
+        rng = random.Random(seed)
+        if self._time_limit_ms is None:
+            deadline = None
+        else:
+            deadline = time.perf_counter() + self._time_limit_ms / 1000
+
+        root = Node()
+        count = 0
+        while count < playouts:
+            if deadline is not None and count > 0 and time.perf_counter() >= deadline:
+                break
+            self.playout(game, root, rng)
+            count += 1
+
+        root_stats = {}
+        for child in root.children:
+            center_from, center_to = child.move
+            root_stats[((center_from[0] - 1) * BOARD_WIDTH + center_from[1],
+                        (center_to[0] - 1) * BOARD_WIDTH + center_to[1])] = [child.visits, child.wins,
+                                                                               child.won]
+        return root_stats, count
+
+    def playout(self, game, root, rng):
+        """
+        purpose: runs one playout: walks down the tree by UCT, adds one new node, plays a rollout from it and backs
+        the result up to the root
+        parameters: game (at the root position, left there afterwards), root, rng
+        return: N/A
+        """
+        node = root
+        records = []
+
+        while node.untried is not None and not node.untried and node.children:  # fully expanded
+            node = node.select_child(self._exploration)
+            records.append(game.apply_center_move(node.move[0], node.move[1]))
+
+        if node.untried is None:
+            node.untried = list(game.iter_legal_centers())
+            rng.shuffle(node.untried)
+        if node.untried:
+            move = node.untried.pop()
+            child = Node(move, game.get_turn_code(), node)
+            records.append(game.apply_center_move(move[0], move[1]))
+            if game.get_state_code() == child.mover:  # wins on the spot, none of the other moves matter any more
+                child.won = True
+                node.untried = []
+                node.children = [child]
+            else:
+                node.children.append(child)
+            node = child
+
+        winner = self.rollout(game, rng)
+        for record in reversed(records):
+            game.revert_move(record)
+
+        while node is not None:
+            node.visits += 1
+            if winner is None:
+                node.wins += 0.5
+            elif winner == node.mover:
+                node.wins += 1
+            node = node.parent
+
+    def rollout(self, game, rng):
+        """
+        purpose: plays random moves until the game ends or ROLLOUT_PLIES are played, then takes them all back
+        parameters: game, rng
+        return: cell code of the winner (the side ahead by GessEngine.evaluate if the rollout was cut off), None for
+        an even position
+        """
+        records = []
+        for _ in range(self._rollout_plies):
+            if game.get_state_code() != UNFINISHED:
+                break
+            move = random_move(game, rng, self._guided)
+            if move is None:
+                break
+            records.append(game.apply_center_move(move[0], move[1]))
+
+        state = game.get_state_code()
+        if state != UNFINISHED:
+            winner = state  # a won game's state is the winner's cell code
+        else:
+            score = evaluate(game)
+            if score > 0:
+                winner = game.get_turn_code()
+            elif score < 0:
+                winner = BLACK + WHITE - game.get_turn_code()
+            else:
+                winner = None
+
+        for record in reversed(records):
+            game.revert_move(record)
+        return winner
+
+
+def search_worker(task):
+    """
+    purpose: grows one tree in a worker process from a position snapshot
+    parameters: task (dict made by MCTSPlayer.best_move)
+    return: (root statistics, playouts run), see MCTSPlayer.search
+    """
+    player = MCTSPlayer(task["playouts"], task["time_limit_ms"], 1, task["exploration"], task["rollout_plies"],
+                        task["guided"], task["seed"])
+    return player.search(GessGame.from_bytes(task["position"]), task["playouts"], task["seed"])
+
+
+def best_move(game, playouts=1000, time_limit_ms=None, workers=1, seed=0):
+    """
+    purpose: picks a move for the player whose turn it is with a fresh MCTS player
+    parameters: game, playouts, time_limit_ms, workers, seed
+    return: (move_from, move_to), or None if there is no legal move
+    """
+    return MCTSPlayer(playouts, time_limit_ms, workers, seed=seed).best_move(game)
@@ -0,0 +1,66 @@
+import random
+import time
+import unittest
+from GessBench import position
+from GessGame import GessGame
+from GessMCTS import MCTSPlayer, best_move, random_move
+
+
+class TestGessMCTS(unittest.TestCase):
+
+    def setUp(self):
+        """plays up to a position where black can take white's last ring with l3 to l6"""
+        self.game = position("middlegame")
+
+    def test_finds_win(self):
+        """tests the player takes the last ring once every root move has been tried"""
+        moves = len(self.game.legal_moves())
+        player = MCTSPlayer(playouts=moves + 1, rollout_plies=2)
+        self.assertTrue(self.game.make_move(*player.best_move(self.game)))
+        self.assertEqual(self.game.get_game_state(), "BLACK_WON")
+
+    def test_game_left_unchanged(self):
+        """tests the playouts take back every move they make"""
+        before = [row.copy() for row in self.game.get_board().get_board()]
+        start_hash = self.game.get_hash()
+        best_move(self.game, playouts=50)
+        self.assertEqual(self.game.get_board().get_board(), before)
+        self.assertEqual(self.game.get_hash(), start_hash)
+        self.assertEqual(self.game.get_turn(), "b")
+        self.assertEqual(self.game.get_game_state(), "UNFINISHED")
+
+    def test_time_limit(self):
+        """tests the player answers close to its deadline with a legal move"""
+        game = GessGame()
+        start = time.perf_counter()
+        move = best_move(game, playouts=1000000, time_limit_ms=100)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertIn(move, game.legal_moves())
+
+    def test_workers(self):
+        """tests the root statistics of several processes are added up"""
+        player = MCTSPlayer(playouts=40, workers=2, rollout_plies=5)
+        move = player.best_move(self.game)
+        self.assertIn(move, self.game.legal_moves())
+        self.assertEqual(player.get_stats()["playouts"], 40)
+
+    def test_no_move_after_game_over(self):
+        """tests there is nothing to search once the game is won"""
+        game = GessGame()
+        game.resign_game()
+        self.assertEqual(best_move(game, playouts=10), None)
+
+    def test_random_move_is_legal(self):
+        """tests sampled rollout moves are legal, guided or not"""
+        rng = random.Random(1)
+        for guided in (False, True):
+            game = GessGame()
+            for _ in range(30):
+                center_from, center_to = random_move(game, rng, guided)
+                self.assertIn((center_from, center_to), list(game.iter_legal_centers()))
+                game.apply_center_move(center_from, center_to)
+
+    def test_bad_budget(self):
+        """tests a player needs at least one playout"""
+        with self.assertRaises(ValueError):
+            MCTSPlayer(playouts=0)
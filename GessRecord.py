@@ -0,0 +1,222 @@
+# Description: Game record format for Gess archives, with a text and a compact binary form, and streaming replay
+# through GessGame. Every reader is a generator that holds one game at a time, so archives of any size are
+# processed in constant memory.
+#
+# Text form, one game after another, separated by blank lines:
+#     [Game "1"]
+#     [Result "BLACK_WON"]
+#     c2-c3
+#     l18-l15
+#
+# Binary form: the 5 byte file header b"GESS" + version, then for every game a 4 byte header length, the header as
+# UTF-8 JSON, a 4 byte move count and 2 bytes per move (all big-endian). A move is stored as its index in
+# MOVE_CODES, the list of every straight move between two centers on the board (18156 of them, so they fit in
+# 16 bits).
+
+import json
+import struct
+
+from GessGame import DIRECTIONS, GessGame, square_name
+
+MAGIC = b"GESS"
+VERSION = 1
+
+MOVE_CODES = []  # code -> (move_from, move_to)
+for _row in range(2, 20):
+    for _col in range(1, 19):
+        for _row_step, _col_step in DIRECTIONS:
+            _distance = 1
+            while 2 <= _row + _row_step * _distance <= 19 and 1 <= _col + _col_step * _distance <= 18:
+                MOVE_CODES.append((square_name(_row, _col),
+                                   square_name(_row + _row_step * _distance, _col + _col_step * _distance)))
+                _distance += 1
+MOVE_INDEX = {move: code for code, move in enumerate(MOVE_CODES)}  # (move_from, move_to) -> code
+
+
+def encode_move(move_from, move_to):
+    """
+    purpose: packs a move into its 2 byte code
+    parameters: move_from, move_to
+    return: the code (0 to 65535)
+    """
+    try:
+        return MOVE_INDEX[(move_from, move_to)]
+    except KeyError:
+        raise ValueError("not a straight move between two centers on the board: " + move_from + "-" + move_to)
+
+
+def decode_move(code):
+    """
+    purpose: unpacks a 2 byte move code
+    parameters: code
+    return: (move_from, move_to), raises ValueError if no move has that code
+    """
+    if not 0 <= code < len(MOVE_CODES):
+        raise ValueError("bad move code " + str(code))
+    return MOVE_CODES[code]
+
+
+def write_text(file, games):
+    """
+    purpose: writes games in the text form
+    parameters: file (opened for writing text), games (iterable of (header dict, list of (move_from, move_to)))
+    return: the number of games written
+    """
+    count = 0
+    for header, moves in games:
+        if count:
+            file.write("\n")
+        for key, value in header.items():
+            file.write("[" + str(key) + " " + json.dumps(str(value)) + "]\n")
+        for move_from, move_to in moves:
+            file.write(move_from + "-" + move_to + "\n")
+        count += 1
+    return count
+
+
+def read_text(file):
+    """
+    purpose: reads games in the text form one at a time
+    parameters: file (opened for reading text)
+    return: a generator of (header dict, list of (move_from, move_to))
+    """
+    header = {}
+    moves = []
+    for number, line in enumerate(file, 1):
+        line = line.strip()
+        if not line:
+            if header or moves:
+                yield header, moves
+            header = {}
+            moves = []
+
+        elif line.startswith("["):
+            if moves:  # a header right after moves starts a new game
+                yield header, moves
+                header = {}
+                moves = []
+            key, _, value = line[1:-1].partition(" ")
+            header[key] = json.loads(value)
+
+        else:
+            move_from, dash, move_to = line.partition("-")
+            if not dash or not move_from or not move_to:
+                raise ValueError("line " + str(number) + ": expected a move like c2-c3, got " + repr(line))
+            moves.append((move_from, move_to))
+
+    if header or moves:
+        yield header, moves
+
+
+def write_binary(file, games):
+    """
+    purpose: writes games in the binary form
+    parameters: file (opened for writing bytes), games (iterable of (header dict, list of (move_from, move_to)))
+    return: the number of games written
+    """
+    file.write(MAGIC + bytes([VERSION]))
+    count = 0
+    for header, moves in games:
+        header_bytes = json.dumps(header).encode("utf-8")
+        codes = [encode_move(move_from, move_to) for move_from, move_to in moves]
+        file.write(struct.pack(">I", len(header_bytes)))
+        file.write(header_bytes)
+        file.write(struct.pack(">I", len(codes)))
+        file.write(struct.pack(">" + str(len(codes)) + "H", *codes))
+        count += 1
+    return count
+
+
+def read_binary(file):
+    """
+    purpose: reads games in the binary form one at a time
+    parameters: file (opened for reading bytes)
+    return: a generator of (header dict, list of (move_from, move_to))
+    """
+    start = file.read(5)
+    if start[:4] != MAGIC:
+        raise ValueError("not a Gess binary record")
+    if start[4] != VERSION:
+        raise ValueError("unsupported Gess binary record version " + str(start[4]))
+
+    while True:
+        size = file.read(4)
+        if not size:
+            return
+        if len(size) != 4:
+            raise ValueError("truncated Gess binary record")
+        header = json.loads(read_exactly(file, struct.unpack(">I", size)[0]).decode("utf-8"))
+        count = struct.unpack(">I", read_exactly(file, 4))[0]
+        codes = struct.unpack(">" + str(count) + "H", read_exactly(file, 2 * count))
+        yield header, [decode_move(code) for code in codes]
+
+
+def read_exactly(file, size):
+    """
+    purpose: reads a number of bytes, failing on a truncated file
+    parameters: file, size
+    return: the bytes
+    """
+    data = file.read(size)
+    if len(data) != size:
+        raise ValueError("truncated Gess binary record")
+    return data
+
+
+def read_records(path):
+    """
+    purpose: opens an archive in either form (told apart by the binary file header) and reads its games
+    parameters: path
+    return: a generator of (header dict, list of (move_from, move_to))
+    """
+    with open(path, "rb") as file:
+        binary = file.read(4) == MAGIC
+
+    if binary:
+        with open(path, "rb") as file:
+            for game in read_binary(file):
+                yield game
+    else:
+        with open(path, "r", encoding="utf-8") as file:
+            for game in read_text(file):
+                yield game
+
+
+def replay_positions(games):
+    """
+    purpose: replays games through GessGame.make_move, giving the position after every move. the same GessGame is
+    updated in place, so copy anything that has to be kept
+    parameters: games (iterable of (header, moves), e.g. from read_records)
+    return: a generator of (header, ply number, (move_from, move_to), accepted, game), accepted is False for an
+    illegal move and for one that isn't a pair of square names
+    """
+    for header, moves in games:
+        game = GessGame()
+        for ply, (move_from, move_to) in enumerate(moves, 1):
+            try:
+                accepted = game.make_move(move_from, move_to)
+            except ValueError:  # not a square name
+                accepted = False
+            yield header, ply, (move_from, move_to), accepted, game
+
+
+def replay_results(games):
+    """
+    purpose: replays games through GessGame.make_move, giving how each one ended
+    parameters: games (iterable of (header, moves), e.g. from read_records)
+    return: a generator of (header, game state, moves played, illegal moves)
+    """
+    for header, moves in games:
+        game = GessGame()
+        plies = 0
+        illegal = 0
+        for move_from, move_to in moves:
+            try:
+                accepted = game.make_move(move_from, move_to)
+            except ValueError:  # not a square name
+                accepted = False
+            if accepted:
+                plies += 1
+            else:
+                illegal += 1
+        yield header, game.get_game_state(), plies, illegal
@@ -0,0 +1,94 @@
+import io
+import os
+import tempfile
+import unittest
+from GessRecord import (MOVE_CODES, decode_move, encode_move, read_binary, read_records, read_text, replay_positions,
+                        replay_results, write_binary, write_text)
+
+WHITE_WINS = [('c2', 'c3'), ('l18', 'l15'), ('c3', 'c4'), ('l15', 'l12'), ('c4', 'c5'), ('l12', 'l9'),
+              ('c6', 'c7'), ('l9', 'l8'), ('c7', 'c8'), ('l8', 'l5')]
+GAMES = [({"Game": "1", "Result": "WHITE_WON"}, WHITE_WINS), ({"Game": "2"}, [('c2', 'c3'), ('m18', 'm16')])]
+
+
+class TestGessRecord(unittest.TestCase):
+
+    def test_move_codes(self):
+        """tests every move code fits in 2 bytes and round trips"""
+        self.assertLess(len(MOVE_CODES), 1 << 16)
+        self.assertEqual(decode_move(encode_move('b6', 'e9')), ('b6', 'e9'))
+        with self.assertRaises(ValueError):
+            encode_move('c3', 'd5')
+
+    def test_text_round_trip(self):
+        """tests games written in the text form read back the same"""
+        file = io.StringIO()
+        write_text(file, GAMES)
+        self.assertIn("c2-c3\n", file.getvalue())
+        file.seek(0)
+        self.assertEqual(list(read_text(file)), GAMES)
+
+    def test_binary_round_trip(self):
+        """tests games written in the binary form read back the same, at 2 bytes a move"""
+        file = io.BytesIO()
+        write_binary(file, GAMES)
+        file.seek(0)
+        self.assertEqual(list(read_binary(file)), GAMES)
+
+        small = io.BytesIO()
+        write_binary(small, [({}, WHITE_WINS)])
+        self.assertEqual(len(small.getvalue()), 5 + 4 + 2 + 4 + 2 * len(WHITE_WINS))
+
+    def test_read_records_either_form(self):
+        """tests an archive is read whichever form it is in"""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        directory = tmp.name
+        text_path = os.path.join(directory, "games.txt")
+        binary_path = os.path.join(directory, "games.bin")
+        with open(text_path, "w") as file:
+            write_text(file, GAMES)
+        with open(binary_path, "wb") as file:
+            write_binary(file, GAMES)
+        self.assertEqual(list(read_records(text_path)), GAMES)
+        self.assertEqual(list(read_records(binary_path)), GAMES)
+
+    def test_replay(self):
+        """tests replaying gives each game's result and every position"""
+        results = list(replay_results(GAMES))
+        self.assertEqual(results[0][1:], ("WHITE_WON", 10, 0))
+        self.assertEqual(results[1][1:], ("UNFINISHED", 1, 1))
+        positions = list(replay_positions(GAMES))
+        self.assertEqual(len(positions), 12)
+        self.assertEqual(positions[-1][3], False)
+
+    def test_bad_move_code(self):
+        """tests a code no move has is reported, on its own and in a binary file"""
+        with self.assertRaisesRegex(ValueError, "bad move code 65000"):
+            decode_move(65000)
+        file = io.BytesIO()
+        write_binary(file, [({}, [('c2', 'c3')])])
+        data = bytearray(file.getvalue())
+        data[-2:] = (65000).to_bytes(2, "big")
+        with self.assertRaisesRegex(ValueError, "bad move code"):
+            list(read_binary(io.BytesIO(bytes(data))))
+
+    def test_replay_typo(self):
+        """tests a move that isn't a pair of squares is replayed as an illegal move"""
+        games = [({}, [('c2', 'c3'), ('l18', 'z18'), ('l18', 'l15')])]
+        self.assertEqual([result[1:] for result in replay_results(games)], [("UNFINISHED", 2, 1)])
+        self.assertEqual([position[3] for position in replay_positions(games)], [True, False, True])
+
+    def test_bad_line(self):
+        """tests a line that isn't a move is reported"""
+        with self.assertRaises(ValueError):
+            list(read_text(io.StringIO("c2c3\n")))
+
+    def test_truncated_binary(self):
+        """tests a binary file cut off anywhere after the header is reported as truncated"""
+        file = io.BytesIO()
+        write_binary(file, GAMES)
+        data = file.getvalue()
+        first = len(data) - 4 - 4 - 4 - len(b'{"Game": "2"}')  # where the second game starts
+        for end in [first + 1, first + 3, first + 6, len(data) - 1]:
+            with self.assertRaisesRegex(ValueError, "truncated"):
+                list(read_binary(io.BytesIO(data[:end])))
@@ -0,0 +1,226 @@
+# Description: Runs many games of Gess across a process pool: random or engine self-play, or replaying recorded
+# move lists through GessGame.make_move. Run with "python -m GessRunner" to print a JSON summary.
+
+import argparse
+import json
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from GessGame import GessGame
+
+
+def self_play_tasks(count, mode="random", seed=0, max_plies=400, depth=1, time_limit_ms=None, opening_plies=4,
+                    book=None):
+    """
+    purpose: builds the tasks for self-play games
+    parameters: count, mode ('random' or 'engine'), seed (game i uses seed + i), max_plies (games are cut off
+    after this many moves), depth and time_limit_ms (engine settings), opening_plies (random moves played before
+    the engine takes over, so engine games don't all come out the same), book (path of an opening book for the
+    engine, optional)
+    return: a list of task dicts
+    """
+    return [{"mode": mode, "seed": seed + index, "max_plies": max_plies, "depth": depth,
+             "time_limit_ms": time_limit_ms, "opening_plies": opening_plies, "book": book} for index in range(count)]
+
+
+def replay_tasks(games):
+    """
+    purpose: builds the tasks for replaying recorded games
+    parameters: games (list of move lists, each a list of (move_from, move_to))
+    return: a list of task dicts
+    """
+    return [{"mode": "replay", "moves": [list(move) for move in moves]} for moves in games]
+
+
+def play_game(task):
+    """
+    purpose: plays or replays one game
+    parameters: task (dict from self_play_tasks or replay_tasks)
+    return: a dict with the game state, number of moves played and number of illegal moves
+    """
+    game = GessGame()
+    plies = 0
+    illegal = 0
+
+    if task["mode"] == "replay":
+        for move_from, move_to in task["moves"]:
+            try:
+                accepted = game.make_move(move_from, move_to)
+            except ValueError:  # not a square name, e.g. a typo in the archive
+                accepted = False
+            if accepted:
+                plies += 1
+            else:
+                illegal += 1
+
+    elif task["mode"] == "random":
+        plies = play_random_moves(game, random.Random(task["seed"]), task["max_plies"])
+
+    elif task["mode"] == "engine":
+        from GessEngine import GessEngine  # only engine games pay for importing the engine
+
+        plies = play_random_moves(game, random.Random(task["seed"]), min(task["opening_plies"], task["max_plies"]))
+        book = None
+        if task.get("book"):
+            from OpeningBook import OpeningBook
+
+            book = OpeningBook(task["book"])
+        engine = GessEngine(book=book)
+        while plies < task["max_plies"] and game.get_game_state() == "UNFINISHED":
+            move = engine.best_move(game, task["depth"], task["time_limit_ms"])
+            if move is None:
+                break
+            if game.make_move(move[0], move[1]):
+                plies += 1
+            else:
+                illegal += 1
+                break
+
+    else:
+        raise ValueError("unknown mode: " + str(task["mode"]))
+
+    return {"state": game.get_game_state(), "plies": plies, "illegal": illegal}
+
+
+def play_random_moves(game, rng, count):
+    """
+    purpose: plays random legal moves
+    parameters: game, rng (random.Random), count (most moves to play)
+    return: the number of moves played
+    """
+    plies = 0
+    while plies < count:
+        moves = list(game.iter_legal_centers())
+        if not moves:
+            break
+        center_from, center_to = rng.choice(moves)
+        game.apply_center_move(center_from, center_to)  # generated moves are legal, no need to check again
+        plies += 1
+    return plies
+
+
+def play_chunk(tasks):
+    """
+    purpose: plays a chunk of games in one worker, so each task doesn't have to go through the pool on its own
+    parameters: tasks
+    return: a list of results, in the same order as the tasks
+    """
+    return [play_game(task) for task in tasks]
+
+
+def iter_results(tasks, workers=None, chunk_size=16):
+    """
+    purpose: hands the tasks out to a process pool in chunks and streams the results back as chunks finish
+    parameters: tasks, workers (number of processes, one per CPU if left out; 1 runs in this process),
+    chunk_size (games per chunk)
+    return: a generator of game results (in the order chunks finish)
+    """
+    chunks = [tasks[index:index + chunk_size] for index in range(0, len(tasks), chunk_size)]
+
+    if workers == 1:
+        for chunk in chunks:
+            for result in play_chunk(chunk):
+                yield result
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(play_chunk, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            for result in future.result():
+                yield result
+
+
+class GameStats:
+    """
+    purpose: adds up the results of many games
+    responsibilities: counts wins for each side and unfinished games, game lengths and illegal moves
+    communicates with(why): takes the result dicts made by play_game
+    """
+
+    def __init__(self):
+        """
+        purpose: creates empty statistics
+        parameters: N/A
+        return: a new GameStats object
+        """
+        self._games = 0
+        self._states = {"UNFINISHED": 0, "BLACK_WON": 0, "WHITE_WON": 0}
+        self._plies = 0
+        self._min_plies = None
+        self._max_plies = 0
+        self._illegal = 0
+
+    def add(self, result):
+        """
+        purpose: adds one game's result
+        parameters: result (dict from play_game)
+        return: N/A
+        """
+        self._games += 1
+        self._states[result["state"]] += 1
+        self._plies += result["plies"]
+        self._illegal += result["illegal"]
+        self._max_plies = max(self._max_plies, result["plies"])
+        if self._min_plies is None or result["plies"] < self._min_plies:
+            self._min_plies = result["plies"]
+
+    def summary(self):
+        """
+        purpose: gets the statistics so far
+        parameters: N/A
+        return: a dict with game counts, win rates, game lengths and illegal move counts
+        """
+        games = max(self._games, 1)
+        return {"games": self._games,
+                "black_won": self._states["BLACK_WON"],
+                "white_won": self._states["WHITE_WON"],
+                "unfinished": self._states["UNFINISHED"],
+                "black_win_rate": self._states["BLACK_WON"] / games,
+                "white_win_rate": self._states["WHITE_WON"] / games,
+                "mean_plies": self._plies / games,
+                "min_plies": self._min_plies,
+                "max_plies": self._max_plies,
+                "illegal_moves": self._illegal}
+
+
+def run(tasks, workers=None, chunk_size=16):
+    """
+    purpose: plays every task across a process pool and adds up the results
+    parameters: tasks, workers, chunk_size (see iter_results)
+    return: the summary dict from GameStats
+    """
+    stats = GameStats()
+    for result in iter_results(tasks, workers, chunk_size):
+        stats.add(result)
+    return stats.summary()
+
+
+def main(argv=None):
+    """
+    purpose: command line entry point for self-play, prints the summary as JSON
+    parameters: argv (command line arguments, defaults to sys.argv)
+    return: exit status
+    """
+    parser = argparse.ArgumentParser(prog="python -m GessRunner", description="Self-play across a process pool")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--mode", choices=("random", "engine"), default="random")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=16)
+    parser.add_argument("--max-plies", type=int, default=400)
+    parser.add_argument("--depth", type=int, default=1, help="engine search depth")
+    parser.add_argument("--time-limit-ms", type=int, default=None, help="engine time per move")
+    parser.add_argument("--opening-plies", type=int, default=4, help="random moves before the engine takes over")
+    parser.add_argument("--book", default=None, help="opening book file for the engine")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    tasks = self_play_tasks(args.games, args.mode, args.seed, args.max_plies, args.depth, args.time_limit_ms,
+                            args.opening_plies, args.book)
+    print(json.dumps(run(tasks, args.workers, args.chunk_size), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
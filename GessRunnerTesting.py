@@ -0,0 +1,51 @@
+import unittest
+from GessRunner import GameStats, play_game, replay_tasks, run, self_play_tasks
+
+WHITE_WINS = [('c2', 'c3'), ('l18', 'l15'), ('c3', 'c4'), ('l15', 'l12'), ('c4', 'c5'), ('l12', 'l9'),
+              ('c6', 'c7'), ('l9', 'l8'), ('c7', 'c8'), ('l8', 'l5')]
+
+
+class TestGessRunner(unittest.TestCase):
+
+    def test_replay(self):
+        """tests a recorded game is replayed through make_move and illegal moves are counted"""
+        result = play_game(replay_tasks([WHITE_WINS + [('c8', 'c9')]])[0])
+        self.assertEqual(result, {"state": "WHITE_WON", "plies": 10, "illegal": 1})
+
+    def test_replay_typo(self):
+        """tests a move that isn't a pair of squares is counted as illegal, in process and in the pool"""
+        moves = [('c2', 'c3'), ('z18', 'l15'), ('l18', 'l15')]
+        self.assertEqual(play_game(replay_tasks([moves])[0]), {"state": "UNFINISHED", "plies": 2, "illegal": 1})
+        summary = run(replay_tasks([moves, WHITE_WINS]), workers=2, chunk_size=1)
+        self.assertEqual(summary["games"], 2)
+        self.assertEqual(summary["illegal_moves"], 1)
+
+    def test_random_self_play_is_repeatable(self):
+        """tests the same seed plays the same game"""
+        task = self_play_tasks(1, seed=5, max_plies=30)[0]
+        self.assertEqual(play_game(task), play_game(task))
+
+    def test_pool(self):
+        """tests games spread over a process pool are all added up"""
+        tasks = self_play_tasks(4, max_plies=10) + replay_tasks([WHITE_WINS])
+        summary = run(tasks, workers=2, chunk_size=2)
+        self.assertEqual(summary["games"], 5)
+        self.assertEqual(summary["white_won"], 1)
+        self.assertEqual(summary["illegal_moves"], 0)
+
+    def test_engine_self_play(self):
+        """tests the engine can play both sides"""
+        result = play_game(self_play_tasks(1, mode="engine", max_plies=3, opening_plies=1)[0])
+        self.assertEqual(result["plies"], 3)
+        self.assertEqual(result["illegal"], 0)
+
+    def test_stats(self):
+        """tests the win rates and game lengths"""
+        stats = GameStats()
+        stats.add({"state": "BLACK_WON", "plies": 10, "illegal": 0})
+        stats.add({"state": "UNFINISHED", "plies": 30, "illegal": 2})
+        summary = stats.summary()
+        self.assertEqual(summary["black_win_rate"], 0.5)
+        self.assertEqual(summary["mean_plies"], 20)
+        self.assertEqual(summary["min_plies"], 10)
+        self.assertEqual(summary["illegal_moves"], 2)
@@ -0,0 +1,475 @@
+# Description: asyncio server hosting many games of Gess at once. Clients send one JSON request per line over TCP
+# or a Unix socket and get one JSON response per line back. Run with "python -m GessServer".
+#
+# Requests ("id" is optional and echoed back):
+#     {"op": "new", "game": "g1"}                       -> {"ok": true, "game": "g1", "state": ..., "turn": ...}
+#     {"op": "move", "game": "g1", "from": "c2", "to": "c3"} -> {"ok": true, "result": true, "state": ..., ...}
+#     {"op": "state", "game": "g1"}                     -> {"ok": true, "state": ..., "turn": ..., "moves": 1}
+#     {"op": "resign", "game": "g1"}                    -> {"ok": true, "state": ...}
+#     {"op": "close", "game": "g1"}                     -> {"ok": true}
+#     {"op": "stats"}                                   -> {"ok": true, "games": ..., "latency_ms": {...}}
+# Errors come back as {"ok": false, "error": "..."}.
+#
+# Requests on one game are serialized by its lock. Eviction takes the same lock while the game is written to the
+# store, and reading and writing a directory store runs in the default thread pool, so a sweep over many idle games
+# doesn't hold up the other connections.
+
+import argparse
+import asyncio
+import collections
+import io
+import json
+import os
+import sys
+import time
+
+from GessGame import GessGame
+from GessRecord import read_text, write_text
+
+
+class GameSession:
+    """
+    purpose: one hosted game
+    responsibilities: holds the game, its move list (what gets stored when the game is evicted), its lock and when
+    it was last used
+    communicates with(why): GessGame (the game itself), GessServer (looks sessions up by game ID)
+    """
+
+    def __init__(self, game_id, moves=None, resigned=None):
+        """
+        purpose: creates a session, replaying stored moves if there are any
+        parameters: game_id, moves (list of (move_from, move_to) already played), resigned (player who resigned)
+        return: a new GameSession object
+        """
+        self._game_id = game_id
+        self._game = GessGame()
+        self._moves = []
+        self._resigned = None
+        self._lock = asyncio.Lock()
+        self._last_used = time.monotonic()
+        self._detached = False  # evicted or closed, requests that were waiting for the lock look the game up again
+
+        for move_from, move_to in moves or []:
+            self.make_move(move_from, move_to)
+        if resigned is not None:
+            self.resign()
+
+    def get_lock(self):
+        return self._lock
+
+    def get_last_used(self):
+        return self._last_used
+
+    def detach(self):
+        self._detached = True
+
+    def is_detached(self):
+        return self._detached
+
+    def touch(self):
+        """
+        purpose: marks the session as used now, so it isn't evicted
+        parameters: N/A
+        return: N/A
+        """
+        self._last_used = time.monotonic()
+
+    def make_move(self, move_from, move_to):
+        """
+        purpose: makes a move and remembers it if it was accepted
+        parameters: move_from, move_to
+        return: True or False
+        """
+        result = self._game.make_move(move_from, move_to)
+        if result:
+            self._moves.append((move_from, move_to))
+        return result
+
+    def resign(self):
+        """
+        purpose: resigns the game for the player whose turn it is
+        parameters: N/A
+        return: N/A
+        """
+        if self._game.get_game_state() == "UNFINISHED":
+            self._resigned = self._game.get_turn()
+            self._game.resign_game()
+
+    def describe(self):
+        """
+        purpose: gets the state of the game for a response
+        parameters: N/A
+        return: a dict with the game ID, state, turn and number of moves
+        """
+        return {"game": self._game_id, "state": self._game.get_game_state(), "turn": self._game.get_turn(),
+                "moves": len(self._moves)}
+
+    def to_record(self):
+        """
+        purpose: writes the game in the GessRecord text form for storage
+        parameters: N/A
+        return: the record as a string
+        """
+        header = {"Game": self._game_id}
+        if self._resigned is not None:
+            header["Resigned"] = self._resigned
+        file = io.StringIO()
+        write_text(file, [(header, self._moves)])
+        return file.getvalue()
+
+
+def session_from_record(game_id, record):
+    """
+    purpose: rebuilds a session from its stored record
+    parameters: game_id, record (string made by GameSession.to_record)
+    return: a GameSession
+    """
+    for header, moves in read_text(io.StringIO(record)):
+        return GameSession(game_id, moves, header.get("Resigned"))
+    return GameSession(game_id)
+
+
+class GameStore:
+    """
+    purpose: keeps evicted games, in memory or as one file per game in a directory
+    responsibilities: saves, loads and deletes game records by game ID
+    communicates with(why): GessServer (evicts idle sessions here and loads them back on their next request)
+    """
+
+    def __init__(self, directory=None):
+        """
+        purpose: creates a store
+        parameters: directory (where to put the files, games are kept in memory if left out)
+        return: a new GameStore object
+        """
+        self._directory = directory
+        self._records = {}
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def uses_files(self):
+        return self._directory is not None
+
+    def path(self, game_id):
+        """
+        purpose: works out the file a game is stored in (the ID is hex encoded so any ID makes a safe file name)
+        parameters: game_id
+        return: the path
+        """
+        return os.path.join(self._directory, game_id.encode("utf-8").hex() + ".gess")
+
+    def save(self, game_id, record):
+        if self._directory is None:
+            self._records[game_id] = record
+        else:
+            with open(self.path(game_id), "w", encoding="utf-8") as file:
+                file.write(record)
+
+    def load(self, game_id):
+        """
+        purpose: finds a stored game
+        parameters: game_id
+        return: the record or None
+        """
+        if self._directory is None:
+            return self._records.get(game_id)
+        try:
+            with open(self.path(game_id), "r", encoding="utf-8") as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+    def delete(self, game_id):
+        if self._directory is None:
+            self._records.pop(game_id, None)
+        elif os.path.exists(self.path(game_id)):
+            os.remove(self.path(game_id))
+
+
+class GessServer:
+    """
+    purpose: hosts many games for clients connecting over a socket
+    responsibilities: handles the line-delimited JSON protocol, keeps one lock per game, evicts idle games to the
+    store, measures request latency
+    communicates with(why): GameSession (one per hosted game), GameStore (where idle games go)
+    """
+
+    def __init__(self, store=None, idle_timeout=300, latency_samples=10000):
+        """
+        purpose: creates a server with no games
+        parameters: store (GameStore, in memory if left out), idle_timeout (seconds before an unused game is
+        evicted), latency_samples (how many recent request times the percentiles are taken over)
+        return: a new GessServer object
+        """
+        self._store = store or GameStore()
+        self._idle_timeout = idle_timeout
+        self._sessions = {}
+        self._latencies = collections.deque(maxlen=latency_samples)
+        self._requests = 0
+        self._evictions = 0
+        self._servers = []
+        self._evict_task = None
+
+    async def start_tcp(self, host="127.0.0.1", port=8765):
+        """
+        purpose: starts listening on a TCP socket
+        parameters: host, port (0 picks a free port)
+        return: the port listened on
+        """
+        server = await asyncio.start_server(self.handle_client, host, port)
+        self._servers.append(server)
+        self.start_evicting()
+        return server.sockets[0].getsockname()[1]
+
+    async def start_unix(self, path):
+        """
+        purpose: starts listening on a Unix socket
+        parameters: path
+        return: N/A
+        """
+        server = await asyncio.start_unix_server(self.handle_client, path)
+        self._servers.append(server)
+        self.start_evicting()
+
+    def start_evicting(self):
+        if self._evict_task is None:
+            self._evict_task = asyncio.ensure_future(self.evict_loop())
+
+    async def close(self):
+        """
+        purpose: stops listening and stores every game that is still in memory
+        parameters: N/A
+        return: N/A
+        """
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers = []
+        if self._evict_task is not None:
+            self._evict_task.cancel()
+            self._evict_task = None
+        await self.evict_idle(0)
+
+    async def evict_loop(self):
+        """
+        purpose: evicts idle games every so often while the server runs
+        parameters: N/A
+        return: N/A
+        """
+        while True:
+            await asyncio.sleep(max(self._idle_timeout / 4, 0.05))
+            await self.evict_idle(self._idle_timeout)
+
+    async def store_call(self, method, *args):
+        """
+        purpose: runs a GameStore method, in the default thread pool if it reads or writes files
+        parameters: method (e.g. self._store.save), args (passed on to it)
+        return: what the method returns
+        """
+        if not self._store.uses_files():
+            return method(*args)
+        return await asyncio.get_running_loop().run_in_executor(None, method, *args)
+
+    async def evict_idle(self, idle_timeout):
+        """
+        purpose: moves games that haven't been used for a while out of memory and into the store. each game's lock
+        is held while it is written, so requests for it wait and then load it back
+        parameters: idle_timeout (seconds)
+        return: the number of games evicted
+        """
+        now = time.monotonic()
+        evicted = 0
+        for game_id, session in list(self._sessions.items()):
+            if now - session.get_last_used() < idle_timeout or session.get_lock().locked():
+                continue
+            async with session.get_lock():
+                if self._sessions.get(game_id) is not session:  # closed or evicted while this sweep waited
+                    continue
+                await self.store_call(self._store.save, game_id, session.to_record())
+                del self._sessions[game_id]
+                session.detach()
+                evicted += 1
+        self._evictions += evicted
+        return evicted
+
+    async def handle_client(self, reader, writer):
+        """
+        purpose: answers one client's requests, one JSON object per line
+        parameters: reader, writer (asyncio streams)
+        return: N/A
+        """
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    response = {"ok": False, "error": "request is not valid JSON"}
+                else:
+                    response = await self.handle_request(request)
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def handle_request(self, request):
+        """
+        purpose: answers one request and times it
+        parameters: request (dict)
+        return: the response dict
+        """
+        start = time.perf_counter()
+        try:
+            response = await self.dispatch(request)
+        except (KeyError, TypeError, ValueError) as error:
+            response = {"ok": False, "error": str(error)}
+        self._latencies.append(time.perf_counter() - start)
+        self._requests += 1
+
+        if isinstance(request, dict) and "id" in request:
+            response["id"] = request["id"]
+        return response
+
+    async def dispatch(self, request):
+        """
+        purpose: does what a request asks for
+        parameters: request (dict)
+        return: the response dict
+        """
+        op = request["op"]
+        if op == "stats":
+            return self.stats()
+
+        game_id = str(request["game"])
+        if op == "new":
+            stored = await self.store_call(self._store.load, game_id)
+            if game_id in self._sessions or stored is not None:
+                raise ValueError("game already exists: " + game_id)
+            self._sessions[game_id] = GameSession(game_id)
+            response = self._sessions[game_id].describe()
+            response["ok"] = True
+            return response
+
+        while True:
+            session = await self.get_session(game_id)
+            async with session.get_lock():
+                if session.is_detached():  # evicted or closed while this request waited, look it up again
+                    continue
+                response = await self.apply_request(session, op, request)
+                break
+
+        response["ok"] = True
+        return response
+
+    async def apply_request(self, session, op, request):
+        """
+        purpose: does what a request asks for with a game, holding its lock
+        parameters: session, op, request (dict)
+        return: the response dict without "ok"
+        """
+        game_id = str(request["game"])
+        session.touch()
+        if op == "move":
+            result = session.make_move(str(request["from"]), str(request["to"]))
+            response = session.describe()
+            response["result"] = result
+        elif op == "state":
+            response = session.describe()
+        elif op == "resign":
+            session.resign()
+            response = session.describe()
+        elif op == "close":
+            del self._sessions[game_id]
+            session.detach()
+            await self.store_call(self._store.delete, game_id)
+            response = {"game": game_id}
+        else:
+            raise ValueError("unknown op: " + str(op))
+        return response
+
+    async def get_session(self, game_id):
+        """
+        purpose: finds a game in memory, loading it back from the store if it was evicted
+        parameters: game_id
+        return: the GameSession
+        """
+        session = self._sessions.get(game_id)
+        if session is not None:
+            return session
+
+        record = await self.store_call(self._store.load, game_id)
+        session = self._sessions.get(game_id)
+        if session is not None:  # another request loaded it meanwhile
+            return session
+        if record is None:
+            raise KeyError("no such game: " + game_id)
+
+        session = session_from_record(game_id, record)
+        async with session.get_lock():  # not evicted again before the stored copy is gone
+            self._sessions[game_id] = session
+            await self.store_call(self._store.delete, game_id)
+        return session
+
+    def stats(self):
+        """
+        purpose: gets the server statistics
+        parameters: N/A
+        return: a dict with the games in memory, requests served, evictions and latency percentiles in ms
+        """
+        latencies = sorted(self._latencies)
+        percentiles = {}
+        for name, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("max", 1.0)):
+            if latencies:
+                percentiles[name] = latencies[min(int(fraction * len(latencies)), len(latencies) - 1)] * 1000
+            else:
+                percentiles[name] = None
+        return {"ok": True, "games": len(self._sessions), "requests": self._requests, "evictions": self._evictions,
+                "latency_ms": percentiles}
+
+
+async def serve(args):
+    """
+    purpose: runs the server until it is interrupted
+    parameters: args (parsed command line arguments)
+    return: N/A
+    """
+    server = GessServer(GameStore(args.storage), args.idle_timeout)
+    if args.unix:
+        await server.start_unix(args.unix)
+    else:
+        await server.start_tcp(args.host, args.port)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    """
+    purpose: command line entry point
+    parameters: argv (command line arguments, defaults to sys.argv)
+    return: exit status
+    """
+    parser = argparse.ArgumentParser(prog="python -m GessServer", description="Hosts many games of Gess")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", default=None, help="listen on this Unix socket instead of TCP")
+    parser.add_argument("--storage", default=None, help="directory for evicted games (in memory if left out)")
+    parser.add_argument("--idle-timeout", type=float, default=300, help="seconds before an idle game is evicted")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
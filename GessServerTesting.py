@@ -0,0 +1,107 @@
+import asyncio
+import json
+import tempfile
+import unittest
+from GessServer import GameStore, GessServer
+
+
+class TestGessServer(unittest.TestCase):
+
+    def test_game_requests(self):
+        """tests a game can be created, played, looked at and resigned"""
+        async def play():
+            server = GessServer()
+            new = await server.handle_request({"op": "new", "game": "g1", "id": 7})
+            move = await server.handle_request({"op": "move", "game": "g1", "from": "c2", "to": "c3"})
+            bad = await server.handle_request({"op": "move", "game": "g1", "from": "c2", "to": "c3"})
+            resign = await server.handle_request({"op": "resign", "game": "g1"})
+            return new, move, bad, resign
+
+        new, move, bad, resign = asyncio.run(play())
+        self.assertEqual(new["id"], 7)
+        self.assertEqual(new["turn"], "b")
+        self.assertEqual(move["result"], True)
+        self.assertEqual(move["turn"], "w")
+        self.assertEqual(bad["result"], False)
+        self.assertEqual(resign["state"], "BLACK_WON")
+
+    def test_errors(self):
+        """tests bad requests get an error instead of closing the connection"""
+        async def play():
+            server = GessServer()
+            await server.handle_request({"op": "new", "game": "g1"})
+            return [await server.handle_request({"op": "state", "game": "nope"}),
+                    await server.handle_request({"op": "new", "game": "g1"}),
+                    await server.handle_request({"op": "fly", "game": "g1"}),
+                    await server.handle_request({"game": "g1"})]
+
+        for response in asyncio.run(play()):
+            self.assertEqual(response["ok"], False)
+
+    def test_eviction(self):
+        """tests idle games are stored and come back as they were"""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+
+        async def play():
+            server = GessServer(GameStore(tmp.name))
+            await server.handle_request({"op": "new", "game": "g/1"})
+            await server.handle_request({"op": "move", "game": "g/1", "from": "c2", "to": "c3"})
+            await server.handle_request({"op": "resign", "game": "g/1"})
+            evicted = await server.evict_idle(0)
+            stats = await server.handle_request({"op": "stats"})
+            state = await server.handle_request({"op": "state", "game": "g/1"})
+            return evicted, stats, state
+
+        evicted, stats, state = asyncio.run(play())
+        self.assertEqual(evicted, 1)
+        self.assertEqual(stats["games"], 0)
+        self.assertEqual(state["moves"], 1)
+        self.assertEqual(state["state"], "BLACK_WON")
+
+    def test_request_during_eviction(self):
+        """tests a request that comes in while its game is being written to the store waits and sees the stored game"""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+
+        async def play():
+            server = GessServer(GameStore(tmp.name))
+            await server.handle_request({"op": "new", "game": "g1"})
+            await server.handle_request({"op": "move", "game": "g1", "from": "c2", "to": "c3"})
+            evicted, move, closed = await asyncio.gather(
+                server.evict_idle(0),
+                server.handle_request({"op": "move", "game": "g1", "from": "l18", "to": "l15"}),
+                server.handle_request({"op": "close", "game": "g2"}))
+            state = await server.handle_request({"op": "state", "game": "g1"})
+            return evicted, move, closed, state
+
+        evicted, move, closed, state = asyncio.run(play())
+        self.assertEqual(evicted, 1)
+        self.assertEqual(move["result"], True)
+        self.assertEqual(closed["ok"], False)
+        self.assertEqual(state["moves"], 2)
+
+    def test_tcp(self):
+        """tests the line-delimited JSON protocol over a TCP connection"""
+        async def play():
+            server = GessServer()
+            port = await server.start_tcp("127.0.0.1", 0)
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            responses = []
+            for request in ({"op": "new", "game": "g1"}, {"op": "move", "game": "g1", "from": "c2", "to": "c3"},
+                            {"op": "stats"}):
+                writer.write(json.dumps(request).encode("utf-8") + b"\n")
+                await writer.drain()
+                responses.append(json.loads(await reader.readline()))
+            writer.write(b"not json\n")
+            await writer.drain()
+            responses.append(json.loads(await reader.readline()))
+            writer.close()
+            await server.close()
+            return responses
+
+        new, move, stats, bad = asyncio.run(play())
+        self.assertEqual(move["result"], True)
+        self.assertEqual(stats["requests"], 2)
+        self.assertIsNotNone(stats["latency_ms"]["p99"])
+        self.assertEqual(bad["ok"], False)
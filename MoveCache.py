@@ -0,0 +1,140 @@
+# Description: Legal move cache for GessGame, kept per piece center. Each center remembers the squares its piece can
+# slide to and the mask of cells those depend on: its footprint and the squares its leading edge sweeps on the way
+# to where it stops. When the position changes (by any means: make_move, apply/revert, undo/redo) the cache compares
+# the bitboards with the ones it last saw and only works out again the centers whose cells changed, so generating
+# the moves after a move costs in proportion to what the move touched rather than to the whole board.
+
+from GessGame import BLACK, BOARD_WIDTH, EMPTY, FOOTPRINT_MASKS, PLAYABLE_CENTERS, UNFINISHED, WHITE, grow, square_name
+
+# index -> the cells the suicide check of a move from or to there reads: the ring centers it looks at again are
+# within two squares of the footprint, and their rings one more square out
+SUICIDE_AREAS = [None if _mask is None else grow(grow(_mask)) for _mask in FOOTPRINT_MASKS]
+
+
+class MoveCache:
+    """
+    purpose: generates the legal moves of a game again and again without redoing the work for pieces a move didn't
+    touch
+    responsibilities: keeps the slide targets and the cells they depend on for every center, finds the cells that
+    changed since the last call and drops the entries that depend on them, runs the suicide check when moves are
+    asked for (kept only while every ring of the player is near the move, otherwise a ring far away decides it)
+    communicates with(why): GessGame (the position, the piece targets, the ring masks and the suicide check come from
+    its Board)
+    """
+
+    def __init__(self, game):
+        """
+        purpose: creates an empty cache for a game
+        parameters: game (the cache follows whatever position it is in)
+        return: a new MoveCache object
+        """
+        self._game = game
+        self._entries = [None] * 400  # index -> entry (see compute), None to work out
+        self._black = 0
+        self._white = 0
+        self._queries = 0
+        self._computed = 0
+        self._reused = 0
+
+    def get_stats(self):
+        """
+        purpose: gets how much work the cache saved
+        parameters: N/A
+        return: a dict with the calls made, centers worked out and centers reused
+        """
+        return {"queries": self._queries, "computed": self._computed, "reused": self._reused}
+
+    def clear(self):
+        """
+        purpose: drops every entry, e.g. after switching to a different game
+        parameters: N/A
+        return: N/A
+        """
+        self._entries = [None] * 400
+
+    def compute(self, index):
+        """
+        purpose: works out the entry of one center: whose piece it is and the squares it can slide to, suicide aside
+        parameters: index (a playable center)
+        return: [owner cell code or EMPTY, [row, col] of the center, tuple of (target index, [row, col]) in
+        iter_legal_centers order, mask of the cells the entry depends on, dict of target index -> suicide check
+        result filled in as the checks are needed]
+        """
+        board = self._game.get_board()
+        black = board.get_stones(BLACK)
+        white = board.get_stones(WHITE)
+        if board.is_piece(index, black, white):
+            owner = BLACK
+            targets = board.piece_targets(index, black, white)
+        elif board.is_piece(index, white, black):
+            owner = WHITE
+            targets = board.piece_targets(index, white, black)
+        else:
+            # not a piece until a stone in the footprint changes
+            return [EMPTY, None, (), FOOTPRINT_MASKS[index], None]
+
+        depends = FOOTPRINT_MASKS[index]
+        for target in targets:
+            depends |= FOOTPRINT_MASKS[target]  # the leading edge sweeps every footprint up to where it stops
+        return [owner, [index // BOARD_WIDTH + 1, index % BOARD_WIDTH],
+                tuple((target, [target // BOARD_WIDTH + 1, target % BOARD_WIDTH]) for target in targets), depends, {}]
+
+    def legal_centers(self):
+        """
+        purpose: lists the legal moves for the player whose turn it is, the same ones in the same order as
+        GessGame.iter_legal_centers
+        parameters: N/A
+        return: a list of ([row, col], [row_to, col_to]) pairs (the centers are shared with the cache, treat them as
+        read only)
+        """
+        game = self._game
+        self._queries += 1
+        if game.get_state_code() != UNFINISHED:
+            return []
+
+        board = game.get_board()
+        black = board.get_stones(BLACK)
+        white = board.get_stones(WHITE)
+        changed = (black ^ self._black) | (white ^ self._white)
+        self._black = black
+        self._white = white
+
+        turn = game.get_turn_code()
+        rings = board.get_ring_mask(turn)
+        entries = self._entries
+        moves = []
+        for index in PLAYABLE_CENTERS:
+            entry = entries[index]
+            if entry is None or entry[3] & changed:
+                entry = self.compute(index)
+                entries[index] = entry
+                self._computed += 1
+            else:
+                self._reused += 1
+            if entry[0] != turn:
+                continue
+
+            center_from = entry[1]
+            checked = entry[4]
+            for target, center_to in entry[2]:
+                if not board.rings_out_of_reach(rings, index, target):  # check for suicide
+                    # with no ring out of reach, the result only depends on the cells around the move, so it is kept
+                    # until one of them changes
+                    keeps_ring = checked.get(target)
+                    if keeps_ring is None:
+                        keeps_ring = board.keeps_ring(index, target, turn)
+                        checked[target] = keeps_ring
+                        entry[3] |= SUICIDE_AREAS[index] | SUICIDE_AREAS[target]
+                    if not keeps_ring:
+                        continue
+                moves.append((center_from, center_to))
+        return moves
+
+    def legal_moves(self):
+        """
+        purpose: same as legal_centers with square names, like GessGame.legal_moves
+        parameters: N/A
+        return: a list of (move_from, move_to) pairs
+        """
+        return [(square_name(center_from[0], center_from[1]), square_name(center_to[0], center_to[1]))
+                for center_from, center_to in self.legal_centers()]
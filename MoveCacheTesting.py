@@ -0,0 +1,59 @@
+import random
+import unittest
+from GessGame import GessGame
+from MoveCache import MoveCache
+
+
+class TestMoveCache(unittest.TestCase):
+
+    def assert_same_moves(self, cache, game):
+        self.assertEqual([tuple(move) for move in cache.legal_centers()],
+                         [tuple(move) for move in game.iter_legal_centers()])
+
+    def test_start(self):
+        """tests the cache gives the same moves as the generator, names included"""
+        game = GessGame()
+        cache = MoveCache(game)
+        self.assert_same_moves(cache, game)
+        self.assertEqual(cache.legal_moves(), game.legal_moves())
+
+    def test_follows_the_game(self):
+        """tests the moves stay right through make_move, undo, redo, apply_center_move and revert_move"""
+        rng = random.Random(4)
+        game = GessGame()
+        game.enable_history()
+        cache = MoveCache(game)
+        for ply in range(40):
+            self.assert_same_moves(cache, game)
+            moves = game.legal_moves()
+            if not moves:
+                break
+            game.make_move(*rng.choice(moves))
+            if ply % 5 == 4:
+                game.undo()
+                self.assert_same_moves(cache, game)
+                game.redo()
+            if ply % 7 == 6:
+                record = game.apply_center_move(*rng.choice(list(game.iter_legal_centers())))
+                self.assert_same_moves(cache, game)
+                game.revert_move(record)
+
+    def test_only_touched_centers_worked_out(self):
+        """tests a move only makes the cache work out the centers near the cells it changed"""
+        game = GessGame()
+        cache = MoveCache(game)
+        cache.legal_centers()
+        first = cache.get_stats()
+        game.make_move('c2', 'c3')
+        self.assert_same_moves(cache, game)
+        stats = cache.get_stats()
+        self.assertEqual(first["computed"], 324)
+        self.assertLess(stats["computed"] - first["computed"], 100)
+        self.assertGreater(stats["reused"], 224)
+
+    def test_game_over(self):
+        """tests there are no moves once the game is won"""
+        game = GessGame()
+        cache = MoveCache(game)
+        game.resign_game()
+        self.assertEqual(cache.legal_centers(), [])
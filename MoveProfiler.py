@@ -0,0 +1,105 @@
+# Description: Counters and timers for the phases of GessGame.make_move. Turned on per game with
+# GessGame.enable_profiling; one profiler can be shared by many games to add up their moves.
+
+import time
+
+PHASES = ("parse", "geometry", "ownership", "path", "suicide", "update", "opponent_rings")
+
+
+class MoveProfiler:
+    """
+    purpose: finds out where make_move spends its time and why moves get turned down
+    responsibilities: counts and times each phase of make_move, counts accepted moves and rejections by reason,
+    gives a snapshot of the numbers
+    communicates with(why): GessGame (make_move reports every phase here while profiling is on)
+    """
+
+    def __init__(self):
+        """
+        purpose: creates a profiler with every counter at zero
+        parameters: N/A
+        return: a new MoveProfiler object
+        """
+        self._clock = time.perf_counter
+        self._last = 0.0  # when the phase being timed started
+        self._counts = {}
+        self._totals = {}
+        self._maximums = {}
+        self._rejections = {}
+        self._moves = 0
+        self._accepted = 0
+        self.reset()
+
+    def reset(self):
+        """
+        purpose: puts every counter back to zero
+        parameters: N/A
+        return: N/A
+        """
+        self._counts = {phase: 0 for phase in PHASES}
+        self._totals = {phase: 0.0 for phase in PHASES}
+        self._maximums = {phase: 0.0 for phase in PHASES}
+        self._rejections = {}
+        self._moves = 0
+        self._accepted = 0
+
+    def start(self):
+        """
+        purpose: starts timing a move, the first phase runs from here
+        parameters: N/A
+        return: N/A
+        """
+        self._last = self._clock()
+
+    def phase(self, phase):
+        """
+        purpose: ends a phase of the move being timed, the next one runs from here
+        parameters: phase (one of PHASES)
+        return: N/A
+        """
+        now = self._clock()
+        self.record(phase, now - self._last)
+        self._last = now
+
+    def record(self, phase, seconds):
+        """
+        purpose: adds one run of a phase
+        parameters: phase (one of PHASES), seconds
+        return: N/A
+        """
+        self._counts[phase] += 1
+        self._totals[phase] += seconds
+        if seconds > self._maximums[phase]:
+            self._maximums[phase] = seconds
+
+    def accept(self):
+        self._moves += 1
+        self._accepted += 1
+
+    def reject(self, reason):
+        """
+        purpose: counts a move that was turned down
+        parameters: reason (e.g. GessGame.BLOCKED)
+        return: N/A
+        """
+        self._moves += 1
+        self._rejections[reason] = self._rejections.get(reason, 0) + 1
+
+    def snapshot(self):
+        """
+        purpose: gets the numbers so far
+        parameters: N/A
+        return: a dict with the moves seen, accepted and rejected (by reason), and for each phase the number of runs,
+        total ms, mean and max us
+        """
+        phases = {}
+        for phase in PHASES:
+            count = self._counts[phase]
+            phases[phase] = {"count": count,
+                             "total_ms": self._totals[phase] * 1000,
+                             "mean_us": self._totals[phase] / count * 1000000 if count else 0.0,
+                             "max_us": self._maximums[phase] * 1000000}
+        return {"moves": self._moves,
+                "accepted": self._accepted,
+                "rejected": dict(self._rejections),
+                "phases": phases}
@@ -0,0 +1,60 @@
+import unittest
+import GessGame as rules
+from GessBench import POSITIONS
+from GessGame import GessGame
+from MoveProfiler import PHASES, MoveProfiler
+
+
+class TestMoveProfiler(unittest.TestCase):
+
+    def test_off_by_default(self):
+        """tests games aren't profiled unless asked"""
+        game = GessGame()
+        game.make_move('c2', 'c3')
+        self.assertEqual(game.get_profile(), None)
+
+    def test_counts_phases_and_reasons(self):
+        """tests accepted moves run every phase and rejected ones are counted by reason"""
+        game = GessGame()
+        game.enable_profiling()
+        self.assertEqual(game.make_move('c2', 'c3'), True)
+        self.assertEqual(game.make_move('c3', 'c4'), False)
+        self.assertEqual(game.make_move('m18', 'm16'), False)
+        with self.assertRaises(ValueError):
+            game.make_move('zz', 'c3')
+
+        profile = game.get_profile()
+        self.assertEqual(profile["moves"], 4)
+        self.assertEqual(profile["accepted"], 1)
+        self.assertEqual(profile["rejected"], {rules.FOREIGN_STONE: 1, rules.SUICIDE: 1, rules.NOT_A_SQUARE: 1})
+        self.assertEqual(profile["phases"]["parse"]["count"], 4)
+        self.assertEqual(profile["phases"]["ownership"]["count"], 3)
+        self.assertEqual(profile["phases"]["suicide"]["count"], 2)
+        self.assertEqual(profile["phases"]["opponent_rings"]["count"], 1)
+        self.assertEqual(set(profile["phases"]), set(PHASES))
+        self.assertGreater(profile["phases"]["update"]["total_ms"], 0)
+
+    def test_same_result_as_make_move(self):
+        """tests profiling doesn't change what make_move does"""
+        game = GessGame()
+        profiled = GessGame()
+        profiled.enable_profiling()
+        for move in POSITIONS["middlegame"] + [('m3', 'm4'), ('l3', 'l6'), ('c7', 'c8')]:
+            self.assertEqual(profiled.make_move(move[0], move[1]), game.make_move(move[0], move[1]))
+            self.assertEqual(profiled.get_hash(), game.get_hash())
+        self.assertEqual(profiled.get_game_state(), "BLACK_WON")
+        self.assertEqual(profiled.get_profile()["rejected"], {rules.SUICIDE: 1, rules.GAME_OVER: 1})
+
+    def test_shared_profiler(self):
+        """tests one profiler adds up the moves of many games and can be reset"""
+        profiler = MoveProfiler()
+        games = [GessGame() for _ in range(3)]
+        for game in games:
+            self.assertIs(game.enable_profiling(profiler), profiler)
+            game.make_move('c2', 'c3')
+        self.assertEqual(profiler.snapshot()["accepted"], 3)
+        games[0].disable_profiling()
+        games[0].make_move('l18', 'l15')
+        self.assertEqual(profiler.snapshot()["moves"], 3)
+        profiler.reset()
+        self.assertEqual(profiler.snapshot()["moves"], 0)
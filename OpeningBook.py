@@ -0,0 +1,201 @@
+# Description: Opening book for Gess. A book is built from recorded games (see GessRecord) and gives weighted
+# candidate moves for positions seen in their first plies. It is stored as entries sorted by canonical position hash
+# (GessGame.get_canonical) and looked up by binary search over an mmap of the file, so opening a book does no loading
+# work. Positions that are mirror images or color-flipped copies of each other share entries, with the moves stored as
+# they are played in the canonical position. Build one with "python -m OpeningBook games.gess book.gesb".
+#
+# File layout: the 9 byte header b"GESB" + version + 4 byte entry count, then the entries, each an 8 byte position
+# hash, the 2 byte GessRecord move code and a 4 byte weight (all big-endian), sorted by hash and then move code.
+
+import argparse
+import mmap
+import struct
+import sys
+
+from GessGame import GessGame, transform_move
+from GessRecord import decode_move, encode_move, read_records
+
+MAGIC = b"GESB"
+VERSION = 1
+HEADER = struct.Struct(">4sBI")
+ENTRY = struct.Struct(">QHI")
+DEFAULT_MAX_PLIES = 12
+
+
+def count_book_moves(games, max_plies=DEFAULT_MAX_PLIES):
+    """
+    purpose: replays games and counts how often each move was played from each position in their first plies
+    parameters: games (iterable of (header, moves), e.g. from read_records), max_plies
+    return: a dict of (canonical position hash, move code in the canonical position) -> count
+    """
+    counts = {}
+    for header, moves in games:
+        game = GessGame()
+        for move_from, move_to in moves[:max_plies]:
+            position, transform = game.get_canonical()
+            try:
+                legal = game.make_move(move_from, move_to)
+            except ValueError:  # not a square name
+                legal = False
+            if not legal:
+                break  # the rest of the game doesn't follow from this position
+            key = (position, encode_move(*transform_move(move_from, move_to, transform)))  # legal moves are lines
+            counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+def write_book(path, counts, min_count=1):
+    """
+    purpose: writes a book file
+    parameters: path, counts (dict from count_book_moves), min_count (moves played fewer times are left out)
+    return: the number of entries written
+    """
+    entries = sorted(key for key, count in counts.items() if count >= min_count)
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(entries)))
+        for position, code in entries:
+            file.write(ENTRY.pack(position, code, min(counts[(position, code)], 0xFFFFFFFF)))
+    return len(entries)
+
+
+def build_book(games, path, max_plies=DEFAULT_MAX_PLIES, min_count=1):
+    """
+    purpose: builds a book file from recorded games
+    parameters: games (iterable of (header, moves)), path, max_plies (how many plies of each game go in),
+    min_count (moves played fewer times are left out)
+    return: the number of entries written
+    """
+    return write_book(path, count_book_moves(games, max_plies), min_count)
+
+
+class OpeningBook:
+    """
+    purpose: gives the moves played from a position in the recorded games, weighted by how often they were played
+    responsibilities: maps the book file and binary searches it for position hashes
+    communicates with(why): GessGame (positions are looked up by get_canonical and moves checked with is_legal),
+    GessRecord (moves are stored as its 2 byte move codes), GessEngine (plays book moves before searching)
+    """
+
+    def __init__(self, path):
+        """
+        purpose: opens a book file
+        parameters: path
+        return: a new OpeningBook object
+        """
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < HEADER.size:
+            raise ValueError("not a Gess opening book: " + str(path))
+        magic, version, count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError("not a Gess opening book: " + str(path))
+        if version != VERSION:
+            raise ValueError("unsupported Gess opening book version " + str(version))
+        if len(self._map) != HEADER.size + count * ENTRY.size:
+            raise ValueError("truncated Gess opening book: " + str(path))
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._map.close()
+
+    def get_hash(self, index):
+        """
+        purpose: reads the position hash of one entry
+        parameters: index
+        return: the hash
+        """
+        return struct.unpack_from(">Q", self._map, HEADER.size + index * ENTRY.size)[0]
+
+    def lookup_hash(self, position):
+        """
+        purpose: finds the entries of one position by binary search
+        parameters: position (canonical hash from GessGame.get_canonical)
+        return: a list of (move code, weight)
+        """
+        low = 0
+        high = self._count
+        while low < high:  # first entry with a hash >= position
+            middle = (low + high) // 2
+            if self.get_hash(middle) < position:
+                low = middle + 1
+            else:
+                high = middle
+
+        entries = []
+        while low < self._count:
+            entry_hash, code, weight = ENTRY.unpack_from(self._map, HEADER.size + low * ENTRY.size)
+            if entry_hash != position:
+                break
+            entries.append((code, weight))
+            low += 1
+        return entries
+
+    def lookup(self, game):
+        """
+        purpose: gets the book moves for the game's position, leaving out any that aren't legal there (a different
+        position can share the hash)
+        parameters: game
+        return: a list of (move_from, move_to, weight), most played first, raises ValueError if the book holds a bad
+        move code
+        """
+        position, transform = game.get_canonical()
+        moves = []
+        for code, weight in self.lookup_hash(position):
+            move_from, move_to = transform_move(*decode_move(code), transform)
+            if game.is_legal(move_from, move_to)[0]:
+                moves.append((move_from, move_to, weight))
+        moves.sort(key=lambda move: -move[2])
+        return moves
+
+    def choose(self, game, rng=None):
+        """
+        purpose: picks a book move for the game's position
+        parameters: game, rng (random.Random to pick in proportion to the weights, the most played move if left out)
+        return: (move_from, move_to), or None if the position isn't in the book
+        """
+        moves = self.lookup(game)
+        if not moves:
+            return None
+        if rng is None:
+            return moves[0][0], moves[0][1]
+
+        pick = rng.randrange(sum(move[2] for move in moves))
+        for move_from, move_to, weight in moves:
+            if pick < weight:
+                return move_from, move_to
+            pick -= weight
+
+
+def main(argv=None):
+    """
+    purpose: command line entry point, builds a book from game records
+    parameters: argv (command line arguments, defaults to sys.argv)
+    return: exit status
+    """
+    parser = argparse.ArgumentParser(prog="python -m OpeningBook", description="Builds a Gess opening book")
+    parser.add_argument("records", nargs="+", help="game record files, text or binary")
+    parser.add_argument("book", help="book file to write")
+    parser.add_argument("--max-plies", type=int, default=DEFAULT_MAX_PLIES, help="plies of each game to use")
+    parser.add_argument("--min-count", type=int, default=1, help="leave out moves played fewer times")
+    args = parser.parse_args(argv)
+
+    def games():
+        for path in args.records:
+            for game in read_records(path):
+                yield game
+
+    print(build_book(games(), args.book, args.max_plies, args.min_count), "entries")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+import os
+import random
+import tempfile
+import unittest
+from GessEngine import GessEngine
+from GessGame import GessGame
+from OpeningBook import OpeningBook, build_book, main, write_book
+
+GAMES = [({"Game": "1"}, [('c2', 'c3'), ('l18', 'l15'), ('c3', 'c4')]),
+         ({"Game": "2"}, [('c2', 'c3'), ('l13', 'l15'), ('q2', 'q3')]),
+         ({"Game": "3"}, [('q2', 'q3'), ('l18', 'l15')]),
+         ({"Game": "4"}, [('c2', 'c3'), ('m18', 'm16'), ('c3', 'c4')])]  # white's move is illegal, the game stops
+
+
+class TestOpeningBook(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "book.gesb")
+
+    def test_lookup(self):
+        """tests book moves come back weighted by how often they were played"""
+        self.assertEqual(build_book(GAMES, self.path), 7)
+        with OpeningBook(self.path) as book:
+            self.assertEqual(len(book), 7)
+            self.assertEqual(book.lookup(GessGame()), [('c2', 'c3', 3), ('q2', 'q3', 1)])
+            game = GessGame()
+            game.make_move('c2', 'c3')
+            self.assertEqual(sorted(book.lookup(game)), [('l13', 'l15', 1), ('l18', 'l15', 1)])
+            self.assertEqual(game.make_move('h14', 'i14'), True)
+            self.assertEqual(book.lookup(game), [])
+            self.assertEqual(book.choose(game), None)
+
+    def test_max_plies_and_min_count(self):
+        """tests only the first plies of each game go in and rare moves can be left out"""
+        self.assertEqual(build_book(GAMES, self.path, max_plies=1, min_count=2), 1)
+        with OpeningBook(self.path) as book:
+            self.assertEqual(book.lookup(GessGame()), [('c2', 'c3', 3)])
+
+    def test_bad_moves(self):
+        """tests a game stops going in at a move that isn't a line or isn't on the board, like at an illegal move"""
+        games = [({}, [('c2', 'c3'), ('c3', 'd5')]), ({}, [('c2', 'c3'), ('l18', 'a18')]),
+                 ({}, [('c2', 'c3'), ('z18', 'l15')])]
+        self.assertEqual(build_book(games, self.path), 1)
+        with OpeningBook(self.path) as book:
+            self.assertEqual(book.lookup(GessGame()), [('c2', 'c3', 3)])
+
+    def test_bad_move_code(self):
+        """tests a book entry with a code no move has is reported"""
+        write_book(self.path, {(GessGame().get_canonical()[0], 65000): 1})
+        with OpeningBook(self.path) as book:
+            with self.assertRaisesRegex(ValueError, "bad move code"):
+                book.lookup(GessGame())
+
+    def test_choose(self):
+        """tests weighted picks only give book moves and the most played one is the default"""
+        build_book(GAMES, self.path)
+        with OpeningBook(self.path) as book:
+            self.assertEqual(book.choose(GessGame()), ('c2', 'c3'))
+            rng = random.Random(1)
+            picks = {book.choose(GessGame(), rng) for _ in range(50)}
+            self.assertEqual(picks, {('c2', 'c3'), ('q2', 'q3')})
+
+    def test_engine_uses_book(self):
+        """tests the engine plays the book move without searching"""
+        build_book(GAMES, self.path)
+        with OpeningBook(self.path) as book:
+            engine = GessEngine(book=book)
+            self.assertEqual(engine.best_move(GessGame(), 2), ('c2', 'c3'))
+            self.assertEqual(engine.get_stats()["nodes"], 0)
+
+    def test_bad_file(self):
+        """tests a file that isn't a book is turned down"""
+        with open(self.path, "wb") as file:
+            file.write(b"not a book at all")
+        with self.assertRaises(ValueError):
+            OpeningBook(self.path)
+
+    def test_command_line(self):
+        """tests building a book from a record file on the command line"""
+        from GessRecord import write_text
+
+        records = os.path.join(os.path.dirname(self.path), "games.gess")
+        with open(records, "w") as file:
+            write_text(file, GAMES)
+        self.assertEqual(main([records, self.path]), 0)
+        with OpeningBook(self.path) as book:
+            self.assertEqual(len(book), 7)
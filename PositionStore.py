@@ -0,0 +1,137 @@
+# Description: File of GessGame position snapshots (GessGame.to_bytes) that is appended to and read back through mmap,
+# so any position can be looked up by index without reading the file or copying the record.
+#
+# File layout: the 5 byte header b"GESP" + version, then one SNAPSHOT_SIZE byte record after another.
+
+import mmap
+import os
+
+from GessGame import SNAPSHOT_SIZE, GessGame
+
+MAGIC = b"GESP"
+VERSION = 1
+HEADER_SIZE = 5
+
+
+class PositionStore:
+    """
+    purpose: keeps millions of positions on disk in the compact snapshot form
+    responsibilities: appends snapshots to the file, maps the file into memory and hands out records by index as
+    zero-copy views
+    communicates with(why): GessGame (makes and reads the snapshots)
+    """
+
+    def __init__(self, path):
+        """
+        purpose: opens a store, creating the file if it doesn't exist
+        parameters: path
+        return: a new PositionStore object
+        """
+        self._file = open(path, "a+b")
+        self._file.seek(0, os.SEEK_END)
+        if self._file.tell() == 0:
+            self._file.write(MAGIC + bytes([VERSION]))
+            self._file.flush()
+
+        self._file.seek(0)
+        header = self._file.read(HEADER_SIZE)
+        if header[:4] != MAGIC:
+            self._file.close()
+            raise ValueError("not a Gess position store: " + str(path))
+        if header[4] != VERSION:
+            self._file.close()
+            raise ValueError("unsupported Gess position store version " + str(header[4]))
+
+        size = os.fstat(self._file.fileno()).st_size
+        if (size - HEADER_SIZE) % SNAPSHOT_SIZE:
+            self._file.close()
+            raise ValueError("truncated Gess position store: " + str(path))
+        self._count = (size - HEADER_SIZE) // SNAPSHOT_SIZE
+        self._map = None
+        self._mapped_count = 0
+
+    def __len__(self):
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        purpose: closes the file (views handed out before keep the old mapping alive until they are released)
+        parameters: N/A
+        return: N/A
+        """
+        self._map = None
+        self._file.close()
+
+    def append(self, game):
+        """
+        purpose: adds a position to the end of the store
+        parameters: game (GessGame)
+        return: the index of the new record
+        """
+        return self.append_bytes(game.to_bytes())
+
+    def append_bytes(self, record):
+        """
+        purpose: adds a snapshot made by GessGame.to_bytes to the end of the store
+        parameters: record
+        return: the index of the new record
+        """
+        if len(record) != SNAPSHOT_SIZE:
+            raise ValueError("expected a " + str(SNAPSHOT_SIZE) + " byte snapshot, got " + str(len(record)))
+        self._file.write(record)
+        self._count += 1
+        return self._count - 1
+
+    def extend(self, games):
+        """
+        purpose: adds many positions
+        parameters: games (iterable of GessGame)
+        return: the number of positions added
+        """
+        start = self._count
+        self._file.write(b"".join(game.to_bytes() for game in games))  # one write for the whole batch
+        self._count = (self._file.tell() - HEADER_SIZE) // SNAPSHOT_SIZE
+        return self._count - start
+
+    def get_view(self):
+        """
+        purpose: maps the file into memory, mapping it again if records were appended since the last time
+        parameters: N/A
+        return: a memoryview of the records (the header is left out)
+        """
+        if self._map is None or self._mapped_count != self._count:
+            self._file.flush()
+            self._map = memoryview(mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ))[HEADER_SIZE:]
+            self._mapped_count = self._count
+        return self._map
+
+    def __getitem__(self, index):
+        """
+        purpose: gets one record without copying it
+        parameters: index (negative indexes count from the end)
+        return: a memoryview of the SNAPSHOT_SIZE byte record
+        """
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("position index out of range")
+        start = index * SNAPSHOT_SIZE
+        return self.get_view()[start:start + SNAPSHOT_SIZE]
+
+    def get_game(self, index):
+        """
+        purpose: gets one position as a game
+        parameters: index
+        return: a new GessGame in that position
+        """
+        return GessGame.from_bytes(self[index])
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self[index]
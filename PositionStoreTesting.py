@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+from GessGame import SNAPSHOT_SIZE, GessGame
+from PositionStore import PositionStore
+
+
+class TestPositionStore(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "positions.gesp")
+
+    def test_snapshot_round_trip(self):
+        """tests a position packs into a fixed size record and comes back the same"""
+        game = GessGame()
+        game.make_move('c2', 'c3')
+        game.make_move('l18', 'l15')
+        data = game.to_bytes()
+        self.assertEqual(len(data), SNAPSHOT_SIZE)
+        copy = GessGame.from_bytes(data)
+        self.assertEqual(copy.get_board().get_board(), game.get_board().get_board())
+        self.assertEqual(copy.get_turn(), "b")
+        self.assertEqual(copy.get_hash(), game.get_hash())
+        self.assertEqual(copy.legal_moves(), game.legal_moves())
+        game.resign_game()
+        self.assertEqual(GessGame.from_bytes(game.to_bytes()).get_game_state(), "WHITE_WON")
+
+    def test_bad_snapshot(self):
+        """tests records of the wrong size or with a bad turn are turned down"""
+        with self.assertRaises(ValueError):
+            GessGame.from_bytes(b"\0" * 100)
+        with self.assertRaises(ValueError):
+            GessGame.from_bytes(b"\0" * SNAPSHOT_SIZE)
+
+    def test_append_and_read(self):
+        """tests positions appended to the store can be read back by index, also after reopening the file"""
+        game = GessGame()
+        with PositionStore(self.path) as store:
+            store.append(game)
+            game.make_move('c2', 'c3')
+            self.assertEqual(store.extend([game, game]), 2)
+            self.assertEqual(len(store), 3)
+            self.assertIsInstance(store[0], memoryview)
+            self.assertEqual(bytes(store[-1]), game.to_bytes())
+            store.append(GessGame())
+            self.assertEqual(store.get_game(3).get_hash(), GessGame().get_hash())
+
+        with PositionStore(self.path) as store:
+            self.assertEqual(len(store), 4)
+            self.assertEqual(store.get_game(1).get_hash(), game.get_hash())
+            self.assertEqual(len(list(store)), 4)
+            with self.assertRaises(IndexError):
+                store[4]
+
+    def test_not_a_store(self):
+        """tests a file that isn't a position store is turned down"""
+        with open(self.path, "wb") as file:
+            file.write(b"hello")
+        with self.assertRaises(ValueError):
+            PositionStore(self.path)
@@ -0,0 +1,107 @@
+# Description: Bounded transposition table keyed by the Zobrist hash of a GessGame position (GessGame.get_hash, or
+# GessGame.get_canonical to share entries between positions that are equal up to symmetry, as GessEngine does)
+
+
+class TranspositionTable:
+    """
+    purpose: remembers what is already known about positions (e.g. search results, legal moves, ring status) so
+    positions reached again through a different move order don't have to be worked out from scratch
+    responsibilities: stores one entry per slot in a fixed number of slots, decides which entry is kept when two
+    positions share a slot, keeps hit/miss/eviction statistics
+    communicates with(why): GessGame (the keys are the 64-bit hashes from GessGame.get_hash or get_canonical)
+    """
+
+    def __init__(self, size=1 << 20, replacement="depth"):
+        """
+        purpose: creates an empty table
+        parameters: size (number of entries the table can hold), replacement ('depth' keeps the entry searched
+        deeper when two positions share a slot, 'always' keeps the newest entry)
+        return: a new TranspositionTable object
+        """
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        if replacement not in ("depth", "always"):
+            raise ValueError("replacement must be 'depth' or 'always'")
+
+        self._size = size
+        self._replacement = replacement
+        self._keys = [None] * size
+        self._depths = [0] * size
+        self._values = [None] * size
+        self._count = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self):
+        return self._count
+
+    def lookup(self, key):
+        """
+        purpose: finds the entry stored for a position
+        parameters: key (the position's hash)
+        return: the stored value or None
+        """
+        slot = key % self._size
+        if self._keys[slot] == key:
+            self._hits += 1
+            return self._values[slot]
+
+        self._misses += 1
+        return None
+
+    def get_depth(self, key):
+        """
+        purpose: finds the depth the entry for a position was stored with
+        parameters: key (the position's hash)
+        return: the depth or None if the position is not in the table
+        """
+        slot = key % self._size
+        if self._keys[slot] == key:
+            return self._depths[slot]
+        return None
+
+    def store(self, key, value, depth=0):
+        """
+        purpose: stores an entry for a position, following the replacement policy if the slot is already taken by
+        another position
+        parameters: key (the position's hash), value, depth (how much work the value is worth, e.g. search depth)
+        return: True if the entry was stored or False if the entry already in the slot was kept
+        """
+        slot = key % self._size
+        stored_key = self._keys[slot]
+
+        if stored_key is None:
+            self._count += 1
+        elif stored_key != key:
+            if self._replacement == "depth" and depth < self._depths[slot]:
+                return False
+            self._evictions += 1
+
+        self._keys[slot] = key
+        self._depths[slot] = depth
+        self._values[slot] = value
+        return True
+
+    def clear(self):
+        """
+        purpose: empties the table and resets the statistics
+        parameters: N/A
+        return: N/A
+        """
+        self._keys = [None] * self._size
+        self._depths = [0] * self._size
+        self._values = [None] * self._size
+        self._count = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_stats(self):
+        """
+        purpose: gets the table statistics
+        parameters: N/A
+        return: a dict with the size, number of entries, hits, misses and evictions
+        """
+        return {"size": self._size, "entries": self._count, "hits": self._hits, "misses": self._misses,
+                "evictions": self._evictions}
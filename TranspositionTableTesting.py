@@ -0,0 +1,41 @@
+import unittest
+from TranspositionTable import TranspositionTable
+from GessGame import GessGame
+
+
+class TestTranspositionTable(unittest.TestCase):
+
+    def test_store_and_lookup(self):
+        """tests an entry stored for a position can be found again"""
+        table = TranspositionTable(16)
+        game = GessGame()
+        table.store(game.get_hash(), "start")
+        self.assertEqual(table.lookup(game.get_hash()), "start")
+        game.make_move('c2', 'c3')
+        self.assertEqual(table.lookup(game.get_hash()), None)
+        self.assertEqual(table.get_stats()["hits"], 1)
+        self.assertEqual(table.get_stats()["misses"], 1)
+
+    def test_depth_replacement(self):
+        """tests the deeper entry is kept when two positions share a slot"""
+        table = TranspositionTable(4)
+        self.assertEqual(table.store(1, "deep", 5), True)
+        self.assertEqual(table.store(5, "shallow", 2), False)
+        self.assertEqual(table.lookup(1), "deep")
+        self.assertEqual(table.store(5, "deeper", 6), True)
+        self.assertEqual(table.lookup(1), None)
+        self.assertEqual(table.get_stats()["evictions"], 1)
+        self.assertEqual(len(table), 1)
+
+    def test_always_replacement(self):
+        """tests the newest entry is kept with the 'always' policy"""
+        table = TranspositionTable(4, "always")
+        table.store(1, "deep", 5)
+        self.assertEqual(table.store(5, "shallow", 2), True)
+        self.assertEqual(table.lookup(5), "shallow")
+        self.assertEqual(table.get_depth(5), 2)
+
+    def test_bad_size(self):
+        """tests the table needs at least one entry"""
+        with self.assertRaises(ValueError):
+            TranspositionTable(0)